@@ -1,4 +1,5 @@
-from flask import Flask, request, jsonify, send_from_directory
+import os
+from flask import Flask, Response, request, jsonify, send_from_directory
 from crypto.caesar import Caesar
 from crypto.vigenere import Vigenere
 from crypto.substitution import Substitution
@@ -18,6 +19,8 @@ import crypto.aes as aes_lib
 import crypto.aes_manual as aes_manual
 import crypto.des as des_lib
 import crypto.rsa as rsa_lib
+import crypto.kdf as kdf_lib
+from crypto.rsa_pool import KeyPairPool
 
 
 app = Flask(__name__, static_folder="static")
@@ -26,11 +29,11 @@ class Hill:
     name = "hill"
     def encrypt(self, text, key=None, **kwargs):
         if not key:
-            raise ValueError("Hill için 'key' zorunlu (4 veya 9 harf).")
+            raise ValueError("Hill için 'key' zorunlu (n×n harf: 4, 9, 16, ...).")
         return hill_mod.encrypt(text, key)
     def decrypt(self, text, key=None, **kwargs):
         if not key:
-            raise ValueError("Hill için 'key' zorunlu (4 veya 9 harf).")
+            raise ValueError("Hill için 'key' zorunlu (n×n harf: 4, 9, 16, ...).")
         return hill_mod.decrypt(text, key)
 
 class RailFence:
@@ -42,6 +45,37 @@ class RailFence:
         rails = int(rails) if rails is not None and str(rails) != "" else 2
         return rf_mod.decrypt(text, rails)
     
+def _fit_key(key, sizes: tuple) -> bytes:
+    """Kullanıcı anahtarını geçerli uzunluğa getir ('0' ile doldur veya kes)"""
+    if isinstance(key, str):
+        key = key.encode()
+    if len(key) not in sizes:
+        if len(key) < sizes[0]:
+            key = key + b'0' * (sizes[0] - len(key))
+        else:
+            key = key[:sizes[0]]
+    return key
+
+# Türetilmiş parola anahtarları: aynı parola/tuz ile tekrarlanan istekler KDF'yi yeniden çalıştırmaz
+KDF_CACHE_TTL = 600
+KDF_CACHE_SIZE = 1024
+kdf_cache = kdf_lib.KDFCache(ttl=KDF_CACHE_TTL, max_entries=KDF_CACHE_SIZE)
+
+def _derive_key(key, sizes: tuple, opts: dict) -> bytes:
+    """
+    Paroladan anahtar türet (varsayılan PBKDF2-HMAC-SHA256)
+    Seçenekler: kdf ("pbkdf2", "scrypt" veya eski doldur/kes davranışı için "none"),
+    salt (hex, istek başına tuz), key_size, iterations (pbkdf2), cost (scrypt N)
+    """
+    kdf = opts.get("kdf") or kdf_lib.DEFAULT_KDF
+    if kdf == "none":
+        return _fit_key(key, sizes)
+    size = int(opts.get("key_size") or sizes[0])
+    if size not in sizes:
+        raise ValueError(f"Anahtar boyutu {', '.join(map(str, sizes))} byte olmalı")
+    return kdf_cache.derive(key, kdf_lib.parse_salt(opts.get("salt")), size, kdf,
+                            iterations=opts.get("iterations"), cost=opts.get("cost"))
+
 # ✅ AES Kütüphaneli (aes_lib olarak değiştirildi)
 class AESLibWrapper:
     name = "aes_lib"
@@ -50,31 +84,43 @@ class AESLibWrapper:
         if not key:
             raise ValueError("AES için key zorunludur")
 
-        if isinstance(key, str):
-            key = key.encode()
-        
-        if len(key) not in [16, 24, 32]:
-            if len(key) < 16:
-                key = key + b'0' * (16 - len(key))
-            else:
-                key = key[:16]
+        key = _derive_key(key, (16, 24, 32), kwargs)
 
-        return aes_lib.encrypt(text, key)
+        mode = kwargs.get("mode") or "cbc"
+        if mode in aes_lib.AEAD_MODES:
+            return base64.b64encode(aes_lib.encrypt_aead(text.encode(), key, mode)).decode()
+        return aes_lib.get_context(key).encrypt(text)
 
     def decrypt(self, text, key=None, **kwargs):
         if not key:
             raise ValueError("AES için key zorunludur")
 
-        if isinstance(key, str):
-            key = key.encode()
-        
-        if len(key) not in [16, 24, 32]:
-            if len(key) < 16:
-                key = key + b'0' * (16 - len(key))
-            else:
-                key = key[:16]
+        key = _derive_key(key, (16, 24, 32), kwargs)
+
+        mode = kwargs.get("mode") or "cbc"
+        if mode in aes_lib.AEAD_MODES:
+            return aes_lib.decrypt_aead(base64.b64decode(text), key, mode).decode()
+        return aes_lib.get_context(key).decrypt(text)
+
+    def encrypt_bytes(self, data, key=None, **kwargs):
+        if not key:
+            raise ValueError("AES için key zorunludur")
+
+        key = _derive_key(key, (16, 24, 32), kwargs)
+        mode = kwargs.get("mode") or "cbc"
+        if mode in aes_lib.AEAD_MODES:
+            return aes_lib.encrypt_aead(data, key, mode)
+        return aes_lib.get_context(key).encrypt_bytes(data)
+
+    def decrypt_bytes(self, raw, key=None, **kwargs):
+        if not key:
+            raise ValueError("AES için key zorunludur")
 
-        return aes_lib.decrypt(text, key)
+        key = _derive_key(key, (16, 24, 32), kwargs)
+        mode = kwargs.get("mode") or "cbc"
+        if mode in aes_lib.AEAD_MODES:
+            return aes_lib.decrypt_aead(raw, key, mode)
+        return aes_lib.get_context(key).decrypt_bytes(raw)
 
 # ✅ AES Kütüphanesiz (aes_manual olarak ayrı)
 class AESManualWrapper:
@@ -84,33 +130,31 @@ class AESManualWrapper:
         if not key:
             raise ValueError("AES için key zorunludur")
 
-        if isinstance(key, str):
-            key = key.encode()
-        
-        if len(key) not in [16, 24, 32]:
-            if len(key) < 16:
-                key = key + b'0' * (16 - len(key))
-            else:
-                key = key[:16]
+        key = _derive_key(key, (16, 24, 32), kwargs)
 
-        encrypted = aes_manual.encrypt(text, key)
+        encrypted = aes_manual.encrypt(text, key, mode=kwargs.get("mode") or "cbc")
         return base64.b64encode(encrypted).decode()
 
     def decrypt(self, text, key=None, **kwargs):
         if not key:
             raise ValueError("AES için key zorunludur")
 
-        if isinstance(key, str):
-            key = key.encode()
-        
-        if len(key) not in [16, 24, 32]:
-            if len(key) < 16:
-                key = key + b'0' * (16 - len(key))
-            else:
-                key = key[:16]
+        key = _derive_key(key, (16, 24, 32), kwargs)
 
         raw = base64.b64decode(text)
-        return aes_manual.decrypt(raw, key)
+        return aes_manual.decrypt(raw, key, mode=kwargs.get("mode") or "cbc")
+
+    def encrypt_bytes(self, data, key=None, **kwargs):
+        if not key:
+            raise ValueError("AES için key zorunludur")
+
+        return aes_manual.encrypt_bytes(data, _derive_key(key, (16, 24, 32), kwargs), mode=kwargs.get("mode") or "cbc")
+
+    def decrypt_bytes(self, raw, key=None, **kwargs):
+        if not key:
+            raise ValueError("AES için key zorunludur")
+
+        return aes_manual.decrypt_bytes(raw, _derive_key(key, (16, 24, 32), kwargs), mode=kwargs.get("mode") or "cbc")
 
         
 class DESWrapper:
@@ -120,42 +164,44 @@ class DESWrapper:
         if not key:
             raise ValueError("DES için key zorunludur")
 
-        if isinstance(key, str):
-            key = key.encode()
-        
-        if len(key) != 8:
-            if len(key) < 8:
-                key = key + b'0' * (8 - len(key))
-            else:
-                key = key[:8]
+        key = _derive_key(key, (8,), kwargs)
 
-        return des_lib.encrypt(text, key)
+        return des_lib.get_context(key).encrypt(text)
 
     def decrypt(self, text, key=None, **kwargs):
         if not key:
             raise ValueError("DES için key zorunludur")
 
-        if isinstance(key, str):
-            key = key.encode()
-        
-        if len(key) != 8:
-            if len(key) < 8:
-                key = key + b'0' * (8 - len(key))
-            else:
-                key = key[:8]
+        key = _derive_key(key, (8,), kwargs)
+
+        return des_lib.get_context(key).decrypt(text)
+
+    def encrypt_bytes(self, data, key=None, **kwargs):
+        if not key:
+            raise ValueError("DES için key zorunludur")
+
+        return des_lib.get_context(_derive_key(key, (8,), kwargs)).encrypt_bytes(data)
 
-        return des_lib.decrypt(text, key)
+    def decrypt_bytes(self, raw, key=None, **kwargs):
+        if not key:
+            raise ValueError("DES için key zorunludur")
+
+        return des_lib.get_context(_derive_key(key, (8,), kwargs)).decrypt_bytes(raw)
 
 
 class RSAWrapper:
     name = "rsa"
 
-    def __init__(self):
+    def __init__(self, pool: KeyPairPool = None):
         self.private_key = None
         self.public_key = None
+        self.pool = pool
 
-    def generate_keys(self):
-        self.private_key, self.public_key = rsa_lib.generate_keypair()
+    def generate_keys(self, bits: int = 2048):
+        if self.pool is not None:
+            self.private_key, self.public_key = self.pool.pop(bits)
+        else:
+            self.private_key, self.public_key = rsa_lib.generate_keypair(bits)
         return {
             "private_key": self.private_key.decode(),
             "public_key": self.public_key.decode()
@@ -168,7 +214,11 @@ class RSAWrapper:
         raise ValueError("RSA doğrudan mesaj çözmek için kullanılmaz")
 
 
-rsa_instance = RSAWrapper()
+# Hazır RSA anahtarları arka planda üretilir; istek yalnızca havuzdan alır
+RSA_POOL_DEPTH = 4
+RSA_POOL_WORKERS = 1
+rsa_pool = KeyPairPool(depth=RSA_POOL_DEPTH, workers=RSA_POOL_WORKERS)
+rsa_instance = RSAWrapper(rsa_pool)
 
 # ✅ REGISTRY'ye her iki AES sürümü eklendi
 REGISTRY = {
@@ -194,12 +244,21 @@ def algorithms():
 
 @app.post("/api/generate-rsa-key")
 def generate_rsa_key():
+    data = request.get_json(silent=True) or {}
     try:
-        keys = rsa_instance.generate_keys()
+        keys = rsa_instance.generate_keys(int(data.get("bits", 2048)))
         return jsonify(keys)
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+@app.get("/api/rsa-pool")
+def rsa_pool_metrics():
+    return jsonify(rsa_pool.metrics())
+
+@app.get("/api/kdf-cache")
+def kdf_cache_metrics():
+    return jsonify(kdf_cache.metrics())
+
 @app.post("/api/encrypt")
 def encrypt():
     data = request.get_json(force=True)
@@ -228,9 +287,41 @@ def decrypt():
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+def _binary_endpoint(func_name: str):
+    """
+    Ham byte uç noktası: gövde application/octet-stream, method ve gizli olmayan
+    seçenekler (mode, kdf, salt...) sorgu parametresi olarak gelir; anahtar URL'de
+    (erişim günlükleri, vekil sunucular, tarayıcı geçmişi) görünmemesi için
+    X-Key başlığıyla gönderilir. Yanıt da ham byte'tır (base64 yok).
+    """
+    opts = request.args.to_dict()
+    if "key" in opts:
+        return jsonify({"error": "Anahtar sorgu parametresiyle gönderilemez; X-Key başlığını kullanın"}), 400
+    method = opts.pop("method", None)
+    func = getattr(REGISTRY.get(method), func_name, None)
+    if func is None:
+        return jsonify({"error": "Unknown method or binary data not supported"}), 400
+    try:
+        out = func(request.get_data(), key=request.headers.get("X-Key"), **opts)
+        return Response(bytes(out), mimetype="application/octet-stream")
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.post("/api/encrypt-bytes")
+def encrypt_bytes():
+    return _binary_endpoint("encrypt_bytes")
+
+@app.post("/api/decrypt-bytes")
+def decrypt_bytes():
+    return _binary_endpoint("decrypt_bytes")
+
 @app.get("/")
 def index():
     return send_from_directory("static", "index.html")
 
 if __name__ == "__main__":
+    # debug modunda yeniden yükleyici (reloader) ana süreci istek almaz; havuz yalnızca
+    # uygulamayı çalıştıran alt süreçte doldurulur (ilk pop() da havuzu başlatır)
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        rsa_pool.start()
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+Şifreli İstemci-Sunucu Haberleşme Sistemi - asyncio Sunucu
+crypto_server.CryptoServer ile aynı protokol (4 byte uzunluk önekli JSON
+çerçeveleri, ikili yan çerçeve, rsa_public_key / get_public_key /
+encrypted_message / ack / disconnect, oturumlar); tek süreçte binlerce eşzamanlı bağlantıya hizmet eder.
+Engelleyen sunucu karşılaştırma için olduğu gibi kalır.
+"""
+import asyncio
+import json
+from crypto_server import CryptoServer, HOST, PORT, KEX_METHODS, MAX_FRAME_SIZE
+
+# Bekleyen bağlantı kuyruğu (engelleyen sunucuda listen(5))
+BACKLOG = 1024
+# Bu boyuttan büyük veriler, saf Python (use_library=False) şifreleme ve
+# RSA/ECDH anahtar değişimleri olay döngüsünü bekletmemek için iş parçacığı
+# havuzunda işlenir
+INLINE_LIMIT = 64 * 1024
+
+
+class AsyncCryptoServer(CryptoServer):
+    """
+    Her bağlantı bir eşyordam (coroutine); mesaj işleme CryptoServer ile ortaktır
+
+    Args:
+        kex: Desteklenen anahtar değişim yöntemleri
+        verbose: Bağlantı ve mesaj başına konsol çıktısı (binlerce bağlantıda kapatın)
+    """
+
+    def __init__(self, kex=KEX_METHODS, verbose: bool = True):
+        super().__init__(kex)
+        self.verbose = verbose
+        self.connections = 0
+
+    async def _read_frame(self, reader: asyncio.StreamReader) -> bytes:
+        """4 byte uzunluk önekli tek çerçeve oku; uzunluk okumadan önce sınırlanır"""
+        size = int.from_bytes(await reader.readexactly(4), 'big')
+        if size > MAX_FRAME_SIZE:
+            raise ValueError(f"Çerçeve çok büyük: {size} byte (en fazla {MAX_FRAME_SIZE})")
+        return await reader.readexactly(size)
+
+    async def _read_message(self, reader: asyncio.StreamReader):
+        """Mesajı al ve parse et (bağlantı kapanırsa None); ikili veri message["data"] olarak gelir"""
+        try:
+            message = json.loads((await self._read_frame(reader)).decode('utf-8'))
+            if message.get("encoding") == "binary":
+                message["data"] = await self._read_frame(reader)
+        except asyncio.IncompleteReadError:
+            return None
+        return message
+
+    async def _write_message(self, writer: asyncio.StreamWriter, message: dict, payload=None):
+        """Mesajı gönder; payload verilirse JSON'dan sonra ham byte çerçevesi olarak gider"""
+        if payload is not None:
+            message = dict(message, encoding="binary")
+        data = json.dumps(message).encode('utf-8')
+        writer.write(len(data).to_bytes(4, 'big') + data)
+        if payload is not None:
+            writer.write(len(payload).to_bytes(4, 'big'))
+            writer.write(payload)
+        await writer.drain()
+
+    def _offload(self, message: dict) -> bool:
+        """RSA/ECDH işlemi, saf Python şifreleme veya büyük veri içeren mesajlar iş parçacığında işlenir"""
+        if message.get("client_public") or message.get("session_key") or message.get("encrypted_key"):
+            return True
+        if not message.get("use_library", True):
+            # Manuel AES küçük mesajlarda da milisaniyeler sürer
+            return True
+        data = message.get("data")
+        return data is not None and len(data) > INLINE_LIMIT
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """İstemciyi işle"""
+        addr = writer.get_extra_info("peername") or ("?", 0)
+        prefix = f"[{addr[0]}:{addr[1]}]"
+        log = (lambda text: print(f"{prefix} {text}")) if self.verbose else (lambda text: None)
+        self.connections += 1
+        log("Bağlandı")
+
+        try:
+            # Desteklenen yöntemleri ve anahtar parmak izini gönder (anahtar dağıtımı için)
+            await self._write_message(writer, self._greeting())
+
+            loop = asyncio.get_running_loop()
+            while True:
+                message = await self._read_message(reader)
+                if not message:
+                    break
+
+                msg_type = message.get("type")
+
+                if msg_type == "encrypted_message":
+                    if self._offload(message):
+                        reply, payload = await loop.run_in_executor(None, self._handle_message, message, log)
+                    else:
+                        reply, payload = self._handle_message(message, log)
+                    await self._write_message(writer, reply, payload)
+
+                elif msg_type == "get_public_key":
+                    await self._write_message(writer, self._public_key_message())
+
+                elif msg_type == "disconnect":
+                    break
+
+        except Exception as e:
+            log(f"Bağlantı hatası: {e}")
+        finally:
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            log("Bağlantı kapatıldı")
+
+    async def serve(self, host: str = HOST, port: int = PORT):
+        """Sunucuyu başlat ve kapatılana kadar çalıştır"""
+        server = await asyncio.start_server(self.handle_client, host, port, backlog=BACKLOG)
+        print(f"Asyncio sunucu {host}:{port} adresinde dinleniyor...")
+        print("Çıkmak için Ctrl+C")
+        async with server:
+            await server.serve_forever()
+
+    def start(self):
+        """Sunucuyu başlat"""
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            print("\nSunucu kapatılıyor...")
+
+
+if __name__ == "__main__":
+    import sys
+    # python async_crypto_server.py x25519  -> yalnızca ECDH (RSA anahtarı üretilmez)
+    server = AsyncCryptoServer(tuple(sys.argv[1:]) or KEX_METHODS)
+    server.start()
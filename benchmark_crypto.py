@@ -0,0 +1,167 @@
+"""
+Şifreleme modülleri için basit performans ölçüm scripti
+"""
+import os
+import random
+import string
+import time
+
+from Crypto.Cipher import AES
+from crypto.vigenere import Vigenere
+import crypto.aes as aes_lib
+import crypto.aes_manual as aes_manual
+import crypto.ecdh as ecdh
+import crypto.rsa as rsa_lib
+import crypto.session as session_lib
+
+def _timeit(func, *args, repeat: int = 1, **kwargs) -> float:
+    """En iyi süreyi saniye cinsinden döndür"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _sample_text(size: int) -> str:
+    alphabet = string.ascii_letters + "     .,;!?0123456789"
+    chunk = "".join(random.choice(alphabet) for _ in range(1 << 16))
+    return (chunk * (size // len(chunk) + 1))[:size]
+
+def _vigenere_baseline(text: str, key: str, enc=True) -> str:
+    """Vektörleştirme öncesi Vigenere._process (karşılaştırma tabanı, olduğu gibi)"""
+    key = "".join([c.lower() for c in key if c.isalpha()])
+    if not key:
+        raise ValueError("Vigenere için alfabetik bir anahtar gerekli.")
+    out, j = [], 0
+    for ch in text:
+        if ch.isalpha():
+            base = ord('A') if ch.isupper() else ord('a')
+            k = ord(key[j % len(key)]) - ord('a')
+            if not enc:
+                k = -k
+            idx = (ord(ch) - base + k) % 26
+            out.append(chr(base + idx))
+            j += 1
+        else:
+            out.append(ch)
+    return "".join(out)
+
+def bench_vigenere(size: int = 10 * 1024 * 1024):
+    print("="*60)
+    print(f"Vigenère Benchmark ({size // (1024 * 1024)} MB)")
+    print("="*60)
+
+    vig = Vigenere()
+    text = _sample_text(size)
+    key = "kriptoloji"
+
+    # Taban: değişiklik öncesi uygulama; ölçülen: genel encrypt() yolu (anahtar hazırlığı dahil)
+    t_base = _timeit(_vigenere_baseline, text, key)
+    t_python = _timeit(vig._process_python, text, vig._key_shifts(key, enc=True))
+    t_numpy = _timeit(vig.encrypt, text, key=key, repeat=3)
+    same = _vigenere_baseline(text, key) == vig.encrypt(text, key=key)
+    same_dec = _vigenere_baseline(text, key, enc=False) == vig.decrypt(text, key=key)
+
+    print(f"   Taban (eski):  {t_base:.3f} s")
+    print(f"   Saf Python:    {t_python:.3f} s")
+    print(f"   NumPy:         {t_numpy:.3f} s")
+    print(f"   Hızlanma:      {t_base / t_numpy:.1f}x (tabana göre), {t_python / t_numpy:.1f}x (saf Python yoluna göre)")
+    print(f"   Aynı çıktı:    {same and same_dec}")
+
+def bench_aes_manual(size: int = 1024 * 1024):
+    print("\n" + "="*60)
+    print(f"AES-128 Manuel (T-tablo) vs pycryptodome ({size // 1024} KB)")
+    print("="*60)
+
+    # FIPS-197 Ek C.1 test vektörü
+    fips_key = bytes(range(16))
+    fips_block = aes_manual.encrypt_block(bytes.fromhex("00112233445566778899aabbccddeeff"), fips_key)
+    print(f"   FIPS-197 C.1: {fips_block.hex() == '69c4e0d86a7b0430d8cdb78070b4c55a'}")
+
+    key = os.urandom(16)
+    data = os.urandom(size)
+    iv = os.urandom(16)
+    padded = aes_manual.pad(data)
+
+    for mode in ("cbc", "ctr"):
+        t_manual = _timeit(aes_manual.encrypt_bytes, data, key, mode)
+        if mode == "cbc":
+            t_lib = _timeit(lambda: AES.new(key, AES.MODE_CBC, iv).encrypt(padded), repeat=5)
+        else:
+            t_lib = _timeit(lambda: AES.new(key, AES.MODE_CTR, nonce=iv[:8]).encrypt(data), repeat=5)
+        print(f"   {mode.upper()} manuel:       {t_manual:.3f} s ({size / t_manual / 1e6:.2f} MB/s)")
+        print(f"   {mode.upper()} pycryptodome: {t_lib:.4f} s ({size / t_lib / 1e6:.0f} MB/s)")
+        print(f"   Fark: {t_manual / t_lib:.0f}x")
+
+def bench_aes_parallel(sizes=(100 * 1024 * 1024, 1024 * 1024 * 1024), workers=(1, 2, 4, 8)):
+    print("\n" + "="*60)
+    print(f"Paralel AES-CTR / CBC çözme ({os.cpu_count()} çekirdek)")
+    print("="*60)
+
+    key = os.urandom(16)
+    for size in sizes:
+        # Rastgele 1 MB'lık blok tekrarlanır; os.urandom(1 GB) ölçümden uzun sürer
+        data = os.urandom(1024 * 1024) * (size // (1024 * 1024))
+        cbc = AES.new(key, AES.MODE_CBC, bytes(16))
+        cbc_raw = bytes(16) + cbc.encrypt(aes_lib.pad(data))
+        print(f"   {size // (1024 * 1024)} MB:")
+        base = {}
+        for n in workers:
+            t_ctr = _timeit(aes_lib.encrypt_ctr_parallel, data, key, workers=n, repeat=3)
+            t_cbc = _timeit(aes_lib.decrypt_cbc_parallel, cbc_raw, key, workers=n, repeat=3)
+            base.setdefault("ctr", t_ctr)
+            base.setdefault("cbc", t_cbc)
+            print(f"      {n} işçi: CTR {size / t_ctr / 1e6:7.0f} MB/s ({base['ctr'] / t_ctr:.1f}x)"
+                  f"   CBC çözme {size / t_cbc / 1e6:7.0f} MB/s ({base['cbc'] / t_cbc:.1f}x)")
+        del data, cbc_raw
+
+def _cpu_timeit(func, repeat: int) -> float:
+    """Ortalama CPU süresi (saniye); sunucu tarafı işlem maliyeti için"""
+    start = time.process_time()
+    for _ in range(repeat):
+        func()
+    return (time.process_time() - start) / repeat
+
+def bench_key_exchange(repeat: int = 200):
+    print("\n" + "="*60)
+    print("Anahtar Değişimi: RSA-2048 OAEP vs X25519 (ECDH + HKDF)")
+    print("="*60)
+
+    t_rsa_gen = _timeit(rsa_lib.generate_keypair, repeat=3)
+    t_x_gen = _timeit(ecdh.generate_key, repeat=20)
+    print(f"   Sunucu anahtar üretimi: RSA {t_rsa_gen * 1000:.0f} ms, X25519 {t_x_gen * 1000:.2f} ms")
+
+    private_pem, public_pem = rsa_lib.generate_keypair()
+    server_rsa = rsa_lib.load_private_key(private_pem)
+    client_rsa = rsa_lib.load_public_key(public_pem)
+    server_x = ecdh.generate_key()
+    server_public = ecdh.public_bytes(server_x)
+
+    def rsa_client():
+        secret = session_lib.new_secret()
+        return client_rsa.encrypt_key(secret)
+
+    def x_client():
+        ephemeral = ecdh.generate_key()
+        client_public = ecdh.public_bytes(ephemeral)
+        ecdh.derive_secret(ephemeral, server_public, client_public, server_public)
+        return client_public
+
+    wrapped = rsa_client()
+    client_public = x_client()
+
+    for name, client, server in (
+        ("RSA-2048", rsa_client, lambda: server_rsa.decrypt_key(wrapped)),
+        ("X25519  ", x_client, lambda: ecdh.derive_secret(server_x, client_public, client_public, server_public)),
+    ):
+        t_client = _cpu_timeit(client, repeat)
+        t_server = _cpu_timeit(server, repeat)
+        print(f"   {name}: el sıkışma {(t_client + t_server) * 1000:.2f} ms "
+              f"(istemci {t_client * 1000:.2f} ms, sunucu CPU/bağlantı {t_server * 1000:.2f} ms)")
+
+if __name__ == "__main__":
+    bench_vigenere()
+    bench_aes_manual()
+    bench_aes_parallel()
+    bench_key_exchange()
@@ -0,0 +1,215 @@
+"""
+Kimlik doğrulamalı şifreleme (AEAD: AES-GCM / AES-EAX)
+Şifreleme ve bütünlük doğrulaması tek geçişte yapılır; ayrı bir HMAC gerekmez.
+
+Akış modunda veri sabit boyutlu segmentlere bölünür ve her segment kendi
+etiketiyle mühürlenir. Çözmede bir segmentin düz metni, etiketi doğrulanmadan
+dışarı verilmez; bozuk bir akış, tamamı belleğe alınmadan ilk bozuk segmentte
+reddedilir. Segment nonce'u (önek + sayaç + son segment bayrağı) sayesinde
+segmentlerin sırası değiştirilemez, akış sondan kesilemez.
+"""
+from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
+
+MODES = {"gcm": AES.MODE_GCM, "eax": AES.MODE_EAX}
+NONCE_SIZE = 12
+TAG_SIZE = 16
+SEGMENT_SIZE = 64 * 1024
+MAX_SEGMENT_SIZE = 64 * 1024 * 1024
+PREFIX_SIZE = 7
+# Akış başlığı: segment boyutu (4 byte) + nonce öneki
+HEADER_SIZE = 4 + PREFIX_SIZE
+
+
+def _mode(mode: str) -> int:
+    try:
+        return MODES[mode.lower()]
+    except (KeyError, AttributeError):
+        raise ValueError(f"Bilinmeyen AEAD modu: {mode} ({', '.join(MODES)})") from None
+
+
+def _key(key) -> bytes:
+    return key.encode() if isinstance(key, str) else bytes(key)
+
+
+def _verify_error() -> ValueError:
+    return ValueError("Doğrulama etiketi geçersiz: veri bozulmuş veya anahtar yanlış")
+
+
+def encrypt(data, key, mode: str = "gcm", associated_data: bytes = None) -> bytes:
+    """Tek seferde şifrele; çıktı nonce (12 byte) + şifreli veri + etiket (16 byte)"""
+    nonce = get_random_bytes(NONCE_SIZE)
+    cipher = AES.new(_key(key), _mode(mode), nonce=nonce)
+    if associated_data:
+        cipher.update(associated_data)
+    ciphertext, tag = cipher.encrypt_and_digest(data)
+    return nonce + ciphertext + tag
+
+
+def decrypt(raw, key, mode: str = "gcm", associated_data: bytes = None) -> bytes:
+    """encrypt çıktısını doğrula ve çöz; etiket geçersizse ValueError"""
+    raw = memoryview(raw).cast("B")
+    if len(raw) < NONCE_SIZE + TAG_SIZE:
+        raise ValueError("Şifreli veri çok kısa")
+    cipher = AES.new(_key(key), _mode(mode), nonce=bytes(raw[:NONCE_SIZE]))
+    if associated_data:
+        cipher.update(associated_data)
+    try:
+        return cipher.decrypt_and_verify(raw[NONCE_SIZE:-TAG_SIZE], raw[-TAG_SIZE:])
+    except ValueError:
+        raise _verify_error() from None
+
+
+class _Segmented:
+    def __init__(self, key, mode: str, associated_data: bytes):
+        self._key = _key(key)
+        self._mode = _mode(mode)
+        self._associated_data = associated_data or b""
+        self._header = None
+        self._counter = 0
+        self._buffer = bytearray()
+        self._finalized = False
+
+    def _cipher(self, last: bool):
+        if self._counter >= 1 << 32:
+            raise ValueError("Akış en fazla 2^32 segment içerebilir")
+        nonce = self._header[4:] + self._counter.to_bytes(4, "big") + (b"\x01" if last else b"\x00")
+        self._counter += 1
+        cipher = AES.new(self._key, self._mode, nonce=nonce)
+        # Başlık her segmentin doğrulamasına dahildir (segment boyutu değiştirilemez)
+        cipher.update(self._header + self._associated_data)
+        return cipher
+
+    def _check(self):
+        if self._finalized:
+            raise ValueError("finalize() sonrası update() çağrılamaz")
+
+
+class StreamEncryptor(_Segmented):
+    """
+    Artımlı AEAD şifreleyici: update() ile parça parça veri verilir, tamamlanan
+    segmentler hemen döner; finalize() son segmenti mühürler.
+
+    Çıktı: başlık (segment boyutu + nonce öneki) + segmentler (şifreli veri + etiket)
+    """
+
+    def __init__(self, key, mode: str = "gcm", segment_size: int = SEGMENT_SIZE,
+                 associated_data: bytes = None):
+        super().__init__(key, mode, associated_data)
+        if not 0 < segment_size <= MAX_SEGMENT_SIZE:
+            raise ValueError(f"Segment boyutu 1 ile {MAX_SEGMENT_SIZE} arasında olmalı")
+        self.segment_size = segment_size
+        self._header = segment_size.to_bytes(4, "big") + get_random_bytes(PREFIX_SIZE)
+        self._header_sent = False
+
+    def _seal(self, data, last: bool) -> bytes:
+        ciphertext, tag = self._cipher(last).encrypt_and_digest(data)
+        return ciphertext + tag
+
+    def _take_header(self) -> bytes:
+        if self._header_sent:
+            return b""
+        self._header_sent = True
+        return self._header
+
+    def update(self, data) -> bytes:
+        self._check()
+        self._buffer += data
+        out = [self._take_header()]
+        seg = self.segment_size
+        pos = 0
+        # Son segment bayrakla mühürleneceği için en az bir segmentlik veri bekletilir
+        with memoryview(self._buffer) as view:
+            while len(view) - pos > seg:
+                out.append(self._seal(view[pos:pos + seg], last=False))
+                pos += seg
+        del self._buffer[:pos]
+        return b"".join(out)
+
+    def finalize(self) -> bytes:
+        self._check()
+        self._finalized = True
+        return self._take_header() + self._seal(bytes(self._buffer), last=True)
+
+
+class StreamDecryptor(_Segmented):
+    """
+    Artımlı AEAD çözücü: update() yalnızca etiketi doğrulanmış segmentlerin düz
+    metnini döndürür; finalize() son segmenti doğrular ve akışın kesilmediğini
+    garanti eder. Herhangi bir doğrulama hatasında ValueError fırlatılır.
+    """
+
+    def __init__(self, key, mode: str = "gcm", associated_data: bytes = None):
+        super().__init__(key, mode, associated_data)
+        self.segment_size = None
+
+    def _open(self, frame, last: bool) -> bytes:
+        try:
+            return self._cipher(last).decrypt_and_verify(frame[:-TAG_SIZE], frame[-TAG_SIZE:])
+        except ValueError:
+            raise _verify_error() from None
+
+    def _read_header(self) -> bool:
+        if self._header is not None:
+            return True
+        if len(self._buffer) < HEADER_SIZE:
+            return False
+        header = bytes(self._buffer[:HEADER_SIZE])
+        segment_size = int.from_bytes(header[:4], "big")
+        if not 0 < segment_size <= MAX_SEGMENT_SIZE:
+            raise ValueError("Geçersiz AEAD akış başlığı")
+        self._header = header
+        self.segment_size = segment_size
+        del self._buffer[:HEADER_SIZE]
+        return True
+
+    def update(self, data) -> bytes:
+        self._check()
+        self._buffer += data
+        if not self._read_header():
+            return b""
+        out = []
+        frame = self.segment_size + TAG_SIZE
+        pos = 0
+        with memoryview(self._buffer) as view:
+            while len(view) - pos > frame:
+                out.append(self._open(view[pos:pos + frame], last=False))
+                pos += frame
+        del self._buffer[:pos]
+        return b"".join(out)
+
+    def finalize(self) -> bytes:
+        self._check()
+        self._finalized = True
+        if not self._read_header() or len(self._buffer) < TAG_SIZE:
+            raise ValueError("AEAD akışı eksik (kesilmiş)")
+        return self._open(bytes(self._buffer), last=True)
+
+
+def encrypt_stream(infile, outfile, key, mode: str = "gcm", chunk_size: int = SEGMENT_SIZE,
+                   associated_data: bytes = None) -> int:
+    """Akışı segmentli AEAD ile şifrele; yazılan byte sayısını döndürür"""
+    encryptor = StreamEncryptor(key, mode, associated_data=associated_data)
+    written = 0
+    while True:
+        chunk = infile.read(chunk_size)
+        if not chunk:
+            break
+        written += outfile.write(encryptor.update(chunk)) or 0
+    return written + (outfile.write(encryptor.finalize()) or 0)
+
+
+def decrypt_stream(infile, outfile, key, mode: str = "gcm", chunk_size: int = SEGMENT_SIZE,
+                   associated_data: bytes = None) -> int:
+    """
+    encrypt_stream çıktısını çöz. Her segment doğrulandıktan sonra yazılır; hata
+    durumunda ValueError fırlatılır ve çıktı o noktaya kadar doğrulanmış veriyi içerir.
+    """
+    decryptor = StreamDecryptor(key, mode, associated_data=associated_data)
+    written = 0
+    while True:
+        chunk = infile.read(chunk_size)
+        if not chunk:
+            break
+        written += outfile.write(decryptor.update(chunk)) or 0
+    return written + (outfile.write(decryptor.finalize()) or 0)
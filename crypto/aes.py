@@ -1,8 +1,12 @@
 from Crypto.Cipher import AES
 from Crypto.Random import get_random_bytes
-import base64
+from functools import lru_cache
+from . import aead, parallel, stream
+from .context import CipherContext
 
 BLOCK_SIZE = 16  # AES-128
+CONTEXT_CACHE_SIZE = 1024
+AEAD_MODES = tuple(aead.MODES)
 
 def pad(data: bytes) -> bytes:
     padding_len = BLOCK_SIZE - len(data) % BLOCK_SIZE
@@ -11,19 +15,128 @@ def pad(data: bytes) -> bytes:
 def unpad(data: bytes) -> bytes:
     return data[:-data[-1]]
 
+class AESContext(CipherContext):
+    name = "AES"
+    algorithm = AES
+    block_size = BLOCK_SIZE
+    key_sizes = (16, 24, 32)
+
+@lru_cache(maxsize=CONTEXT_CACHE_SIZE)
+def _cached_context(key: bytes) -> AESContext:
+    return AESContext(key)
+
+def get_context(key) -> AESContext:
+    """Anahtar başına önbelleklenmiş bağlam (str anahtarlar UTF-8 ile kodlanır)"""
+    if isinstance(key, str):
+        key = key.encode()
+    return _cached_context(bytes(key))
+
 def encrypt(plaintext: str, key: bytes) -> str:
-    cipher = AES.new(key, AES.MODE_CBC)
-    ciphertext = cipher.encrypt(pad(plaintext.encode()))
-    result = cipher.iv + ciphertext
-    return base64.b64encode(result).decode()
+    return get_context(key).encrypt(plaintext)
 
 def decrypt(ciphertext_b64: str, key: bytes) -> str:
-    raw = base64.b64decode(ciphertext_b64)
-    iv = raw[:BLOCK_SIZE]
-    ciphertext = raw[BLOCK_SIZE:]
-    cipher = AES.new(key, AES.MODE_CBC, iv)
-    plaintext = unpad(cipher.decrypt(ciphertext))
-    return plaintext.decode()
+    return get_context(key).decrypt(ciphertext_b64)
+
+def ciphertext_size(length: int) -> int:
+    """encrypt_bytes çıktısının boyutu (output tamponunu ayırmak için)"""
+    return BLOCK_SIZE + (length // BLOCK_SIZE + 1) * BLOCK_SIZE
+
+def encrypt_bytes(data, key: bytes, output=None):
+    """Base64'süz şifreleme: iv + şifreli veri; output verilirse sonuç oraya yazılır"""
+    return get_context(key).encrypt_bytes(data, output)
+
+def decrypt_bytes(raw, key: bytes, output=None):
+    """encrypt_bytes çıktısını çöz; output verilirse düz metin oraya yazılır"""
+    return get_context(key).decrypt_bytes(raw, output)
+
+def encrypt_many(plaintexts, key: bytes) -> list:
+    """Aynı anahtarla çok sayıda mesajı toplu şifrele (her mesaja ayrı IV)"""
+    return get_context(key).encrypt_many(plaintexts)
+
+def decrypt_many(ciphertexts_b64, key: bytes) -> list:
+    """encrypt_many çıktılarını toplu çöz"""
+    return get_context(key).decrypt_many(ciphertexts_b64)
 
 def generate_key() -> bytes:
     return get_random_bytes(16)  # 128 bit
+
+def encrypt_stream(infile, outfile, key: bytes, chunk_size: int = stream.CHUNK_SIZE) -> int:
+    """Akışı parça parça şifrele (iv + şifreli veri, base64 yok); yazılan byte sayısını döndürür"""
+    return stream.encrypt_stream(AES.new(key, AES.MODE_CBC), BLOCK_SIZE, infile, outfile, chunk_size)
+
+def decrypt_stream(infile, outfile, key: bytes, chunk_size: int = stream.CHUNK_SIZE) -> int:
+    """encrypt_stream çıktısını parça parça çöz; yazılan byte sayısını döndürür"""
+    return stream.decrypt_stream(lambda iv: AES.new(key, AES.MODE_CBC, iv), BLOCK_SIZE, infile, outfile, chunk_size)
+
+def encrypt_aead(data, key: bytes, mode: str = "gcm", associated_data: bytes = None) -> bytes:
+    """Tek geçişte şifrele + doğrula (GCM/EAX); çıktı nonce + şifreli veri + etiket"""
+    return aead.encrypt(data, key, mode, associated_data)
+
+def decrypt_aead(raw, key: bytes, mode: str = "gcm", associated_data: bytes = None) -> bytes:
+    """encrypt_aead çıktısını çöz; etiket geçersizse düz metin dönmeden ValueError"""
+    return aead.decrypt(raw, key, mode, associated_data)
+
+def aead_encryptor(key: bytes, mode: str = "gcm", segment_size: int = aead.SEGMENT_SIZE,
+                   associated_data: bytes = None) -> aead.StreamEncryptor:
+    """update()/finalize() ile artımlı AEAD şifreleyici"""
+    return aead.StreamEncryptor(key, mode, segment_size, associated_data)
+
+def aead_decryptor(key: bytes, mode: str = "gcm", associated_data: bytes = None) -> aead.StreamDecryptor:
+    """update()/finalize() ile artımlı AEAD çözücü; yalnızca doğrulanmış segmentleri döndürür"""
+    return aead.StreamDecryptor(key, mode, associated_data)
+
+def encrypt_stream_aead(infile, outfile, key: bytes, mode: str = "gcm", chunk_size: int = stream.CHUNK_SIZE) -> int:
+    """Akışı segmentli AEAD ile şifrele; yazılan byte sayısını döndürür"""
+    return aead.encrypt_stream(infile, outfile, key, mode, chunk_size)
+
+def decrypt_stream_aead(infile, outfile, key: bytes, mode: str = "gcm", chunk_size: int = stream.CHUNK_SIZE) -> int:
+    """encrypt_stream_aead çıktısını segment segment doğrulayarak çöz"""
+    return aead.decrypt_stream(infile, outfile, key, mode, chunk_size)
+
+def _ctr_chunk(key: bytes, nonce: bytes, counter: int, data, output=None):
+    return AES.new(key, AES.MODE_CTR, nonce=nonce, initial_value=counter).encrypt(data, output=output)
+
+def _cbc_decrypt_chunk(key: bytes, iv: bytes, data, output=None):
+    return AES.new(key, AES.MODE_CBC, iv).decrypt(data, output=output)
+
+def encrypt_ctr_parallel(data, key: bytes, nonce: bytes = None, workers: int = None,
+                         chunk_size: int = parallel.CHUNK_SIZE, executor: str = "thread") -> bytearray:
+    """
+    Büyük veriyi çok çekirdekte AES-CTR ile şifrele; çıktı nonce (8 byte) + şifreli veri
+
+    Her parça kendi sayaç aralığıyla (başlangıç = parça ofseti / 16) bağımsız
+    şifrelenir; sonuç tek parça AES-CTR (ve aes_manual ctr modu) ile birebir aynıdır.
+    """
+    nonce = nonce or get_random_bytes(8)
+    return parallel.map_chunks(_ctr_chunk, data, lambda start: (key, nonce, start // BLOCK_SIZE),
+                               BLOCK_SIZE, nonce, workers, chunk_size, executor)
+
+def decrypt_ctr_parallel(raw, key: bytes, workers: int = None,
+                         chunk_size: int = parallel.CHUNK_SIZE, executor: str = "thread") -> bytearray:
+    """encrypt_ctr_parallel çıktısını (nonce + şifreli veri) paralel çöz"""
+    raw = memoryview(raw)
+    nonce = bytes(raw[:8])
+    return parallel.map_chunks(_ctr_chunk, raw[8:], lambda start: (key, nonce, start // BLOCK_SIZE),
+                               BLOCK_SIZE, b"", workers, chunk_size, executor)
+
+def decrypt_cbc_parallel(raw, key: bytes, workers: int = None,
+                         chunk_size: int = parallel.CHUNK_SIZE, executor: str = "thread") -> bytearray:
+    """
+    iv + CBC şifreli veriyi paralel çöz (encrypt_stream / encrypt_bytes çıktısı)
+
+    CBC çözmede her blok yalnızca bir önceki şifreli bloğa bağlıdır; bu yüzden
+    her parça, kendinden önceki şifreli bloğu iv olarak alıp bağımsız çözülür.
+    """
+    raw = memoryview(raw)
+    if len(raw) < 2 * BLOCK_SIZE or len(raw) % BLOCK_SIZE:
+        raise ValueError("Geçersiz şifreli metin uzunluğu")
+    # raw = iv + şifreli veri olduğundan ofset start'taki parçanın iv'si raw[start:start + 16]
+    out = parallel.map_chunks(_cbc_decrypt_chunk, raw[BLOCK_SIZE:],
+                              lambda start: (key, bytes(raw[start:start + BLOCK_SIZE])),
+                              BLOCK_SIZE, b"", workers, chunk_size, executor)
+    padding_len = out[-1]
+    if not 1 <= padding_len <= BLOCK_SIZE or out[-padding_len:] != bytes([padding_len] * padding_len):
+        raise ValueError("Geçersiz dolgu")
+    del out[-padding_len:]
+    return out
+
@@ -1,28 +1,214 @@
-def s_box(byte: int) -> int:
-    # basit ve deterministic bir S-box
-    return (byte * 7 + 3) % 256
+"""
+Kütüphanesiz AES (FIPS-197) - T-tablo implementasyonu
+SubBytes, ShiftRows ve MixColumns tek bir tabloda birleştirilir; her tur
+16 tablo araması ve XOR ile yapılır. CBC ve CTR modları desteklenir.
+"""
+import os
+import struct
+from functools import lru_cache
 
-def xor_round(data: bytes, key: bytes) -> bytes:
-    return bytes([b ^ key[i % len(key)] for i, b in enumerate(data)])
+BLOCK_SIZE = 16
+KEY_CACHE_SIZE = 64
 
-def substitute(data: bytes) -> bytes:
-    return bytes([s_box(b) for b in data])
+def _xtime(a: int) -> int:
+    a <<= 1
+    return (a ^ 0x11B) if a & 0x100 else a
 
-def encrypt(plaintext: str, key: bytes, rounds: int = 3) -> bytes:
-    data = plaintext.encode()
+def _gmul(a: int, b: int) -> int:
+    # GF(2^8) çarpımı
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        a = _xtime(a)
+        b >>= 1
+    return result
 
-    for _ in range(rounds):
-        data = xor_round(data, key)
-        data = substitute(data)
+def _build_sbox():
+    # S-box: GF(2^8)'de çarpımsal ters + afin dönüşüm
+    sbox = [0] * 256
+    p = q = 1
+    while True:
+        p = p ^ _xtime(p)  # p *= 3
+        q ^= q << 1        # q /= 3
+        q ^= q << 2
+        q ^= q << 4
+        q &= 0xFF
+        if q & 0x80:
+            q ^= 0x09
+        x = q
+        for shift in range(1, 5):
+            x ^= ((q << shift) | (q >> (8 - shift))) & 0xFF
+        sbox[p] = x ^ 0x63
+        if p == 1:
+            break
+    sbox[0] = 0x63
+    inv_sbox = [0] * 256
+    for i, s in enumerate(sbox):
+        inv_sbox[s] = i
+    return sbox, inv_sbox
 
-    return data
+def _ror8(word: int) -> int:
+    return ((word >> 8) | (word << 24)) & 0xFFFFFFFF
 
-def decrypt(ciphertext: bytes, key: bytes, rounds: int = 3) -> str:
-    data = ciphertext
+def _build_tables():
+    te0 = [(_gmul(s, 2) << 24) | (s << 16) | (s << 8) | _gmul(s, 3) for s in SBOX]
+    td0 = [(_gmul(s, 14) << 24) | (_gmul(s, 9) << 16) | (_gmul(s, 13) << 8) | _gmul(s, 11) for s in INV_SBOX]
+    te = [te0]
+    td = [td0]
+    for _ in range(3):
+        te.append([_ror8(w) for w in te[-1]])
+        td.append([_ror8(w) for w in td[-1]])
+    return tuple(te), tuple(td)
 
-    for _ in range(rounds):
-        # inverse substitute (bruteforce since simple)
-        data = bytes([next(x for x in range(256) if s_box(x) == b) for b in data])
-        data = xor_round(data, key)
+SBOX, INV_SBOX = _build_sbox()
+(TE0, TE1, TE2, TE3), (TD0, TD1, TD2, TD3) = _build_tables()
+RCON = [0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1B, 0x36]
 
-    return data.decode()
+def _sub_word(w: int) -> int:
+    return (SBOX[w >> 24] << 24) | (SBOX[(w >> 16) & 0xFF] << 16) | (SBOX[(w >> 8) & 0xFF] << 8) | SBOX[w & 0xFF]
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _expand_key(key: bytes):
+    """Şifreleme ve çözme tur anahtarlarını bir kez üret (anahtar başına önbellekli)"""
+    if len(key) not in (16, 24, 32):
+        raise ValueError("AES anahtarı 16, 24 veya 32 byte olmalı")
+    nk = len(key) // 4
+    rounds = nk + 6
+    w = list(struct.unpack(f">{nk}I", key))
+    for i in range(nk, 4 * (rounds + 1)):
+        temp = w[i - 1]
+        if i % nk == 0:
+            temp = _sub_word(((temp << 8) | (temp >> 24)) & 0xFFFFFFFF) ^ (RCON[i // nk - 1] << 24)
+        elif nk > 6 and i % nk == 4:
+            temp = _sub_word(temp)
+        w.append(w[i - nk] ^ temp)
+
+    # Eşdeğer ters şifre: tur anahtarları ters sırada, aradakilere InvMixColumns
+    dec = []
+    for r in range(rounds, -1, -1):
+        words = w[4 * r:4 * r + 4]
+        if 0 < r < rounds:
+            words = [TD0[SBOX[x >> 24]] ^ TD1[SBOX[(x >> 16) & 0xFF]] ^
+                     TD2[SBOX[(x >> 8) & 0xFF]] ^ TD3[SBOX[x & 0xFF]] for x in words]
+        dec.extend(words)
+    return tuple(w), tuple(dec), rounds
+
+def _encrypt_block(s0, s1, s2, s3, rk, rounds):
+    s0 ^= rk[0]; s1 ^= rk[1]; s2 ^= rk[2]; s3 ^= rk[3]
+    k = 4
+    for _ in range(rounds - 1):
+        t0 = TE0[s0 >> 24] ^ TE1[(s1 >> 16) & 0xFF] ^ TE2[(s2 >> 8) & 0xFF] ^ TE3[s3 & 0xFF] ^ rk[k]
+        t1 = TE0[s1 >> 24] ^ TE1[(s2 >> 16) & 0xFF] ^ TE2[(s3 >> 8) & 0xFF] ^ TE3[s0 & 0xFF] ^ rk[k + 1]
+        t2 = TE0[s2 >> 24] ^ TE1[(s3 >> 16) & 0xFF] ^ TE2[(s0 >> 8) & 0xFF] ^ TE3[s1 & 0xFF] ^ rk[k + 2]
+        t3 = TE0[s3 >> 24] ^ TE1[(s0 >> 16) & 0xFF] ^ TE2[(s1 >> 8) & 0xFF] ^ TE3[s2 & 0xFF] ^ rk[k + 3]
+        s0, s1, s2, s3 = t0, t1, t2, t3
+        k += 4
+    # Son tur: MixColumns yok
+    S = SBOX
+    return (
+        ((S[s0 >> 24] << 24) | (S[(s1 >> 16) & 0xFF] << 16) | (S[(s2 >> 8) & 0xFF] << 8) | S[s3 & 0xFF]) ^ rk[k],
+        ((S[s1 >> 24] << 24) | (S[(s2 >> 16) & 0xFF] << 16) | (S[(s3 >> 8) & 0xFF] << 8) | S[s0 & 0xFF]) ^ rk[k + 1],
+        ((S[s2 >> 24] << 24) | (S[(s3 >> 16) & 0xFF] << 16) | (S[(s0 >> 8) & 0xFF] << 8) | S[s1 & 0xFF]) ^ rk[k + 2],
+        ((S[s3 >> 24] << 24) | (S[(s0 >> 16) & 0xFF] << 16) | (S[(s1 >> 8) & 0xFF] << 8) | S[s2 & 0xFF]) ^ rk[k + 3],
+    )
+
+def _decrypt_block(s0, s1, s2, s3, dk, rounds):
+    s0 ^= dk[0]; s1 ^= dk[1]; s2 ^= dk[2]; s3 ^= dk[3]
+    k = 4
+    for _ in range(rounds - 1):
+        t0 = TD0[s0 >> 24] ^ TD1[(s3 >> 16) & 0xFF] ^ TD2[(s2 >> 8) & 0xFF] ^ TD3[s1 & 0xFF] ^ dk[k]
+        t1 = TD0[s1 >> 24] ^ TD1[(s0 >> 16) & 0xFF] ^ TD2[(s3 >> 8) & 0xFF] ^ TD3[s2 & 0xFF] ^ dk[k + 1]
+        t2 = TD0[s2 >> 24] ^ TD1[(s1 >> 16) & 0xFF] ^ TD2[(s0 >> 8) & 0xFF] ^ TD3[s3 & 0xFF] ^ dk[k + 2]
+        t3 = TD0[s3 >> 24] ^ TD1[(s2 >> 16) & 0xFF] ^ TD2[(s1 >> 8) & 0xFF] ^ TD3[s0 & 0xFF] ^ dk[k + 3]
+        s0, s1, s2, s3 = t0, t1, t2, t3
+        k += 4
+    S = INV_SBOX
+    return (
+        ((S[s0 >> 24] << 24) | (S[(s3 >> 16) & 0xFF] << 16) | (S[(s2 >> 8) & 0xFF] << 8) | S[s1 & 0xFF]) ^ dk[k],
+        ((S[s1 >> 24] << 24) | (S[(s0 >> 16) & 0xFF] << 16) | (S[(s3 >> 8) & 0xFF] << 8) | S[s2 & 0xFF]) ^ dk[k + 1],
+        ((S[s2 >> 24] << 24) | (S[(s1 >> 16) & 0xFF] << 16) | (S[(s0 >> 8) & 0xFF] << 8) | S[s3 & 0xFF]) ^ dk[k + 2],
+        ((S[s3 >> 24] << 24) | (S[(s2 >> 16) & 0xFF] << 16) | (S[(s1 >> 8) & 0xFF] << 8) | S[s0 & 0xFF]) ^ dk[k + 3],
+    )
+
+def encrypt_block(block: bytes, key: bytes) -> bytes:
+    """Tek bir 16 byte'lık bloğu şifrele (ECB, test vektörleri için)"""
+    rk, _, rounds = _expand_key(bytes(key))
+    return struct.pack(">4I", *_encrypt_block(*struct.unpack(">4I", block), rk, rounds))
+
+def decrypt_block(block: bytes, key: bytes) -> bytes:
+    """Tek bir 16 byte'lık bloğu çöz"""
+    _, dk, rounds = _expand_key(bytes(key))
+    return struct.pack(">4I", *_decrypt_block(*struct.unpack(">4I", block), dk, rounds))
+
+def pad(data: bytes) -> bytes:
+    padding_len = BLOCK_SIZE - len(data) % BLOCK_SIZE
+    return data + bytes([padding_len] * padding_len)
+
+def unpad(data: bytes) -> bytes:
+    if not data or not 1 <= data[-1] <= BLOCK_SIZE:
+        raise ValueError("Geçersiz dolgu")
+    return data[:-data[-1]]
+
+def _cbc_encrypt(data: bytes, key: bytes, iv: bytes) -> bytes:
+    rk, _, rounds = _expand_key(key)
+    words = struct.unpack(f">{len(data) // 4}I", data)
+    c0, c1, c2, c3 = struct.unpack(">4I", iv)
+    out = []
+    for i in range(0, len(words), 4):
+        c0, c1, c2, c3 = _encrypt_block(words[i] ^ c0, words[i + 1] ^ c1,
+                                        words[i + 2] ^ c2, words[i + 3] ^ c3, rk, rounds)
+        out += (c0, c1, c2, c3)
+    return struct.pack(f">{len(out)}I", *out)
+
+def _cbc_decrypt(data: bytes, key: bytes, iv: bytes) -> bytes:
+    _, dk, rounds = _expand_key(key)
+    words = struct.unpack(">4I", iv) + struct.unpack(f">{len(data) // 4}I", data)
+    out = []
+    for i in range(4, len(words), 4):
+        p0, p1, p2, p3 = _decrypt_block(words[i], words[i + 1], words[i + 2], words[i + 3], dk, rounds)
+        out += (p0 ^ words[i - 4], p1 ^ words[i - 3], p2 ^ words[i - 2], p3 ^ words[i - 1])
+    return struct.pack(f">{len(out)}I", *out)
+
+def _ctr_keystream(key: bytes, nonce: bytes, length: int, counter: int = 0) -> bytes:
+    # Sayaç bloğu: 8 byte nonce + 8 byte big-endian sayaç (pycryptodome ile uyumlu)
+    rk, _, rounds = _expand_key(key)
+    n0, n1 = struct.unpack(">2I", nonce)
+    out = []
+    for c in range(counter, counter + (length + BLOCK_SIZE - 1) // BLOCK_SIZE):
+        out += _encrypt_block(n0, n1, (c >> 32) & 0xFFFFFFFF, c & 0xFFFFFFFF, rk, rounds)
+    return struct.pack(f">{len(out)}I", *out)[:length]
+
+def _xor(data: bytes, stream: bytes) -> bytes:
+    # tüm veri tek bir büyük tamsayı XOR'u ile
+    x = int.from_bytes(data, "little") ^ int.from_bytes(stream, "little")
+    return x.to_bytes(len(data), "little")
+
+def encrypt_bytes(data: bytes, key: bytes, mode: str = "cbc") -> bytes:
+    """Veriyi şifrele; çıktı CBC için iv + şifreli metin, CTR için nonce + şifreli metin"""
+    key = bytes(key)
+    if mode == "cbc":
+        iv = os.urandom(BLOCK_SIZE)
+        return iv + _cbc_encrypt(pad(data), key, iv)
+    elif mode == "ctr":
+        nonce = os.urandom(BLOCK_SIZE // 2)
+        return nonce + _xor(data, _ctr_keystream(key, nonce, len(data)))
+    raise ValueError(f"Bilinmeyen AES modu: {mode}")
+
+def decrypt_bytes(raw: bytes, key: bytes, mode: str = "cbc") -> bytes:
+    key = bytes(key)
+    if mode == "cbc":
+        body = raw[BLOCK_SIZE:]
+        if len(raw) < 2 * BLOCK_SIZE or len(body) % BLOCK_SIZE:
+            raise ValueError("Şifreli metin uzunluğu geçersiz")
+        return unpad(_cbc_decrypt(body, key, raw[:BLOCK_SIZE]))
+    elif mode == "ctr":
+        nonce, body = raw[:BLOCK_SIZE // 2], raw[BLOCK_SIZE // 2:]
+        return _xor(body, _ctr_keystream(key, nonce, len(body)))
+    raise ValueError(f"Bilinmeyen AES modu: {mode}")
+
+def encrypt(plaintext: str, key: bytes, mode: str = "cbc") -> bytes:
+    return encrypt_bytes(plaintext.encode(), key, mode)
+
+def decrypt(ciphertext: bytes, key: bytes, mode: str = "cbc") -> str:
+    return decrypt_bytes(ciphertext, key, mode).decode()
@@ -1,4 +1,5 @@
 from .base import Cipher
+from .translation import affine_table
 import math
 
 class Affine(Cipher):
@@ -25,29 +26,12 @@ class Affine(Cipher):
         a = int(kw.get("a", 5)); b = int(kw.get("b", 8))
         if math.gcd(a,26) != 1:
             raise ValueError("a ile 26 aralarında asal olmalı.")
-        out=[]
-        for ch in text:
-            if ch.isalpha():
-                base = ord('A') if ch.isupper() else ord('a')
-                x = ord(ch) - base
-                y = (a*x + b) % 26
-                out.append(chr(base + y))
-            else:
-                out.append(ch)
-        return "".join(out)
+        return affine_table(a % 26, b % 26).apply(text)
 
     def decrypt(self, text: str, **kw) -> str:
         a = int(kw.get("a", 5)); b = int(kw.get("b", 8))
         if math.gcd(a,26) != 1:
             raise ValueError("a ile 26 aralarında asal olmalı.")
         a_inv = self._modinv(a, 26)
-        out=[]
-        for ch in text:
-            if ch.isalpha():
-                base = ord('A') if ch.isupper() else ord('a')
-                y = ord(ch) - base
-                x = (a_inv*(y - b)) % 26
-                out.append(chr(base + x))
-            else:
-                out.append(ch)
-        return "".join(out)
+        # D(y) = a_inv*(y - b) de bir affine eşlemedir
+        return affine_table(a_inv, (-a_inv * b) % 26).apply(text)
@@ -1,19 +1,11 @@
 from .base import Cipher
+from .translation import affine_table
 
 class Caesar(Cipher):
     name = "caesar"
 
     def _shift(self, text: str, k: int):
-        out = []
-        k %= 26
-        for ch in text:
-            if ch.isalpha():
-                base = ord('A') if ch.isupper() else ord('a')
-                idx = (ord(ch) - base + k) % 26
-                out.append(chr(base + idx))
-            else:
-                out.append(ch)
-        return "".join(out)
+        return affine_table(1, k % 26).apply(text)
 
     def encrypt(self, text: str, **kw) -> str:
         return self._shift(text, int(kw.get("k", 3)))
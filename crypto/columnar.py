@@ -2,94 +2,91 @@
 Columnar Transposition Cipher (Sütunlu Transpozisyon Şifresi)
 Metni sütunlara böler ve anahtar kelimeye göre sütunları yeniden düzenler
 """
+from functools import lru_cache
+from math import lcm
 from .base import Cipher
+from . import permutation
+
+KEY_CACHE_SIZE = 128
+PERMUTATION_CACHE_SIZE = 64
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _key_order(key: str) -> tuple:
+    """Sütunların okunma sırası: önce harfe göre, sonra orijinal pozisyona göre"""
+    if not key:
+        raise ValueError("Columnar için boş olmayan bir anahtar gerekli.")
+    return tuple(sorted(range(len(key)), key=lambda x: (key[x], x)))
+
+@permutation.cached(PERMUTATION_CACHE_SIZE, lambda orders, length: length)
+def _columnar_permutation(orders: tuple, length: int):
+    """
+    Tüm geçişleri tek permütasyona derle. length her anahtar uzunluğunun
+    katı olduğundan her geçişte matris tam doludur.
+    """
+    passes = []
+    for order in orders:
+        cols = len(order)
+        passes.append(permutation.from_runs(range(col, length, cols) for col in order))
+    return permutation.compose(*passes)
 
 class ColumnarCipher(Cipher):
     name = "columnar"
-    
+
     def __init__(self):
         pass
-    
-    def encrypt(self, text: str, key: str = "CRYPTO", **kwargs) -> str:
+
+    def _orders(self, key: str, keys) -> tuple:
+        """Tek anahtarı veya çok geçişli anahtar listesini sütun sıralarına çevir"""
+        if keys:
+            if isinstance(keys, str):
+                keys = keys.split(",")
+            keys = [k.strip() for k in keys]
+        else:
+            keys = [key]
+        return tuple(_key_order(k.upper()) for k in keys)
+
+    def encrypt(self, text: str, key: str = "CRYPTO", keys=None, **kwargs) -> str:
         """
         Columnar Transposition ile şifreleme
-        
+
         Args:
             text: Şifrelenecek metin
             key: Anahtar kelime (sütunların sırasını belirler)
-        
+            keys: Çok geçişli (double) transpozisyon için anahtar listesi veya
+                virgülle ayrılmış anahtarlar; verilirse key yerine kullanılır
+
         Returns:
             Şifrelenmiş metin
         """
         # Boşlukları kaldır
         text = text.replace(" ", "")
-        key = key.upper()
-        
-        # Anahtar uzunluğu = sütun sayısı
-        num_cols = len(key)
-        num_rows = (len(text) + num_cols - 1) // num_cols
-        
-        # Matrisi oluştur
-        matrix = [['' for _ in range(num_cols)] for _ in range(num_rows)]
-        
-        # Metni satır satır yerleştir
-        idx = 0
-        for i in range(num_rows):
-            for j in range(num_cols):
-                if idx < len(text):
-                    matrix[i][j] = text[idx]
-                    idx += 1
-                else:
-                    matrix[i][j] = 'X'  # Dolgu karakteri
-        
-        # Anahtar sıralamasını bul
-        # Her karaktere indeksini ver ve alfabetik sıraya göre düzenle
-        key_indices = list(range(len(key)))
-        key_indices.sort(key=lambda x: (key[x], x))  # Önce harfe göre, sonra orijinal pozisyona göre
-        
-        result = ""
-        for col_idx in key_indices:
-            for i in range(num_rows):
-                result += matrix[i][col_idx]
-        
-        return result
-    
-    def decrypt(self, text: str, key: str = "CRYPTO", **kwargs) -> str:
+        orders = self._orders(key, keys)
+
+        # Metni tüm anahtar uzunluklarının katına kadar doldur
+        block = lcm(*(len(order) for order in orders))
+        length = (len(text) + block - 1) // block * block
+        text += 'X' * (length - len(text))  # Dolgu karakteri
+
+        return permutation.gather(text, _columnar_permutation(orders, length))
+
+    def decrypt(self, text: str, key: str = "CRYPTO", keys=None, **kwargs) -> str:
         """
         Columnar Transposition ile şifre çözme
-        
+
         Args:
             text: Şifreli metin
             key: Anahtar kelime
-        
+            keys: Şifrelemede kullanılan anahtar listesi (çok geçişli mod)
+
         Returns:
             Çözülmüş metin
         """
-        key = key.upper()
-        num_cols = len(key)
-        num_rows = len(text) // num_cols
-        
-        # Anahtar sıralamasını bul
-        key_indices = list(range(len(key)))
-        key_indices.sort(key=lambda x: (key[x], x))  # Önce harfe göre, sonra orijinal pozisyona göre
-        
-        # Matrisi oluştur
-        matrix = [['' for _ in range(num_cols)] for _ in range(num_rows)]
-        
-        # Şifreli metni sütunlara yerleştir (sıralamaya göre)
-        idx = 0
-        for col_idx in key_indices:
-            for i in range(num_rows):
-                if idx < len(text):
-                    matrix[i][col_idx] = text[idx]
-                    idx += 1
-        
-        # Satır satır oku
-        result = ""
-        for i in range(num_rows):
-            for j in range(num_cols):
-                if matrix[i][j]:
-                    result += matrix[i][j]
-        
-        return result.rstrip('X')  # Dolgu karakterlerini kaldır
+        orders = self._orders(key, keys)
+
+        # Tam dolu matrise sığmayan fazla karakterler yok sayılır
+        block = lcm(*(len(order) for order in orders))
+        length = len(text) // block * block
 
+        result = permutation.scatter(text[:length], _columnar_permutation(orders, length))
+
+        return result.rstrip('X')  # Dolgu karakterlerini kaldır
@@ -0,0 +1,194 @@
+"""
+Yeniden kullanılabilir şifre bağlamları (cipher context)
+Anahtar bir kez doğrulanır ve genişletilir; aynı bağlam her mesaj için yeni
+bir IV ile tekrar tekrar kullanılabilir.
+"""
+import base64
+from Crypto.Random import get_random_bytes
+from Crypto.Util.strxor import strxor
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class CipherContext:
+    """
+    CBC modunda çalışan blok şifre bağlamı. Alt sınıflar name, algorithm
+    (pycryptodome modülü), block_size ve key_sizes tanımlar.
+    """
+
+    name = ""
+    algorithm = None
+    block_size = 16
+    key_sizes = ()
+    # Bu kadar bloğa kadar CBC zinciri önceden kurulmuş ECB nesnesiyle yapılır;
+    # daha uzun mesajlarda tek bir C seviyesinde CBC çağrısı daha hızlıdır
+    chain_blocks = 4
+
+    def __init__(self, key: bytes):
+        key = bytes(key)
+        if len(key) not in self.key_sizes:
+            sizes = ", ".join(str(s) for s in self.key_sizes)
+            raise ValueError(f"{self.name} anahtarı {sizes} byte olmalı")
+        self.key = key
+        # ECB nesnesi durumsuzdur: anahtar genişletmesi bir kez yapılır, her mesajda yeniden kullanılır
+        self._ecb = self.algorithm.new(key, self.algorithm.MODE_ECB)
+
+    def pad(self, data: bytes) -> bytes:
+        padding_len = self.block_size - len(data) % self.block_size
+        return data + bytes([padding_len] * padding_len)
+
+    def _padding_length(self, data) -> int:
+        """PKCS#7 dolgu uzunluğu; değer 1..block_size olmalı ve tüm dolgu byte'ları eşit olmalı"""
+        n = data[-1] if len(data) else 0
+        if not 1 <= n <= self.block_size or bytes(data[-n:]) != bytes([n]) * n:
+            raise ValueError("Geçersiz dolgu")
+        return n
+
+    def unpad(self, data: bytes) -> bytes:
+        return data[:-self._padding_length(data)]
+
+    def _check_length(self, raw):
+        if len(raw) < 2 * self.block_size or len(raw) % self.block_size:
+            raise ValueError("Geçersiz şifreli metin uzunluğu")
+
+    def ciphertext_size(self, length: int) -> int:
+        """length byte'lık düz metnin şifreli boyutu (iv + dolgulu veri)"""
+        return self.block_size + (length // self.block_size + 1) * self.block_size
+
+    def encrypt_bytes(self, data, output=None):
+        """
+        Veriyi yeni bir IV ile şifrele; çıktı iv + şifreli veri
+
+        Args:
+            data: bytes, bytearray veya memoryview
+            output: Verilirse sonuç bu yazılabilir tampona yazılır (en az
+                ciphertext_size(len(data)) byte); dolgu yerinde eklenir ve
+                yazılan bölgenin memoryview'ı döner
+
+        Returns:
+            output yoksa bytes, varsa output'un yazılan kısmı (memoryview)
+        """
+        if output is not None:
+            return self._encrypt_into(memoryview(data).cast("B"), output)
+        bs = self.block_size
+        iv = get_random_bytes(bs)
+        padded = self.pad(bytes(data))
+        if len(padded) > self.chain_blocks * bs:
+            return iv + self.algorithm.new(self.key, self.algorithm.MODE_CBC, iv).encrypt(padded)
+        out = [iv]
+        prev = iv
+        for i in range(0, len(padded), bs):
+            prev = self._ecb.encrypt(strxor(padded[i:i + bs], prev))
+            out.append(prev)
+        return b"".join(out)
+
+    def _encrypt_into(self, data: memoryview, output) -> memoryview:
+        bs = self.block_size
+        size = self.ciphertext_size(len(data))
+        out = memoryview(output).cast("B")
+        if len(out) < size:
+            raise ValueError(f"Çıktı tamponu en az {size} byte olmalı")
+        out = out[:size]
+        iv = get_random_bytes(bs)
+        out[:bs] = iv
+        body = out[bs:]
+        body[:len(data)] = data
+        padding_len = len(body) - len(data)
+        body[len(data):] = bytes([padding_len]) * padding_len
+        # pycryptodome yerinde (girdi == çıktı) şifrelemeyi destekler
+        self.algorithm.new(self.key, self.algorithm.MODE_CBC, iv).encrypt(body, output=body)
+        return out
+
+    def decrypt_bytes(self, raw, output=None):
+        """
+        iv + şifreli veriyi çöz
+
+        Args:
+            raw: bytes, bytearray veya memoryview
+            output: Verilirse düz metin bu tampona yazılır (en az
+                len(raw) - block_size byte) ve yazılan bölgenin memoryview'ı döner
+        """
+        bs = self.block_size
+        if output is None:
+            raw = bytes(raw)
+            self._check_length(raw)
+            # CBC çözme: P_i = D(C_i) xor C_{i-1}; tüm bloklar tek ECB çağrısıyla çözülür
+            decrypted = self._ecb.decrypt(raw[bs:])
+            return self.unpad(strxor(decrypted, raw[:len(decrypted)]))
+        raw = memoryview(raw).cast("B")
+        self._check_length(raw)
+        out = memoryview(output).cast("B")
+        size = len(raw) - bs
+        if len(out) < size:
+            raise ValueError(f"Çıktı tamponu en az {size} byte olmalı")
+        out = out[:size]
+        self.algorithm.new(self.key, self.algorithm.MODE_CBC, bytes(raw[:bs])).decrypt(raw[bs:], output=out)
+        return out[:size - self._padding_length(out)]
+
+    def encrypt(self, plaintext: str) -> str:
+        return base64.b64encode(self.encrypt_bytes(plaintext.encode())).decode()
+
+    def decrypt(self, ciphertext_b64: str) -> str:
+        return self.decrypt_bytes(base64.b64decode(ciphertext_b64)).decode()
+
+    def encrypt_many(self, plaintexts) -> list:
+        """
+        Birçok kısa mesajı aynı anahtarla şifrele; her mesaja ayrı IV verilir.
+
+        Tüm mesajlar (iv + dolgulu veri) tek bir önceden ayrılmış tamponda
+        tutulur. CBC zinciri blok sırasına göre ilerler: j. turda j+1 veya daha
+        fazla bloğu olan tüm mesajların j. bloğu tek bir ECB çağrısıyla
+        şifrelenir, yani ECB çağrısı sayısı en uzun mesajın blok sayısı kadardır.
+        """
+        if not NUMPY_AVAILABLE:
+            return [self.encrypt(p) for p in plaintexts]
+        bs = self.block_size
+        datas = [p.encode() for p in plaintexts]
+        if not datas:
+            return []
+        ivs = get_random_bytes(bs * len(datas))
+        pads = [bytes([n] * n) for n in range(bs + 1)]
+        parts = []
+        for i, data in enumerate(datas):
+            parts += (ivs[i * bs:(i + 1) * bs], data, pads[bs - len(data) % bs])
+        buf = np.frombuffer(bytearray(b"".join(parts)), dtype=np.uint8).reshape(-1, bs)
+
+        nblocks = np.fromiter((len(d) // bs + 1 for d in datas), dtype=np.int64, count=len(datas))
+        # Her mesajın IV satırı; şifreli blok j, IV satırından j+1 sonra gelir
+        starts = np.concatenate(([0], np.cumsum(nblocks + 1)[:-1]))
+        order = np.argsort(-nblocks, kind="stable")
+        sorted_starts, sorted_blocks = starts[order], nblocks[order]
+        for j in range(int(sorted_blocks[0])):
+            rows = sorted_starts[:np.count_nonzero(sorted_blocks > j)] + 1 + j
+            chained = (buf[rows] ^ buf[rows - 1]).tobytes()
+            buf[rows] = np.frombuffer(self._ecb.encrypt(chained), dtype=np.uint8).reshape(-1, bs)
+
+        raw = memoryview(buf.reshape(-1))
+        return [base64.b64encode(raw[s * bs:(s + n + 1) * bs]).decode()
+                for s, n in zip(starts.tolist(), nblocks.tolist())]
+
+    def decrypt_many(self, ciphertexts_b64) -> list:
+        """
+        encrypt_many (veya encrypt) çıktılarını toplu çöz. CBC çözme paralel
+        olduğundan tüm mesajlar birleştirilip tek ECB çağrısı ve tek XOR ile çözülür.
+        """
+        bs = self.block_size
+        raws = [base64.b64decode(c) for c in ciphertexts_b64]
+        for raw in raws:
+            self._check_length(raw)
+        if not raws:
+            return []
+        buf = b"".join(raws)
+        # plain[k] = D(C[k+1]) xor C[k]; mesaj başlarındaki IV satırları atlanır
+        plain = strxor(self._ecb.decrypt(buf[bs:]), buf[:-bs])
+        out = []
+        offset = 0
+        for raw in raws:
+            out.append(self.unpad(plain[offset:offset + len(raw) - bs]).decode())
+            offset += len(raw)
+        return out
+
@@ -1,8 +1,11 @@
 from Crypto.Cipher import DES
 from Crypto.Random import get_random_bytes
-import base64
+from functools import lru_cache
+from . import stream
+from .context import CipherContext
 
 BLOCK_SIZE = 8
+CONTEXT_CACHE_SIZE = 1024
 
 def pad(data: bytes) -> bytes:
     padding_len = BLOCK_SIZE - len(data) % BLOCK_SIZE
@@ -14,16 +17,52 @@ def unpad(data: bytes) -> bytes:
 def generate_key() -> bytes:
     return get_random_bytes(8)  # DES = 8 byte key
 
+class DESContext(CipherContext):
+    name = "DES"
+    algorithm = DES
+    block_size = BLOCK_SIZE
+    key_sizes = (8,)
+
+@lru_cache(maxsize=CONTEXT_CACHE_SIZE)
+def _cached_context(key: bytes) -> DESContext:
+    return DESContext(key)
+
+def get_context(key) -> DESContext:
+    """Anahtar başına önbelleklenmiş bağlam (str anahtarlar UTF-8 ile kodlanır)"""
+    if isinstance(key, str):
+        key = key.encode()
+    return _cached_context(bytes(key))
+
 def encrypt(plaintext: str, key: bytes) -> str:
-    cipher = DES.new(key, DES.MODE_CBC)
-    ciphertext = cipher.encrypt(pad(plaintext.encode()))
-    result = cipher.iv + ciphertext
-    return base64.b64encode(result).decode()
+    return get_context(key).encrypt(plaintext)
 
 def decrypt(ciphertext_b64: str, key: bytes) -> str:
-    raw = base64.b64decode(ciphertext_b64)
-    iv = raw[:BLOCK_SIZE]
-    ciphertext = raw[BLOCK_SIZE:]
-    cipher = DES.new(key, DES.MODE_CBC, iv)
-    plaintext = unpad(cipher.decrypt(ciphertext))
-    return plaintext.decode()
+    return get_context(key).decrypt(ciphertext_b64)
+
+def ciphertext_size(length: int) -> int:
+    """encrypt_bytes çıktısının boyutu (output tamponunu ayırmak için)"""
+    return BLOCK_SIZE + (length // BLOCK_SIZE + 1) * BLOCK_SIZE
+
+def encrypt_bytes(data, key: bytes, output=None):
+    """Base64'süz şifreleme: iv + şifreli veri; output verilirse sonuç oraya yazılır"""
+    return get_context(key).encrypt_bytes(data, output)
+
+def decrypt_bytes(raw, key: bytes, output=None):
+    """encrypt_bytes çıktısını çöz; output verilirse düz metin oraya yazılır"""
+    return get_context(key).decrypt_bytes(raw, output)
+
+def encrypt_many(plaintexts, key: bytes) -> list:
+    """Aynı anahtarla çok sayıda mesajı toplu şifrele (her mesaja ayrı IV)"""
+    return get_context(key).encrypt_many(plaintexts)
+
+def decrypt_many(ciphertexts_b64, key: bytes) -> list:
+    """encrypt_many çıktılarını toplu çöz"""
+    return get_context(key).decrypt_many(ciphertexts_b64)
+
+def encrypt_stream(infile, outfile, key: bytes, chunk_size: int = stream.CHUNK_SIZE) -> int:
+    """Akışı parça parça şifrele (iv + şifreli veri, base64 yok); yazılan byte sayısını döndürür"""
+    return stream.encrypt_stream(DES.new(key, DES.MODE_CBC), BLOCK_SIZE, infile, outfile, chunk_size)
+
+def decrypt_stream(infile, outfile, key: bytes, chunk_size: int = stream.CHUNK_SIZE) -> int:
+    """encrypt_stream çıktısını parça parça çöz; yazılan byte sayısını döndürür"""
+    return stream.decrypt_stream(lambda iv: DES.new(key, DES.MODE_CBC, iv), BLOCK_SIZE, infile, outfile, chunk_size)
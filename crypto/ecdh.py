@@ -0,0 +1,77 @@
+"""
+X25519 (ECDH) anahtar anlaşması
+RSA anahtar taşımaya alternatif: istemci her oturum için geçici (ephemeral)
+bir X25519 anahtarı üretir ve sunucunun sabit X25519 anahtarıyla ortak sır
+hesaplar. Oturum sırrı, iki açık anahtara bağlanan HKDF ile türetilir.
+Sunucu tarafı maliyeti oturum başına tek bir X25519 çarpımıdır.
+"""
+import base64
+import hashlib
+from Crypto.Hash import SHA256
+from Crypto.Protocol.DH import key_agreement, import_x25519_public_key
+from Crypto.Protocol.KDF import HKDF
+from Crypto.PublicKey import ECC
+from .session import SECRET_SIZE
+
+CURVE = "Curve25519"
+HKDF_INFO = b"crypto-session x25519"
+
+
+def generate_key():
+    return ECC.generate(curve=CURVE)
+
+
+def export_private_key(key) -> str:
+    return key.export_key(format="PEM")
+
+
+def import_private_key(pem: str):
+    key = ECC.import_key(pem)
+    if key.curve.lower() != CURVE.lower() or not key.has_private():
+        raise ValueError("X25519 private key bekleniyor")
+    return key
+
+
+def public_bytes(key) -> bytes:
+    """Açık anahtarın 32 byte ham gösterimi"""
+    return key.public_key().export_key(format="raw")
+
+
+def encode_public(key) -> str:
+    return base64.b64encode(public_bytes(key)).decode()
+
+
+def fingerprint(public_raw: bytes) -> str:
+    return hashlib.sha256(public_raw).hexdigest()
+
+
+def decode_public(public_b64: str) -> bytes:
+    """base64 açık anahtarı ham 32 byte'a çevir"""
+    try:
+        raw = base64.b64decode(public_b64)
+    except (ValueError, TypeError):
+        raise ValueError("Geçersiz X25519 açık anahtarı") from None
+    if len(raw) != 32:
+        raise ValueError("Geçersiz X25519 açık anahtarı")
+    return raw
+
+
+def derive_secret(private_key, peer_public: bytes, client_public: bytes, server_public: bytes) -> bytes:
+    """
+    Ortak oturum sırrı; HKDF tuzu iki açık anahtardan oluşur, böylece sır bu
+    el sıkışmaya bağlanır
+
+    Args:
+        private_key: Kendi X25519 anahtarımız (istemcide geçici, sunucuda sabit)
+        peer_public: Karşı tarafın ham açık anahtarı (32 byte)
+        client_public / server_public: İki tarafın ham açık anahtarları
+    """
+    try:
+        peer = import_x25519_public_key(peer_public)
+    except (ValueError, TypeError):
+        raise ValueError("Geçersiz X25519 açık anahtarı") from None
+    return key_agreement(
+        static_priv=private_key,
+        static_pub=peer,
+        kdf=lambda z: HKDF(z, SECRET_SIZE, client_public + server_public, SHA256, context=HKDF_INFO),
+    )
@@ -1,7 +1,16 @@
 # crypto/hill.py
+from functools import lru_cache
+from math import isqrt
 from typing import List
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 ALPH = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+MATRIX_CACHE_SIZE = 128
 
 def _modinv(a: int, m: int) -> int:
     # Extended Euclidean to find modular inverse of a mod m, or raise
@@ -14,38 +23,25 @@ def _modinv(a: int, m: int) -> int:
         raise ValueError("Modüler ters yok (gcd != 1).")
     return t0 % m
 
-def _matrix_det_2x2(m):
-    return m[0][0]*m[1][1] - m[0][1]*m[1][0]
-
-def _matrix_inv_2x2(m):
-    det = _matrix_det_2x2(m)
-    det_mod = det % 26
-    inv_det = _modinv(det_mod, 26)
-    # adjugate
-    inv = [[ m[1][1]*inv_det % 26, (-m[0][1])*inv_det % 26],
-           [(-m[1][0])*inv_det % 26, m[0][0]*inv_det % 26]]
-    return inv
-
-def _matrix_det_3x3(m):
-    a,b,c = m[0]
-    d,e,f = m[1]
-    g,h,i = m[2]
-    return a*(e*i-f*h) - b*(d*i-f*g) + c*(d*h-e*g)
-
-def _matrix_inv_3x3(m):
-    det = _matrix_det_3x3(m)
-    det_mod = det % 26
-    inv_det = _modinv(det_mod, 26)
-    # compute matrix of cofactors transposed (adjugate)
-    a,b,c = m[0]; d,e,f = m[1]; g,h,i = m[2]
-    co = [
-      [ (e*i - f*h), -(b*i - c*h),  (b*f - c*e)],
-      [-(d*i - f*g),  (a*i - c*g), -(a*f - c*d)],
-      [ (d*h - e*g), -(a*h - b*g),  (a*e - b*d)]
-    ]
-    # multiply by inv_det and mod 26
-    inv = [[(co[r][c]*inv_det) % 26 for c in range(3)] for r in range(3)]
-    return inv
+def _matrix_inv_mod(m, mod: int = 26):
+    # Gauss-Jordan elimination over Z/mod on the augmented matrix [M | I].
+    # mod is composite, so pivots are built with Euclidean row operations
+    # (unimodular) until the pivot equals the gcd of the column.
+    n = len(m)
+    aug = [[x % mod for x in row] + [int(r == c) for c in range(n)] for r, row in enumerate(m)]
+    for col in range(n):
+        for r in range(col + 1, n):
+            while aug[r][col]:
+                q = aug[col][col] // aug[r][col]
+                aug[col] = [(a - q * b) % mod for a, b in zip(aug[col], aug[r])]
+                aug[col], aug[r] = aug[r], aug[col]
+        inv_pivot = _modinv(aug[col][col], mod)
+        aug[col] = [(a * inv_pivot) % mod for a in aug[col]]
+        for r in range(n):
+            f = aug[r][col]
+            if r != col and f:
+                aug[r] = [(a - f * b) % mod for a, b in zip(aug[r], aug[col])]
+    return [row[n:] for row in aug]
 
 def _text_to_nums(text: str) -> List[int]:
     return [ALPH.index(ch) for ch in text.upper() if ch.isalpha()]
@@ -60,36 +56,55 @@ def _chunk_list(lst, n):
 def _matrix_mul_vec(matrix, vec):
     return [ sum(matrix[r][c]*vec[c] for c in range(len(vec))) % 26 for r in range(len(matrix)) ]
 
-def encrypt(plaintext: str, key: str) -> str:
-    # key: string of length 4 (2x2) or 9 (3x3) letters => fill row-major
-    clean = ''.join([c for c in plaintext.upper() if c.isalpha()])
-    if len(key) not in (4,9):
-        raise ValueError("Key uzunluğu 4 (2x2) veya 9 (3x3) olmalı.")
-    n = 2 if len(key)==4 else 3
+@lru_cache(maxsize=MATRIX_CACHE_SIZE)
+def _key_matrix(key: str):
+    # key: n*n letters => fill row-major (4 -> 2x2, 9 -> 3x3, 16 -> 4x4, ...)
+    n = isqrt(len(key))
+    if n == 0 or n * n != len(key):
+        raise ValueError("Key uzunluğu bir tam kare olmalı (4, 9, 16, ... harf).")
     key_nums = _text_to_nums(key)
-    matrix = [key_nums[i*n:(i+1)*n] for i in range(n)]
-    nums = _text_to_nums(clean)
-    # pad with 'X' (23) to multiple of n
-    pad_len = (-len(nums)) % n
-    nums += [ALPH.index('X')]*pad_len
-    cipher_nums = []
-    for chunk in _chunk_list(nums, n):
-        cipher_nums.extend(_matrix_mul_vec(matrix, chunk))
-    return _nums_to_text(cipher_nums)
+    if len(key_nums) != len(key):
+        raise ValueError("Key yalnızca harflerden oluşmalı.")
+    return tuple(tuple(key_nums[i*n:(i+1)*n]) for i in range(n))
+
+@lru_cache(maxsize=MATRIX_CACHE_SIZE)
+def _inverse_matrix(key: str):
+    return tuple(tuple(row) for row in _matrix_inv_mod(_key_matrix(key)))
+
+def _clean(text: str) -> str:
+    letters = ''.join(filter(str.isalpha, text.upper()))
+    if not letters.isascii():
+        raise ValueError("Hill yalnızca A-Z harflerini destekler.")
+    return letters
+
+def _apply(matrix, letters: str, pad: bool) -> str:
+    n = len(matrix)
+    if not NUMPY_AVAILABLE:
+        nums = _text_to_nums(letters)
+        if pad:
+            nums += [ALPH.index('X')] * ((-len(nums)) % n)
+        out = []
+        for chunk in _chunk_list(nums, n):
+            out.extend(_matrix_mul_vec(matrix, chunk))
+        return _nums_to_text(out)
+
+    nums = np.frombuffer(letters.encode('ascii'), dtype=np.uint8).astype(np.int64) - ord('A')
+    if pad:
+        # pad with 'X' (23) to multiple of n
+        nums = np.concatenate([nums, np.full((-nums.size) % n, ALPH.index('X'), dtype=np.int64)])
+    m = np.array(matrix, dtype=np.int64)
+    full = nums.size - nums.size % n
+    # all blocks at once: (blocks x n) @ M^T
+    out = (nums[:full].reshape(-1, n) @ m.T % 26).ravel()
+    if full < nums.size:
+        # eksik son blok yalnızca ilk sütunlarla çarpılır
+        tail = nums[full:]
+        out = np.concatenate([out, m[:, :tail.size] @ tail % 26])
+    return (out.astype(np.uint8) + ord('A')).tobytes().decode('ascii')
+
+def encrypt(plaintext: str, key: str) -> str:
+    return _apply(_key_matrix(key), _clean(plaintext), pad=True)
 
 def decrypt(ciphertext: str, key: str) -> str:
-    if len(key) not in (4,9):
-        raise ValueError("Key uzunluğu 4 (2x2) veya 9 (3x3) olmalı.")
-    n = 2 if len(key)==4 else 3
-    key_nums = _text_to_nums(key)
-    matrix = [key_nums[i*n:(i+1)*n] for i in range(n)]
-    # inverse matrix
-    if n == 2:
-        inv = _matrix_inv_2x2(matrix)
-    else:
-        inv = _matrix_inv_3x3(matrix)
-    nums = _text_to_nums(ciphertext)
-    plain_nums = []
-    for chunk in _chunk_list(nums, n):
-        plain_nums.extend(_matrix_mul_vec(inv, chunk))
-    return _nums_to_text(plain_nums)
+    _key_matrix(key)
+    return _apply(_inverse_matrix(key), _clean(ciphertext), pad=False)
@@ -0,0 +1,126 @@
+"""
+Parola tabanlı anahtar türetme (PBKDF2-HMAC-SHA256, scrypt)
+KDF'ler kasıtlı olarak yavaştır; KDFCache türetilmiş anahtarları
+(parola özeti, tuz, parametreler) ile sınırlı ve TTL'li bir önbellekte tutar,
+böylece aynı parolayla tekrarlanan istekler KDF maliyetini yeniden ödemez.
+Önbellekte parolanın kendisi değil SHA-256 özeti saklanır.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from Crypto.Hash import SHA256
+from Crypto.Protocol.KDF import PBKDF2, scrypt
+
+KDFS = ("pbkdf2", "scrypt")
+DEFAULT_KDF = "pbkdf2"
+# Tuz verilmezse kullanılır; istek başına tuz için salt seçeneği verilmeli
+DEFAULT_SALT = b"crypto-app kdf salt"
+PBKDF2_ITERATIONS = 200_000
+# Üst sınırlar kimlik doğrulamasız isteklerden gelen maliyeti sınırlar:
+# 600 bin PBKDF2-SHA256 yinelemesi (OWASP önerisi) ve scrypt için 32 MiB bellek (128 * r * N)
+PBKDF2_MAX_ITERATIONS = 600_000
+SCRYPT_COST = 2 ** 14  # N
+SCRYPT_MAX_COST = 2 ** 15
+SCRYPT_BLOCK_SIZE = 8  # r
+SCRYPT_PARALLELISM = 1  # p
+KDF_CACHE_TTL = 600  # saniye
+KDF_CACHE_SIZE = 1024
+
+
+def parse_salt(salt) -> bytes:
+    """Hex tuzu byte'a çevir; verilmezse varsayılan tuz"""
+    if salt is None or salt == "":
+        return DEFAULT_SALT
+    if isinstance(salt, (bytes, bytearray)):
+        return bytes(salt)
+    try:
+        return bytes.fromhex(salt)
+    except (ValueError, TypeError):
+        raise ValueError("Tuz (salt) hex formatında olmalı") from None
+
+
+def params(kdf: str = DEFAULT_KDF, iterations=None, cost=None) -> tuple:
+    """Doğrulanmış KDF parametreleri: pbkdf2 için yineleme sayısı, scrypt için (N, r, p)"""
+    if kdf == "pbkdf2":
+        iterations = int(iterations or PBKDF2_ITERATIONS)
+        if not 1000 <= iterations <= PBKDF2_MAX_ITERATIONS:
+            raise ValueError(f"PBKDF2 yineleme sayısı 1000 ile {PBKDF2_MAX_ITERATIONS} arasında olmalı")
+        return (iterations,)
+    if kdf == "scrypt":
+        cost = int(cost or SCRYPT_COST)
+        if cost < 2 ** 10 or cost > SCRYPT_MAX_COST or cost & (cost - 1):
+            raise ValueError(f"scrypt maliyeti (N) 1024 ile {SCRYPT_MAX_COST} arasında 2'nin kuvveti olmalı")
+        return (cost, SCRYPT_BLOCK_SIZE, SCRYPT_PARALLELISM)
+    raise ValueError(f"Bilinmeyen KDF: {kdf} ({', '.join(KDFS)})")
+
+
+def derive_key(password, salt: bytes, length: int, kdf: str = DEFAULT_KDF, kdf_params: tuple = None) -> bytes:
+    """Paroladan length byte anahtar türet (önbelleksiz)"""
+    if isinstance(password, str):
+        password = password.encode()
+    kdf_params = kdf_params or params(kdf)
+    if kdf == "pbkdf2":
+        return PBKDF2(password, salt, dkLen=length, count=kdf_params[0], hmac_hash_module=SHA256)
+    if kdf == "scrypt":
+        n, r, p = kdf_params
+        return scrypt(password, salt, key_len=length, N=n, r=r, p=p)
+    raise ValueError(f"Bilinmeyen KDF: {kdf} ({', '.join(KDFS)})")
+
+
+class KDFCache:
+    """
+    Türetilmiş anahtar önbelleği: ttl saniye sonra süresi dolar, en fazla
+    max_entries anahtar tutulur (en uzun süredir kullanılmayan atılır)
+    """
+
+    def __init__(self, ttl: float = KDF_CACHE_TTL, max_entries: int = KDF_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def derive(self, password, salt: bytes, length: int, kdf: str = DEFAULT_KDF,
+               iterations=None, cost=None) -> bytes:
+        """Önbellekte varsa türetilmiş anahtarı döndür, yoksa türetip sakla"""
+        if isinstance(password, str):
+            password = password.encode()
+        kdf_params = params(kdf, iterations, cost)
+        entry = (hashlib.sha256(password).digest(), salt, length, kdf, kdf_params)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._keys.get(entry)
+            if cached is not None and cached[1] > now:
+                self._keys.move_to_end(entry)
+                self.hits += 1
+                return cached[0]
+            self.misses += 1
+        # KDF kilit dışında çalışır; diğer istekler beklemez
+        key = derive_key(password, salt, length, kdf, kdf_params)
+        with self._lock:
+            self._keys[entry] = (key, now + self.ttl)
+            self._keys.move_to_end(entry)
+            while len(self._keys) > self.max_entries:
+                self._keys.popitem(last=False)
+        return key
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._keys),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 3) if total else None,
+            }
+
+    def __len__(self) -> int:
+        return len(self._keys)
@@ -1,68 +1,151 @@
 """
 Anahtar yönetimi modülü
-AES, DES ve RSA anahtarlarını üretir ve yönetir
+AES, DES, RSA ve X25519 anahtarlarını üretir ve yönetir
 """
 import os
 import json
-from typing import Optional, Tuple
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
 from pathlib import Path
+from .key_store import KeyStore, JSONStore, open_store
 
 try:
-    from Crypto.PublicKey import RSA
+    from Crypto.PublicKey import RSA, ECC
+    from . import rsa as rsa_lib
     CRYPTO_AVAILABLE = True
 except ImportError:
     CRYPTO_AVAILABLE = False
 
+# Bellekte çözülmüş halde tutulan en fazla anahtar sayısı
+KEY_CACHE_SIZE = 4096
+# Ayrıştırılmış RSA handle'larının önbellek adı eki; aynı depo değerinin PEM
+# metni ile handle'ı ayrı girdilerde tutulur
+HANDLE_SUFFIX = ":handle"
+# Toplu üretilebilen simetrik anahtar türleri ve boyutları (byte)
+KEY_SIZES = {"aes": 16, "des": 8}
+
 
 class KeyManager:
     """Anahtar yönetimi sınıfı"""
     
-    def __init__(self, key_file: str = "keys.json"):
+    def __init__(self, key_file: str = "keys.db", backend=None, cache_size: int = KEY_CACHE_SIZE,
+                 legacy_file: str = None):
+        """
+        Args:
+            key_file: Anahtar dosyası
+            backend: "json", "log", "sqlite" veya bir KeyStore nesnesi;
+                verilmezse dosya uzantısından seçilir (.json, .log, .db)
+            cache_size: Bellekte çözülmüş tutulacak en fazla anahtar sayısı (0: önbellek yok)
+            legacy_file: Eski keys.json dosyası; key_file henüz yoksa anahtarları
+                bir kez içe aktarılır (eski dosya olduğu gibi bırakılır)
+        """
         self.key_file = Path(key_file)
-        self.keys = self._load_keys()
-    
-    def _load_keys(self) -> dict:
-        """Anahtarları dosyadan yükle"""
-        if self.key_file.exists():
-            try:
-                with open(self.key_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
-    
-    def _save_keys(self):
-        """Anahtarları dosyaya kaydet"""
-        with open(self.key_file, 'w') as f:
+        # Depo açılınca dosya oluşur; taşıma gereği açmadan önce belirlenir
+        migrate = (legacy_file is not None and not isinstance(backend, KeyStore)
+                   and not self.key_file.exists() and Path(legacy_file).exists())
+        self.store = backend if isinstance(backend, KeyStore) else open_store(self.key_file, backend)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        if migrate:
+            self.import_json(legacy_file)
+    
+    def sync(self):
+        """
+        Başka süreçlerin depoya yazdıklarını al ve yalnızca değişen anahtarları
+        önbellekten at (değişenler bilinmiyorsa önbellek boşaltılır)
+        """
+        changed = self.store.refresh()
+        if changed is None:
+            self.clear_cache()
+        elif changed:
+            self._forget(changed)
+    
+    def _cached(self, name: str, decode, sync: bool = True, cache_name: str = None):
+        """
+        Depodaki değeri çözülmüş halde döndür (bytes veya RSA handle); ilk
+        erişimde çözülür, en fazla cache_size değer tutulur (LRU)
+
+        Args:
+            cache_name: Önbellek girdisinin adı (verilmezse name); aynı değerin
+                farklı çözümleri (PEM metni ve handle) ayrı girdilerde tutulur
+        """
+        if sync:
+            self.sync()
+        cache_name = cache_name or name
+        with self._cache_lock:
+            if cache_name in self._cache:
+                self._cache.move_to_end(cache_name)
+                return self._cache[cache_name]
+        raw = self.store.get(name)
+        if not raw:
+            return None
+        value = decode(raw)
+        self._remember(cache_name, value)
+        return value
+    
+    def _remember(self, name: str, value):
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[name] = value
+            self._cache.move_to_end(name)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def _forget(self, names: Iterable[str]):
+        with self._cache_lock:
+            for name in names:
+                self._cache.pop(name, None)
+                self._cache.pop(name + HANDLE_SUFFIX, None)
+    
+    def _write(self, items: Dict[str, str]):
+        """Depoya tek seferde yaz ve eski çözülmüş değerleri önbellekten at"""
+        self.store.set_many(list(items.items()))
+        self._forget(items)
+    
+    def clear_cache(self):
+        """Çözülmüş anahtar önbelleğini boşalt (depo değişmez)"""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    @property
+    def keys(self) -> dict:
+        """Tüm anahtarlar (anahtar kimliği -> saklanan değer)"""
+        self.sync()
+        return dict(self.store.items())
+    
+    def export_json(self, path: str):
+        """Tüm anahtarları eski keys.json biçiminde dışa aktar"""
+        with open(path, 'w') as f:
             json.dump(self.keys, f, indent=2)
     
+    def import_json(self, path: str) -> int:
+        """keys.json biçimindeki anahtarları tek seferde içe aktar; aktarılan sayıyı döndürür"""
+        items = dict(JSONStore(path).items())
+        self._write(items)
+        return len(items)
+    
     def generate_aes_key(self, key_id: str = "default") -> bytes:
         """AES-128 anahtarı üret (16 byte)"""
         key = os.urandom(16)
-        self.keys[f"aes_{key_id}"] = key.hex()
-        self._save_keys()
+        self.set_aes_key(key_id, key)
         return key
     
     def get_aes_key(self, key_id: str = "default") -> Optional[bytes]:
         """AES anahtarını al"""
-        key_hex = self.keys.get(f"aes_{key_id}")
-        if key_hex:
-            return bytes.fromhex(key_hex)
-        return None
+        return self._cached(f"aes_{key_id}", bytes.fromhex)
     
     def generate_des_key(self, key_id: str = "default") -> bytes:
         """DES anahtarı üret (8 byte)"""
         key = os.urandom(8)
-        self.keys[f"des_{key_id}"] = key.hex()
-        self._save_keys()
+        self.set_des_key(key_id, key)
         return key
     
     def get_des_key(self, key_id: str = "default") -> Optional[bytes]:
         """DES anahtarını al"""
-        key_hex = self.keys.get(f"des_{key_id}")
-        if key_hex:
-            return bytes.fromhex(key_hex)
-        return None
+        return self._cached(f"des_{key_id}", bytes.fromhex)
     
     def generate_rsa_keypair(self, key_id: str = "default", key_size: int = 2048) -> Tuple[str, str]:
         """RSA anahtar çifti üret"""
@@ -73,33 +156,79 @@ class KeyManager:
         private_key_pem = key.export_key().decode('utf-8')
         public_key_pem = key.publickey().export_key().decode('utf-8')
         
-        self.keys[f"rsa_{key_id}_public"] = public_key_pem
-        self.keys[f"rsa_{key_id}_private"] = private_key_pem
-        self._save_keys()
+        self.set_rsa_keypair(key_id, public_key_pem, private_key_pem)
         
         return public_key_pem, private_key_pem
     
     def get_rsa_public_key(self, key_id: str = "default") -> Optional[str]:
         """RSA public key'i al"""
-        return self.keys.get(f"rsa_{key_id}_public")
+        return self._cached(f"rsa_{key_id}_public", str)
     
     def get_rsa_private_key(self, key_id: str = "default") -> Optional[str]:
         """RSA private key'i al"""
-        return self.keys.get(f"rsa_{key_id}_private")
+        return self._cached(f"rsa_{key_id}_private", str)
+    
+    def get_rsa_key(self, key_id: str = "default", private: bool = False):
+        """
+        Ayrıştırılmış RSA anahtarı (rsa.RSAKeyHandle); PEM yalnızca ilk
+        kullanımda ayrıştırılır
+        """
+        if not CRYPTO_AVAILABLE:
+            raise ValueError("RSA için pycryptodome kütüphanesi gerekli")
+        name = f"rsa_{key_id}_private" if private else f"rsa_{key_id}_public"
+        return self._cached(name, rsa_lib.load_private_key if private else rsa_lib.load_public_key,
+                            cache_name=name + HANDLE_SUFFIX)
+    
+    def generate_x25519_key(self, key_id: str = "default") -> str:
+        """X25519 (ECDH) private key üret; PEM olarak saklanır"""
+        if not CRYPTO_AVAILABLE:
+            raise ValueError("X25519 için pycryptodome kütüphanesi gerekli")
+        
+        private_key_pem = ECC.generate(curve="Curve25519").export_key(format="PEM")
+        self._write({f"x25519_{key_id}_private": private_key_pem})
+        
+        return private_key_pem
+    
+    def get_x25519_private_key(self, key_id: str = "default") -> Optional[str]:
+        """X25519 private key'i al"""
+        return self._cached(f"x25519_{key_id}_private", str)
     
     def set_aes_key(self, key_id: str, key: bytes):
         """AES anahtarını ayarla"""
-        self.keys[f"aes_{key_id}"] = key.hex()
-        self._save_keys()
+        self._write({f"aes_{key_id}": key.hex()})
     
     def set_des_key(self, key_id: str, key: bytes):
         """DES anahtarını ayarla"""
-        self.keys[f"des_{key_id}"] = key.hex()
-        self._save_keys()
+        self._write({f"des_{key_id}": key.hex()})
     
     def set_rsa_keypair(self, key_id: str, public_key: str, private_key: str):
         """RSA anahtar çiftini ayarla"""
-        self.keys[f"rsa_{key_id}_public"] = public_key
-        self.keys[f"rsa_{key_id}_private"] = private_key
-        self._save_keys()
-
+        self._write({f"rsa_{key_id}_public": public_key,
+                     f"rsa_{key_id}_private": private_key})
+    
+    def generate_many(self, kind: str, ids: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Çok sayıda AES/DES anahtarını tek seferde üret; depoya tek bir yazma yapılır
+        
+        Args:
+            kind: "aes" veya "des"
+            ids: Anahtar kimlikleri
+        
+        Returns:
+            Anahtar kimliği -> anahtar
+        """
+        if kind not in KEY_SIZES:
+            raise ValueError(f"Toplu üretim yalnızca {', '.join(KEY_SIZES)} için desteklenir")
+        ids = list(ids)
+        size = KEY_SIZES[kind]
+        material = os.urandom(size * len(ids))
+        keys = {key_id: material[i * size:(i + 1) * size] for i, key_id in enumerate(ids)}
+        self._write({f"{kind}_{key_id}": key.hex() for key_id, key in keys.items()})
+        return keys
+    
+    def get_many(self, ids: Iterable[str], kind: str = "aes") -> Dict[str, Optional[bytes]]:
+        """Çok sayıda AES/DES anahtarını al; olmayanlar için None"""
+        if kind not in KEY_SIZES:
+            raise ValueError(f"Toplu okuma yalnızca {', '.join(KEY_SIZES)} için desteklenir")
+        self.sync()
+        return {key_id: self._cached(f"{kind}_{key_id}", bytes.fromhex, sync=False) for key_id in ids}
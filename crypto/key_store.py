@@ -0,0 +1,453 @@
+"""
+KeyManager için anahtar depolama arka uçları
+- JSONStore: Eski keys.json biçimi; her yazmada dosyanın tamamı yeniden yazılır
+  (küçük dosyalar ve içe/dışa aktarma için)
+- LogStore: Sadece eklemeli (append-only) JSON satır günlüğü; her yazma dosya
+  sonuna tek satır ekler, ölü kayıtlar periyodik sıkıştırmayla atılır
+- SQLiteStore: key_id birincil anahtarlı (indeksli) SQLite tablosu; açılışta
+  hiçbir anahtar okunmaz, her okuma tek indeks araması yapar
+
+Aynı dosyayı birden çok süreç paylaşabilir: yazıcılar "<dosya>.lock" üzerinde
+özel kilit (fcntl) alır, JSON geçici dosyaya yazılıp os.replace ile atomik
+olarak yerine konur. Okuyucular kilit almaz; refresh() dosyanın değişip
+değişmediğini (inode/mtime/boyut) kontrol eder ve yalnızca değişen anahtarları
+bildirir.
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import warnings
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Set, Tuple
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    # fcntl olmayan platformlarda yalnızca süreç içi kilit kullanılır
+    FCNTL_AVAILABLE = False
+
+# Günlükte bu kadar kayıt birikmeden sıkıştırma yapılmaz
+COMPACT_MIN_RECORDS = 1024
+# Kayıt sayısı canlı anahtar sayısının bu katını aşınca günlük sıkıştırılır
+COMPACT_RATIO = 2
+
+
+class KeyStore(ABC):
+    """Anahtar kimliği -> metin değer (hex veya PEM) deposu"""
+
+    @abstractmethod
+    def get(self, key_id: str) -> Optional[str]: ...
+    @abstractmethod
+    def set_many(self, items: Iterable[Tuple[str, str]]): ...
+    @abstractmethod
+    def delete(self, key_id: str): ...
+    @abstractmethod
+    def items(self) -> Iterator[Tuple[str, str]]: ...
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    def set(self, key_id: str, value: str):
+        self.set_many([(key_id, value)])
+
+    def refresh(self) -> Optional[Set[str]]:
+        """
+        Başka süreçlerin yazdıklarını al; değişen anahtar kimliklerini döndürür
+        (değişiklik yoksa boş küme, hangi anahtarların değiştiği bilinmiyorsa None)
+        """
+        return set()
+
+    def __contains__(self, key_id: str) -> bool:
+        return self.get(key_id) is not None
+
+    def close(self):
+        pass
+
+
+class FileLock:
+    """
+    Süreçler arası özel yazma kilidi ("<dosya>.lock" üzerinde flock); aynı
+    nesne içinde iç içe alınabilir
+    """
+
+    def __init__(self, path):
+        self.path = Path(str(path) + ".lock")
+        self._lock = threading.RLock()
+        self._fd = None
+        self._depth = 0
+
+    def __enter__(self):
+        self._lock.acquire()
+        if self._depth == 0 and FCNTL_AVAILABLE:
+            try:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except BaseException:
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+                self._lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._lock.release()
+
+
+def _signature(stat) -> tuple:
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class JSONStore(KeyStore):
+    """
+    Tüm anahtarlar tek bir JSON nesnesinde (ilk erişimde yüklenir). Her yazma
+    dosyayı geçici dosyaya yazıp atomik olarak yerine koyar; okuyucu her zaman
+    eski veya yeni dosyanın tamamını görür.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._data = None
+        self._signature = None
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(self.path)
+
+    def _read(self) -> Tuple[dict, Optional[tuple]]:
+        """Dosyayı oku: (veri, imza); dosya yoksa boş"""
+        try:
+            with open(self.path, 'r') as f:
+                signature = _signature(os.fstat(f.fileno()))
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}, None
+        except ValueError as e:
+            # Anahtarları sessizce kaybetmek yerine hata ver
+            raise ValueError(f"Anahtar dosyası bozuk: {self.path} ({e})") from None
+        if not isinstance(data, dict):
+            raise ValueError(f"Anahtar dosyası bozuk: {self.path}")
+        return data, signature
+
+    def _load(self) -> dict:
+        data = self._data
+        if data is None:
+            with self._lock:
+                if self._data is None:
+                    self._data, self._signature = self._read()
+                data = self._data
+        return data
+
+    def _changed(self) -> bool:
+        try:
+            signature = _signature(os.stat(self.path))
+        except FileNotFoundError:
+            signature = None
+        return signature != self._signature
+
+    def refresh(self) -> Optional[Set[str]]:
+        if self._data is None or not self._changed():
+            return set()
+        with self._lock:
+            old = self._data
+            new, self._signature = self._read()
+            self._data = new
+        return {key_id for key_id in old.keys() | new.keys() if old.get(key_id) != new.get(key_id)}
+
+    def _save(self, data: dict):
+        """Geçici dosyaya yaz, diske aktar ve atomik olarak yerine koy (yazma kilidi altında)"""
+        fd, tmp = tempfile.mkstemp(prefix=self.path.name + ".", suffix=".tmp", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        signature = _signature(os.stat(self.path))
+        with self._lock:
+            self._data, self._signature = data, signature
+
+    def _update(self, change):
+        with self._file_lock:
+            # Diğer süreçlerin son yazdıkları üzerine uygula
+            self._load()
+            self.refresh()
+            data = dict(self._data)
+            if change(data):
+                self._save(data)
+
+    def get(self, key_id: str) -> Optional[str]:
+        return self._load().get(key_id)
+
+    def set_many(self, items):
+        items = list(items)
+        self._update(lambda data: data.update(items) or bool(items))
+
+    def delete(self, key_id: str):
+        self._update(lambda data: data.pop(key_id, None) is not None)
+
+    def items(self):
+        return iter(list(self._load().items()))
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+
+class LogStore(KeyStore):
+    """
+    Sadece eklemeli günlük: her satır {"k": key_id, "v": değer} veya silme için
+    {"k": key_id, "d": 1}. Bellekte yalnızca anahtar -> (ofset, uzunluk) indeksi
+    tutulur; değerler okunurken dosyadan alınır. Başka süreçlerin eklediği
+    kayıtlar dosya sonundan okunarak indekse eklenir (yalnızca yeni satırlar).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._index = None
+        self._records = 0
+        self._size = 0
+        self._inode = None
+        self._reader = None
+        self._writer = None
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(self.path)
+
+    def _open(self):
+        """İlk erişimde günlüğü tara ve indeksi kur"""
+        if self._index is not None:
+            return
+        self.path.touch(exist_ok=True)
+        self._reader = open(self.path, 'rb')
+        self._writer = open(self.path, 'ab')
+        self._inode = os.fstat(self._reader.fileno()).st_ino
+        self._index = {}
+        self._records = 0
+        self._size = 0
+        self._catch_up()
+
+    def _apply(self, records: list, lines: list, offset: int):
+        for record, line in zip(records, lines):
+            if record is None:
+                pass
+            elif record.get("d"):
+                self._index.pop(record["k"], None)
+            else:
+                self._index[record["k"]] = (offset, len(line))
+            offset += len(line)
+        self._size = offset
+        self._records += len(records)
+
+    def _catch_up(self) -> Set[str]:
+        """
+        Bilinen sondan sonraki tam satırları indekse ekle; değişen anahtarları
+        döndür. Bozuk tam satırlar uyarıyla atlanır (sonraki kayıtlar kaybolmaz,
+        sıkıştırma onları atar); yalnızca sondaki yarım satır beklenir.
+        """
+        self._reader.seek(self._size)
+        offset = self._size
+        lines, records = [], []
+        for line in self._reader:
+            if not line.endswith(b"\n"):
+                # Yarım satır: yazılmakta veya yazıcı çökmüş; sonraki yazma kilit altında temizler
+                break
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict) or "k" not in record:
+                    raise ValueError
+            except ValueError:
+                warnings.warn(f"Anahtar günlüğünde bozuk satır atlandı: {self.path} (ofset {offset})")
+                record = None
+            records.append(record)
+            lines.append(line)
+            offset += len(line)
+        self._apply(records, lines, self._size)
+        return {record["k"] for record in records if record is not None}
+
+    def refresh(self) -> Optional[Set[str]]:
+        with self._lock:
+            if self._index is None:
+                return set()
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                stat = None
+            if stat is None or stat.st_ino != self._inode:
+                # Başka bir süreç sıkıştırdı (veya dosya silindi): indeks yeniden kurulur
+                self.close()
+                self._open()
+                return None
+            if stat.st_size > self._size:
+                return self._catch_up()
+            return set()
+
+    def _append(self, records: list):
+        """Yazma kilidi altında çağrılır"""
+        lines = [json.dumps(record, separators=(",", ":")).encode() + b"\n" for record in records]
+        self.refresh()
+        with self._lock:
+            offset = self._size
+            if os.fstat(self._writer.fileno()).st_size > offset:
+                # Çökmüş bir yazıcıdan kalan yarım satır (bozuk tam satırlar _size'a dahildir)
+                self._writer.truncate(offset)
+            writer = self._writer
+        # Okuyucular yazma sırasında beklemez; indeks yazmadan sonra güncellenir
+        writer.write(b"".join(lines))
+        writer.flush()
+        with self._lock:
+            if self._size == offset:
+                self._apply(records, lines, offset)
+            else:
+                self._catch_up()
+            compact = self._records >= COMPACT_MIN_RECORDS and self._records > COMPACT_RATIO * len(self._index)
+        if compact:
+            self.compact()
+
+    def get(self, key_id: str) -> Optional[str]:
+        with self._lock:
+            self._open()
+            location = self._index.get(key_id)
+            if location is None:
+                return None
+            self._reader.seek(location[0])
+            return json.loads(self._reader.read(location[1]))["v"]
+
+    def set_many(self, items):
+        records = [{"k": key_id, "v": value} for key_id, value in items]
+        if not records:
+            return
+        with self._file_lock:
+            with self._lock:
+                self._open()
+            self._append(records)
+
+    def delete(self, key_id: str):
+        with self._file_lock:
+            with self._lock:
+                self._open()
+            self.refresh()
+            if key_id in self._index:
+                self._append([{"k": key_id, "d": 1}])
+
+    def items(self):
+        with self._lock:
+            self._open()
+            keys = list(self._index)
+        for key_id in keys:
+            value = self.get(key_id)
+            if value is not None:
+                yield key_id, value
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._open()
+            return len(self._index)
+
+    def compact(self):
+        """Yalnızca canlı kayıtları yeni dosyaya yaz ve eskisinin yerine koy"""
+        with self._file_lock:
+            with self._lock:
+                self._open()
+            self.refresh()
+            fd, tmp = tempfile.mkstemp(prefix=self.path.name + ".", suffix=".tmp", dir=self.path.parent)
+            with os.fdopen(fd, 'wb') as f:
+                for key_id, value in self.items():
+                    f.write(json.dumps({"k": key_id, "v": value}, separators=(",", ":")).encode() + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+            with self._lock:
+                self.close()
+                os.replace(tmp, self.path)
+                self._open()
+
+    def close(self):
+        with self._lock:
+            for handle in (self._reader, self._writer):
+                if handle is not None:
+                    handle.close()
+            self._reader = self._writer = None
+            self._index = None
+
+
+class SQLiteStore(KeyStore):
+    """
+    key_id birincil anahtar (indeksli) olan tek tablolu SQLite deposu. Süreçler
+    arası kilitleme SQLite'a bırakılır; WAL kipinde okuyucular yazıcıyı beklemez.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        # WAL: okuyucular yazıcıyı beklemez; NORMAL senkronizasyon her commit'te fsync yapmaz
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS keys (key_id TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"
+            )
+        self._data_version = self._version()
+
+    def _version(self) -> int:
+        # Başka bir bağlantı commit ettiğinde değişir (kendi yazmalarımızda değişmez)
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def refresh(self) -> Optional[Set[str]]:
+        with self._lock:
+            version = self._version()
+            if version == self._data_version:
+                return set()
+            self._data_version = version
+        # Okumalar her zaman güncel; yalnızca çağıranın önbelleği geçersizdir
+        return None
+
+    def get(self, key_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM keys WHERE key_id = ?", (key_id,)).fetchone()
+        return row[0] if row else None
+
+    def set_many(self, items):
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO keys (key_id, value) VALUES (?, ?)", items)
+
+    def delete(self, key_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM keys WHERE key_id = ?", (key_id,))
+
+    def items(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT key_id, value FROM keys").fetchall()
+        return iter(rows)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM keys").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+BACKENDS = {"json": JSONStore, "log": LogStore, "sqlite": SQLiteStore}
+SUFFIXES = {".json": "json", ".log": "log", ".jsonl": "log", ".db": "sqlite", ".sqlite": "sqlite", ".sqlite3": "sqlite"}
+
+
+def open_store(path, backend: str = None) -> KeyStore:
+    """
+    Dosya için depo aç; backend verilmezse dosya uzantısından seçilir
+    (.json -> json, .log/.jsonl -> log, .db/.sqlite -> sqlite; diğerleri json)
+    """
+    backend = backend or SUFFIXES.get(Path(path).suffix.lower(), "json")
+    if backend not in BACKENDS:
+        raise ValueError(f"Bilinmeyen anahtar deposu: {backend} ({', '.join(BACKENDS)})")
+    return BACKENDS[backend](path)
@@ -0,0 +1,70 @@
+"""
+Büyük veriler için çok çekirdekli parça işleme yardımcıları
+Girdi blok sınırına hizalı parçalara bölünür, her parça bağımsız olarak bir
+iş parçacığı (thread) veya süreç (process) havuzunda işlenir ve sonuç önceden
+ayrılmış tek bir çıktı tamponuna yazılır.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+CHUNK_SIZE = 4 * 1024 * 1024
+EXECUTORS = ("thread", "process")
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def _spans(length: int, chunk_size: int, block_size: int) -> list:
+    """[başlangıç, bitiş) parça aralıkları; her parça blok boyutunun katıdır (sonuncusu hariç)"""
+    chunk = max(block_size, chunk_size - chunk_size % block_size)
+    return [(start, min(start + chunk, length)) for start in range(0, length, chunk)]
+
+
+def map_chunks(task, data, job_args, block_size: int, header: bytes = b"",
+               workers: int = None, chunk_size: int = CHUNK_SIZE, executor: str = "thread") -> bytearray:
+    """
+    Veriyi parçalara bölüp task ile paralel işle
+
+    Args:
+        task: task(*job_args(start), parça, output=None) şeklinde çağrılan
+            modül seviyesinde fonksiyon; output verilirse sonucu oraya yazar,
+            verilmezse bytes döndürür
+        data: Girdi (bytes, bytearray veya memoryview)
+        job_args: Parça başlangıç ofsetini alıp task'ın ilk argümanlarını döndürür
+        block_size: Parçaların hizalanacağı blok boyutu
+        header: Çıktının başına yazılacak veri (iv, nonce...)
+        workers: İşçi sayısı (varsayılan: çekirdek sayısı)
+        chunk_size: Parça boyutu (byte)
+        executor: "thread" (pycryptodome çağrıları GIL'i bırakır) veya "process"
+
+    Returns:
+        header + işlenmiş veri
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Geçersiz executor: {executor} ({', '.join(EXECUTORS)})")
+    data = memoryview(data).cast("B")
+    out = bytearray(len(header) + len(data))
+    out[:len(header)] = header
+    view = memoryview(out)[len(header):]
+    spans = _spans(len(data), chunk_size, block_size)
+    workers = min(workers or default_workers(), len(spans)) or 1
+
+    def run(span):
+        start, end = span
+        task(*job_args(start), data[start:end], output=view[start:end])
+
+    if workers == 1:
+        for span in spans:
+            run(span)
+    elif executor == "thread":
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run, spans))
+    else:
+        # Süreçler belleği paylaşmaz: parçalar kopyalanarak gönderilir, sonuçlar yerine yazılır
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [(start, end, pool.submit(task, *job_args(start), bytes(data[start:end])))
+                       for start, end in spans]
+            for start, end, future in futures:
+                view[start:end] = future.result()
+    return out
@@ -0,0 +1,96 @@
+"""
+Transpozisyon şifreleri için ortak permütasyon yardımcıları
+Bir permütasyon, çıktıdaki her konum için girdideki karakterin indeksidir;
+şifreleme tek bir gather, çözme tek bir scatter işlemidir.
+"""
+from functools import lru_cache, wraps
+from itertools import chain
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Bu uzunluktan büyük permütasyonlar önbelleğe alınmaz; her eleman 8 byte
+# (int64) olduğundan bir önbellek en fazla maxsize × 512 KB tutar
+CACHE_MAX_LENGTH = 1 << 16
+
+
+def cached(maxsize: int, length):
+    """
+    lru_cache gibi, ancak length(*args) CACHE_MAX_LENGTH'i aşan permütasyonlar
+    önbelleğe alınmadan hesaplanır (büyük metinler önbelleği şişirmez)
+    """
+    def decorator(func):
+        cached_func = lru_cache(maxsize=maxsize)(func)
+
+        @wraps(func)
+        def wrapper(*args):
+            if length(*args) > CACHE_MAX_LENGTH:
+                return func(*args)
+            return cached_func(*args)
+
+        wrapper.cache_info = cached_func.cache_info
+        wrapper.cache_clear = cached_func.cache_clear
+        return wrapper
+    return decorator
+
+
+def _encoding(s: str):
+    """Metni sabit genişlikli diziye çevirmek için kodlama ve dtype"""
+    return ('ascii', 'u1') if s.isascii() else ('utf-32-le', '<u4')
+
+
+def from_runs(runs):
+    """range nesnelerinden (indeks dizileri) permütasyon oluştur"""
+    runs = list(runs)
+    if NUMPY_AVAILABLE:
+        if not runs:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(r.start, r.stop, r.step, dtype=np.int64) for r in runs])
+    return list(chain.from_iterable(runs))
+
+
+def gather(s: str, perm) -> str:
+    """out[k] = s[perm[k]]"""
+    if NUMPY_AVAILABLE:
+        enc, dtype = _encoding(s)
+        return np.frombuffer(s.encode(enc), dtype=dtype)[perm].tobytes().decode(enc)
+    return ''.join([s[i] for i in perm])
+
+
+def scatter(s: str, perm, size: int = None) -> str:
+    """
+    out[perm[k]] = s[k]
+
+    size verilirse çıktı size hücrelidir ve perm yalnızca ilk len(s) hücreyi
+    doldurur; boş kalan hücreler çıktıdan atılır.
+    """
+    if size is None:
+        size = len(s)
+    perm = perm[:len(s)]
+    if NUMPY_AVAILABLE:
+        enc, dtype = _encoding(s)
+        out = np.zeros(size, dtype=dtype)
+        out[perm] = np.frombuffer(s.encode(enc), dtype=dtype)
+        if len(s) < size:
+            filled = np.zeros(size, dtype=bool)
+            filled[perm] = True
+            out = out[filled]
+        return out.tobytes().decode(enc)
+    out = [''] * size
+    for ch, i in zip(s, perm):
+        out[i] = ch
+    return ''.join(out)
+
+
+def compose(*perms):
+    """Art arda uygulanan permütasyonları tek permütasyona indir"""
+    result = perms[0]
+    for perm in perms[1:]:
+        if NUMPY_AVAILABLE:
+            result = result[perm]
+        else:
+            result = [result[i] for i in perm]
+    return result
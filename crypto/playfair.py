@@ -1,5 +1,67 @@
+from functools import lru_cache
 from .base import Cipher
 
+KEY_CACHE_SIZE = 128
+
+class PlayfairKey:
+    """
+    Derlenmiş Playfair anahtarı: 25 harflik konum indeksi ve her iki yön için
+    önceden hesaplanmış 625 girdili çift -> çift tabloları
+    """
+
+    __slots__ = ("matrix", "positions", "encrypt_table", "decrypt_table")
+
+    def __init__(self, matrix: list):
+        self.matrix = tuple(tuple(row) for row in matrix)
+        self.positions = {ch: (r, c) for r, row in enumerate(matrix) for c, ch in enumerate(row)}
+        self.encrypt_table = {}
+        self.decrypt_table = {}
+        for a, (r1, c1) in self.positions.items():
+            for b, (r2, c2) in self.positions.items():
+                self.encrypt_table[a + b] = self._transform(r1, c1, r2, c2, 1)
+                self.decrypt_table[a + b] = self._transform(r1, c1, r2, c2, -1)
+
+    def _transform(self, r1: int, c1: int, r2: int, c2: int, step: int) -> str:
+        """Bir çifti dönüştür (step=1 şifreleme, step=-1 çözme)"""
+        m = self.matrix
+        # Aynı satırda
+        if r1 == r2:
+            return m[r1][(c1 + step) % 5] + m[r2][(c2 + step) % 5]
+        # Aynı sütunda
+        elif c1 == c2:
+            return m[(r1 + step) % 5][c1] + m[(r2 + step) % 5][c2]
+        # Dikdörtgen kuralı
+        else:
+            return m[r1][c2] + m[r2][c1]
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _compile_key(key_clean: str) -> PlayfairKey:
+    """Temizlenmiş anahtardan matrisi ve tabloları bir kez üret"""
+    # I ve J aynı hücrede (I kullanılır)
+    alphabet = "ABCDEFGHIKLMNOPQRSTUVWXYZ"  # J yok
+    
+    # Anahtarı matrise ekle
+    matrix = []
+    used = set()
+    
+    # Anahtar harflerini ekle
+    for ch in key_clean:
+        if ch == 'J':
+            ch = 'I'  # J'yi I'ya çevir
+        if ch not in used:
+            matrix.append(ch)
+            used.add(ch)
+    
+    # Kalan harfleri ekle
+    for ch in alphabet:
+        if ch not in used:
+            matrix.append(ch)
+    
+    # 5x5 matris olarak derle
+    return PlayfairKey([matrix[i:i+5] for i in range(0, 25, 5)])
+
+
 class Playfair(Cipher):
     name = "playfair"
 
@@ -16,39 +78,7 @@ class Playfair(Cipher):
 
     def _create_matrix(self, key: str) -> list:
         """5x5 Playfair matrisi oluştur"""
-        # I ve J aynı hücrede (I kullanılır)
-        alphabet = "ABCDEFGHIKLMNOPQRSTUVWXYZ"  # J yok
-        key_clean = self._prepare_key(key)
-        
-        # Anahtarı matrise ekle
-        matrix = []
-        used = set()
-        
-        # Anahtar harflerini ekle
-        for ch in key_clean:
-            if ch == 'J':
-                ch = 'I'  # J'yi I'ya çevir
-            if ch not in used:
-                matrix.append(ch)
-                used.add(ch)
-        
-        # Kalan harfleri ekle
-        for ch in alphabet:
-            if ch not in used:
-                matrix.append(ch)
-        
-        # 5x5 matris olarak döndür
-        return [matrix[i:i+5] for i in range(0, 25, 5)]
-
-    def _find_position(self, matrix: list, char: str) -> tuple:
-        """Bir harfin matristeki pozisyonunu bul"""
-        if char == 'J':
-            char = 'I'
-        for i in range(5):
-            for j in range(5):
-                if matrix[i][j] == char:
-                    return (i, j)
-        return None
+        return [list(row) for row in _compile_key(self._prepare_key(key)).matrix]
 
     def _prepare_text(self, text: str, encrypt: bool = True) -> str:
         """Metni çiftlere ayırmak için hazırla"""
@@ -83,62 +113,17 @@ class Playfair(Cipher):
         
         return pairs
 
-    def _encrypt_pair(self, matrix: list, pair: str) -> str:
-        """Bir çifti şifrele"""
-        pos1 = self._find_position(matrix, pair[0])
-        pos2 = self._find_position(matrix, pair[1])
-        
-        if not pos1 or not pos2:
-            return pair
-        
-        r1, c1 = pos1
-        r2, c2 = pos2
-        
-        # Aynı satırda
-        if r1 == r2:
-            return matrix[r1][(c1 + 1) % 5] + matrix[r2][(c2 + 1) % 5]
-        # Aynı sütunda
-        elif c1 == c2:
-            return matrix[(r1 + 1) % 5][c1] + matrix[(r2 + 1) % 5][c2]
-        # Dikdörtgen kuralı
-        else:
-            return matrix[r1][c2] + matrix[r2][c1]
-
-    def _decrypt_pair(self, matrix: list, pair: str) -> str:
-        """Bir çifti çöz"""
-        pos1 = self._find_position(matrix, pair[0])
-        pos2 = self._find_position(matrix, pair[1])
-        
-        if not pos1 or not pos2:
-            return pair
-        
-        r1, c1 = pos1
-        r2, c2 = pos2
-        
-        # Aynı satırda
-        if r1 == r2:
-            return matrix[r1][(c1 - 1) % 5] + matrix[r2][(c2 - 1) % 5]
-        # Aynı sütunda
-        elif c1 == c2:
-            return matrix[(r1 - 1) % 5][c1] + matrix[(r2 - 1) % 5][c2]
-        # Dikdörtgen kuralı
-        else:
-            return matrix[r1][c2] + matrix[r2][c1]
-
     def encrypt(self, text: str, **kw) -> str:
         """Metni Playfair ile şifrele"""
         key = kw.get("key", "PLAYFAIR")
         if not key or not any(c.isalpha() for c in key):
             raise ValueError("Playfair için alfabetik bir anahtar gerekli.")
         
-        matrix = self._create_matrix(key)
+        table = _compile_key(self._prepare_key(key)).encrypt_table
         pairs = self._prepare_text(text, encrypt=True)
         
-        result = []
-        for pair in pairs:
-            result.append(self._encrypt_pair(matrix, pair))
-        
-        return "".join(result)
+        # Tabloda olmayan çiftler (matris dışı harfler) olduğu gibi kalır
+        return "".join(map(table.get, pairs, pairs))
 
     def decrypt(self, text: str, **kw) -> str:
         """Playfair ile şifrelenmiş metni çöz"""
@@ -146,14 +131,10 @@ class Playfair(Cipher):
         if not key or not any(c.isalpha() for c in key):
             raise ValueError("Playfair için alfabetik bir anahtar gerekli.")
         
-        matrix = self._create_matrix(key)
+        table = _compile_key(self._prepare_key(key)).decrypt_table
         pairs = self._prepare_text(text, encrypt=False)
         
-        result = []
-        for pair in pairs:
-            result.append(self._decrypt_pair(matrix, pair))
-        
-        decrypted = "".join(result)
+        decrypted = "".join(map(table.get, pairs, pairs))
         # Son harf X ise ve gereksizse kaldır (basit kontrol)
         if len(decrypted) > 1 and decrypted[-1] == 'X':
             # Eğer son ikinci harf ile son harf aynı değilse, X muhtemelen padding
@@ -4,34 +4,68 @@ Harfleri 5x5 ızgarada koordinatlarla temsil eden şifreleme yöntemi
 """
 from .base import Cipher
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Klasik Polybius karesi (5x5 - I ve J birleşik)
+# Satırlar ve sütunlar 1-5 ile numaralandırılır
+SQUARE = [
+    ['A', 'B', 'C', 'D', 'E'],
+    ['F', 'G', 'H', 'I', 'J'],  # I ve J aynı hücrede
+    ['K', 'L', 'M', 'N', 'O'],
+    ['P', 'Q', 'R', 'S', 'T'],
+    ['U', 'V', 'W', 'X', 'Y'],
+    ['Z', ' ', ' ', ' ', ' ']   # Z için ekstra satır
+]
+
+# Bifid için tam 5x5 kare: her (satır, sütun) çifti bir harfe karşılık gelir
+BIFID_SQUARE = "ABCDEFGHIKLMNOPQRSTUVWXYZ"  # J yok (I kullanılır)
+
+def _build_tables():
+    """Harf <-> koordinat haritalarını ve toplu kodlama tablolarını üret"""
+    # Daha iyi organizasyon için harften koordinata harita
+    letter_to_coord = {}
+    for i, row in enumerate(SQUARE):
+        for j, letter in enumerate(row):
+            if letter and letter != ' ':
+                # Satır ve sütun 1'den başlar
+                letter_to_coord[letter] = (str(i + 1), str(j + 1))
+    
+    # J harfi I ile aynı
+    letter_to_coord['J'] = letter_to_coord['I']
+    
+    # Koordinattan harfe harita
+    coord_to_letter = {v: k for k, v in letter_to_coord.items()}
+    
+    # Harflerle gösterim (A=1, B=2, ...)
+    def as_letters(coord):
+        return chr(ord('A') + int(coord[0]) - 1) + chr(ord('A') + int(coord[1]) - 1)
+    
+    encode_numbers = {k: r + c for k, (r, c) in letter_to_coord.items()}
+    encode_letters = {k: as_letters(v) for k, v in letter_to_coord.items()}
+    decode_numbers = {r + c: k for (r, c), k in coord_to_letter.items()}
+    decode_letters = {as_letters(v): k for v, k in coord_to_letter.items()}
+    return letter_to_coord, coord_to_letter, encode_numbers, encode_letters, decode_numbers, decode_letters
+
+def _bifid_tables():
+    """Bifid için harf <-> kare indeksi (0-24) bytes.translate tabloları"""
+    lookup = bytearray([255]) * 256  # 255: karede olmayan karakter
+    for idx, ch in enumerate(BIFID_SQUARE):
+        lookup[ord(ch)] = idx
+    lookup[ord('J')] = BIFID_SQUARE.index('I')
+    alphabet = BIFID_SQUARE.encode("ascii") + bytes(256 - len(BIFID_SQUARE))
+    return bytes(lookup), alphabet
+
 class PolybiusCipher(Cipher):
     name = "polybius"
     
-    def __init__(self):
-        # Klasik Polybius karesi (5x5 - I ve J birleşik)
-        # Satırlar ve sütunlar 1-5 ile numaralandırılır
-        self.square = [
-            ['A', 'B', 'C', 'D', 'E'],
-            ['F', 'G', 'H', 'I', 'J'],  # I ve J aynı hücrede
-            ['K', 'L', 'M', 'N', 'O'],
-            ['P', 'Q', 'R', 'S', 'T'],
-            ['U', 'V', 'W', 'X', 'Y'],
-            ['Z', ' ', ' ', ' ', ' ']   # Z için ekstra satır
-        ]
-        
-        # Daha iyi organizasyon için harften koordinata harita
-        self.letter_to_coord = {}
-        for i, row in enumerate(self.square):
-            for j, letter in enumerate(row):
-                if letter and letter != ' ':
-                    # Satır ve sütun 1'den başlar
-                    self.letter_to_coord[letter] = (str(i + 1), str(j + 1))
-        
-        # J harfi I ile aynı
-        self.letter_to_coord['J'] = self.letter_to_coord['I']
-        
-        # Koordinattan harfe harita
-        self.coord_to_letter = {v: k for k, v in self.letter_to_coord.items()}
+    square = SQUARE
+    (letter_to_coord, coord_to_letter,
+     encode_numbers, encode_letters, decode_numbers, decode_letters) = _build_tables()
+    bifid_lookup, bifid_alphabet = _bifid_tables()
     
     def encrypt(self, text: str, use_numbers: bool = True, **kwargs) -> str:
         """
@@ -45,23 +79,10 @@ class PolybiusCipher(Cipher):
             Şifrelenmiş metin
         """
         text = text.upper().replace(" ", "")
-        result = ""
-        
-        for char in text:
-            if char in self.letter_to_coord:
-                row, col = self.letter_to_coord[char]
-                if use_numbers:
-                    result += row + col + " "
-                else:
-                    # Harflerle gösterim (A=1, B=2, ...)
-                    row_letter = chr(ord('A') + int(row) - 1)
-                    col_letter = chr(ord('A') + int(col) - 1)
-                    result += row_letter + col_letter + " "
-            else:
-                # Bilinmeyen karakteri olduğu gibi ekle
-                result += char + " "
+        table = self.encode_numbers if use_numbers else self.encode_letters
         
-        return result.strip()
+        # Bilinmeyen karakterler olduğu gibi eklenir
+        return " ".join(map(table.get, text, text)).strip()
     
     def decrypt(self, text: str, use_numbers: bool = True, **kwargs) -> str:
         """
@@ -74,37 +95,10 @@ class PolybiusCipher(Cipher):
         Returns:
             Çözülmüş metin
         """
-        result = ""
-        
-        if use_numbers:
-            # Sayısal koordinatları çöz
-            # Metin "11 23 34" formatında
-            pairs = text.split()
-            for pair in pairs:
-                if len(pair) == 2 and pair.isdigit():
-                    row, col = pair[0], pair[1]
-                    if (row, col) in self.coord_to_letter:
-                        result += self.coord_to_letter[(row, col)]
-                    else:
-                        result += pair
-                else:
-                    result += pair
-        else:
-            # Harfli koordinatları çöz
-            # Metin "AA BC CD" formatında
-            pairs = text.split()
-            for pair in pairs:
-                if len(pair) == 2 and pair.isalpha():
-                    row = str(ord(pair[0]) - ord('A') + 1)
-                    col = str(ord(pair[1]) - ord('A') + 1)
-                    if (row, col) in self.coord_to_letter:
-                        result += self.coord_to_letter[(row, col)]
-                    else:
-                        result += pair
-                else:
-                    result += pair
-        
-        return result
+        # Metin "11 23 34" veya "AA BC CD" formatında
+        table = self.decode_numbers if use_numbers else self.decode_letters
+        pairs = text.split()
+        return "".join(map(table.get, pairs, pairs))
     
     def get_square(self) -> str:
         """
@@ -138,72 +132,81 @@ class PolybiusCipher(Cipher):
         
         return output
     
+    def _bifid_indices(self, text: str) -> bytes:
+        """Metni Bifid karesindeki indekslere (0-24) çevir, diğer karakterleri at"""
+        data = text.upper().encode("ascii", "ignore").translate(self.bifid_lookup)
+        return data.replace(b"\xff", b"")
+    
+    def _bifid_numpy(self, idx: bytes, period: int, encrypt: bool) -> bytes:
+        """Tüm tam periyotları tek matris işlemiyle, kısa son bloğu ayrıca işle"""
+        arr = np.frombuffer(idx, dtype=np.uint8)
+        full = len(arr) - len(arr) % period
+        parts = []
+        for block in (arr[:full].reshape(-1, period), arr[full:].reshape(1, -1)):
+            if block.size == 0:
+                continue
+            rows, cols = block // 5, block % 5
+            if encrypt:
+                # Satırlar sonra sütunlar yazılır, çiftler halinde okunur
+                seq = np.concatenate([rows, cols], axis=1).reshape(len(block), -1, 2)
+                parts.append(seq[..., 0] * 5 + seq[..., 1])
+            else:
+                # Çiftler halinde yazılan koordinatlar ortadan bölünür
+                seq = np.stack([rows, cols], axis=2).reshape(len(block), -1)
+                width = block.shape[1]
+                parts.append(seq[:, :width] * 5 + seq[:, width:])
+        return b"".join(part.astype(np.uint8).tobytes() for part in parts)
+    
+    def _bifid_python(self, idx: bytes, period: int, encrypt: bool) -> bytes:
+        out = bytearray()
+        for start in range(0, len(idx), period):
+            chunk = idx[start:start + period]
+            width = len(chunk)
+            if encrypt:
+                seq = [x // 5 for x in chunk] + [x % 5 for x in chunk]
+                out.extend(seq[2 * k] * 5 + seq[2 * k + 1] for k in range(width))
+            else:
+                seq = [c for x in chunk for c in divmod(x, 5)]
+                out.extend(seq[k] * 5 + seq[width + k] for k in range(width))
+        return bytes(out)
+    
+    def _bifid(self, text: str, period, encrypt: bool) -> str:
+        idx = self._bifid_indices(text)
+        if not idx:
+            return ""
+        period = int(period)
+        if period <= 0 or period > len(idx):
+            period = len(idx)
+        if NUMPY_AVAILABLE:
+            out = self._bifid_numpy(idx, period, encrypt)
+        else:
+            out = self._bifid_python(idx, period, encrypt)
+        return out.translate(self.bifid_alphabet).decode("ascii")
+    
     def encrypt_with_bifid(self, text: str, period: int = 5, **kwargs) -> str:
         """
-        Bifid Cipher varyasyonu - daha güçlü şifreleme
-        Koordinatları periyotlara böler ve satır-sütun karışımı yapar
+        Bifid Cipher - daha güçlü şifreleme
+        Metin periyotlara bölünür; her periyotta harflerin satırları ve
+        sütunları art arda yazılıp çiftler halinde yeniden harfe çevrilir
         
         Args:
             text: Şifrelenecek metin
-            period: Periyot uzunluğu
+            period: Periyot uzunluğu (0 veya negatif: tüm metin tek periyot)
         
         Returns:
             Şifrelenmiş metin
         """
-        text = text.upper().replace(" ", "")
-        
-        # Koordinatları al
-        rows = []
-        cols = []
-        for char in text:
-            if char in self.letter_to_coord:
-                row, col = self.letter_to_coord[char]
-                rows.append(row)
-                cols.append(col)
-        
-        # Satır ve sütunları birleştir
-        combined = rows + cols
-        
-        # Periyotlara göre şifrele
-        result = ""
-        for i in range(0, len(combined), 2):
-            if i + 1 < len(combined):
-                row, col = combined[i], combined[i + 1]
-                if (row, col) in self.coord_to_letter:
-                    result += self.coord_to_letter[(row, col)]
-        
-        return result
+        return self._bifid(text, period, encrypt=True)
     
     def decrypt_with_bifid(self, text: str, period: int = 5, **kwargs) -> str:
         """
-        Bifid Cipher varyasyonu ile şifre çözme
+        Bifid Cipher ile şifre çözme
         
         Args:
             text: Şifreli metin
-            period: Periyot uzunluğu
+            period: Şifrelemede kullanılan periyot uzunluğu
         
         Returns:
             Çözülmüş metin
         """
-        # Koordinatları al
-        combined = []
-        for char in text:
-            if char in self.letter_to_coord:
-                row, col = self.letter_to_coord[char]
-                combined.extend([row, col])
-        
-        # Ortadan böl
-        mid = len(combined) // 2
-        rows = combined[:mid]
-        cols = combined[mid:]
-        
-        # Orijinal metni geri oluştur
-        result = ""
-        for i in range(len(rows)):
-            if i < len(cols):
-                coord = (rows[i], cols[i])
-                if coord in self.coord_to_letter:
-                    result += self.coord_to_letter[coord]
-        
-        return result
-
+        return self._bifid(text, period, encrypt=False)
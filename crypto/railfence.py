@@ -1,43 +1,54 @@
 # crypto/railfence.py
+from . import permutation
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Büyük metinlerin permütasyonları önbelleğe alınmaz (permutation.CACHE_MAX_LENGTH)
+PERMUTATION_CACHE_SIZE = 16
+
+@permutation.cached(PERMUTATION_CACHE_SIZE, lambda length, rails: length)
+def _zigzag_permutation(length: int, rails: int):
+    # perm[k] = index of the k-th character when rails are read top to bottom
+    cycle = 2 * (rails - 1)
+    if NUMPY_AVAILABLE:
+        pos = np.arange(length, dtype=np.int64) % cycle
+        rows = np.minimum(pos, cycle - pos)
+        # 16 bitlik anahtarlarda NumPy doğrusal zamanlı radix sort kullanır
+        rows = rows.astype(np.uint16 if rails <= 1 << 16 else np.int64)
+        # stable sort keeps left-to-right order inside each rail
+        return np.argsort(rows, kind='stable')
+    perm = []
+    for r in range(rails):
+        idx = list(range(r, length, cycle))
+        if 0 < r < rails - 1:
+            # middle rails are hit twice per cycle; merge the two runs
+            idx = sorted(idx + list(range(cycle - r, length, cycle)))
+        perm.extend(idx)
+    return perm
+
+_NON_ALPHA_ASCII = bytes(b for b in range(128) if not chr(b).isalpha())
+
+def _letters(text: str) -> str:
+    if text.isascii():
+        return text.encode('ascii').translate(None, _NON_ALPHA_ASCII).decode('ascii')
+    return ''.join(filter(str.isalpha, text))
 
 def encrypt(plaintext: str, rails: int) -> str:
-    s = ''.join(ch for ch in plaintext if ch.isalpha())
+    s = _letters(plaintext)
     if rails <= 1:
         return s.upper()
-    rail = [''] * rails
-    row = 0
-    step = 1
-    for ch in s:
-        rail[row] += ch.upper()
-        row += step
-        if row == 0 or row == rails-1:
-            step *= -1
-    return ''.join(rail)
+    upper = s.upper()
+    if len(upper) != len(s):
+        # 'ß' -> 'SS' gibi genişleyen harfler kendi rayında birlikte kalır
+        return ''.join([s[i].upper() for i in _zigzag_permutation(len(s), rails)])
+    return permutation.gather(upper, _zigzag_permutation(len(s), rails))
 
 def decrypt(ciphertext: str, rails: int) -> str:
-    s = ''.join(ch for ch in ciphertext if ch.isalpha()).upper()
+    s = _letters(ciphertext).upper()
     if rails <= 1:
         return s
-    # create pattern marks
-    pattern = [None] * len(s)
-    row = 0
-    step = 1
-    for i in range(len(s)):
-        pattern[i] = row
-        row += step
-        if row == 0 or row == rails-1:
-            step *= -1
-    # count lengths per row
-    rows = [''] * rails
-    counts = [pattern.count(r) for r in range(rails)]
-    idx = 0
-    for r in range(rails):
-        rows[r] = s[idx:idx+counts[r]]
-        idx += counts[r]
-    # reconstruct
-    res = []
-    pos = [0]*rails
-    for p in pattern:
-        res.append(rows[p][pos[p]])
-        pos[p] += 1
-    return ''.join(res)
+    return permutation.scatter(s, _zigzag_permutation(len(s), rails))
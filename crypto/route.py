@@ -3,12 +3,105 @@ Route Cipher (Rota Şifresi) - Klasik Transpozisyon Şifrelemesi
 Metni bir matrise yerleştirir ve belirli bir rotada okuyarak şifreler
 """
 from .base import Cipher
+from . import permutation
+
+ROUTE_CACHE_SIZE = 64
+
+# Her rota, satır satır numaralanmış hücre indekslerini (i * cols + j)
+# okuma sırasında range parçaları olarak üreten bir fonksiyondur.
+
+def _spiral_clockwise(rows, cols):
+    """Saat yönünde spiral"""
+    top, bottom, left, right = 0, rows - 1, 0, cols - 1
+    while top <= bottom and left <= right:
+        # Sağa git
+        yield range(top * cols + left, top * cols + right + 1)
+        top += 1
+        # Aşağı git
+        yield range(top * cols + right, (bottom + 1) * cols + right, cols)
+        right -= 1
+        # Sola git
+        if top <= bottom:
+            yield range(bottom * cols + right, bottom * cols + left - 1, -1)
+            bottom -= 1
+        # Yukarı git
+        if left <= right:
+            yield range(bottom * cols + left, (top - 1) * cols + left, -cols)
+            left += 1
+
+def _spiral_counterclockwise(rows, cols):
+    """Saat yönünün tersine spiral"""
+    top, bottom, left, right = 0, rows - 1, 0, cols - 1
+    while top <= bottom and left <= right:
+        # Aşağı git
+        yield range(top * cols + left, (bottom + 1) * cols + left, cols)
+        left += 1
+        # Sağa git
+        if left <= right:
+            yield range(bottom * cols + left, bottom * cols + right + 1)
+            bottom -= 1
+        # Yukarı git
+        if top <= bottom and left <= right:
+            yield range(bottom * cols + right, (top - 1) * cols + right, -cols)
+            right -= 1
+        # Sola git
+        if top <= bottom and left <= right:
+            yield range(top * cols + right, top * cols + left - 1, -1)
+            top += 1
+
+def _zigzag(rows, cols):
+    """Zigzag (yılan): çift satırlar soldan sağa, tek satırlar sağdan sola"""
+    for i in range(rows):
+        if i % 2 == 0:
+            yield range(i * cols, (i + 1) * cols)
+        else:
+            yield range((i + 1) * cols - 1, i * cols - 1, -1)
+
+def _diagonal(rows, cols):
+    """Çapraz: sol üstten sağ alta doğru ters çaprazlar"""
+    step = max(cols - 1, 1)
+    for k in range(rows + cols - 1):
+        if k < cols:
+            i, j = 0, k
+        else:
+            i, j = k - cols + 1, cols - 1
+        count = min(rows - i, j + 1)
+        start = i * cols + j
+        yield range(start, start + count * step, step)
+
+def _column_by_column(rows, cols):
+    """Sütun sütun"""
+    for j in range(cols):
+        yield range(j, rows * cols, cols)
+
+ROUTES = {
+    "spiral_clockwise": _spiral_clockwise,
+    "spiral_counterclockwise": _spiral_counterclockwise,
+    "zigzag": _zigzag,
+    "diagonal": _diagonal,
+    "column": _column_by_column,
+}
+
+@permutation.cached(ROUTE_CACHE_SIZE, lambda route, rows, cols: rows * cols)
+def _route_permutation(route: str, rows: int, cols: int):
+    """Rotayı (rows, cols) ızgarası için düz bir indeks permütasyonuna derle"""
+    return permutation.from_runs(ROUTES[route](rows, cols))
 
 class RouteCipher(Cipher):
     name = "route"
     
     def __init__(self):
         pass
+
+    def _grid(self, length: int, rows, route: str):
+        rows = int(rows)
+        if rows < 1:
+            raise ValueError("Satır sayısı en az 1 olmalı.")
+        # Bilinmeyen rota: sütun sütun oku
+        if route not in ROUTES:
+            route = "column"
+        cols = (length + rows - 1) // rows
+        return rows, cols, _route_permutation(route, rows, cols)
     
     def encrypt(self, text: str, rows: int = 3, route: str = "spiral_clockwise", **kwargs) -> str:
         """
@@ -24,35 +117,13 @@ class RouteCipher(Cipher):
         """
         # Boşlukları kaldır
         text = text.replace(" ", "")
+        rows, cols, perm = self._grid(len(text), rows, route)
         
-        # Sütun sayısını hesapla
-        cols = (len(text) + rows - 1) // rows
-        
-        # Matrisi oluştur ve doldur
-        matrix = [['' for _ in range(cols)] for _ in range(rows)]
+        # Metni satır satır yerleştir, kalan hücreleri dolgu karakteriyle doldur
+        text += 'X' * (rows * cols - len(text))
         
-        # Metni matrise yerleştir (satır satır)
-        idx = 0
-        for i in range(rows):
-            for j in range(cols):
-                if idx < len(text):
-                    matrix[i][j] = text[idx]
-                    idx += 1
-                else:
-                    matrix[i][j] = 'X'  # Dolgu karakteri
-        
-        # Seçilen rotaya göre şifrele
-        if route == "spiral_clockwise":
-            return self._read_spiral_clockwise(matrix, rows, cols)
-        elif route == "spiral_counterclockwise":
-            return self._read_spiral_counterclockwise(matrix, rows, cols)
-        elif route == "zigzag":
-            return self._read_zigzag(matrix, rows, cols)
-        elif route == "diagonal":
-            return self._read_diagonal(matrix, rows, cols)
-        else:
-            # Varsayılan: sütun sütun oku
-            return self._read_column_by_column(matrix, rows, cols)
+        # Seçilen rotaya göre oku
+        return permutation.gather(text, perm)
     
     def decrypt(self, text: str, rows: int = 3, route: str = "spiral_clockwise", **kwargs) -> str:
         """
@@ -66,251 +137,9 @@ class RouteCipher(Cipher):
         Returns:
             Çözülmüş metin
         """
-        cols = (len(text) + rows - 1) // rows
-        
-        # Matrisi oluştur
-        matrix = [['' for _ in range(cols)] for _ in range(rows)]
-        
-        # Şifreli metni rotaya göre matrise yerleştir
-        if route == "spiral_clockwise":
-            matrix = self._write_spiral_clockwise(text, rows, cols)
-        elif route == "spiral_counterclockwise":
-            matrix = self._write_spiral_counterclockwise(text, rows, cols)
-        elif route == "zigzag":
-            matrix = self._write_zigzag(text, rows, cols)
-        elif route == "diagonal":
-            matrix = self._write_diagonal(text, rows, cols)
-        else:
-            matrix = self._write_column_by_column(text, rows, cols)
+        rows, cols, perm = self._grid(len(text), rows, route)
         
-        # Satır satır oku
-        result = ""
-        for i in range(rows):
-            for j in range(cols):
-                if matrix[i][j]:
-                    result += matrix[i][j]
+        # Şifreli metni rotaya göre yerleştir ve satır satır oku
+        result = permutation.scatter(text, perm, rows * cols)
         
         return result.rstrip('X')  # Dolgu karakterlerini kaldır
-    
-    def _read_spiral_clockwise(self, matrix, rows, cols):
-        """Saat yönünde spiral okuma"""
-        result = ""
-        top, bottom, left, right = 0, rows - 1, 0, cols - 1
-        
-        while top <= bottom and left <= right:
-            # Sağa git
-            for i in range(left, right + 1):
-                result += matrix[top][i]
-            top += 1
-            
-            # Aşağı git
-            for i in range(top, bottom + 1):
-                result += matrix[i][right]
-            right -= 1
-            
-            # Sola git
-            if top <= bottom:
-                for i in range(right, left - 1, -1):
-                    result += matrix[bottom][i]
-                bottom -= 1
-            
-            # Yukarı git
-            if left <= right:
-                for i in range(bottom, top - 1, -1):
-                    result += matrix[i][left]
-                left += 1
-        
-        return result
-    
-    def _write_spiral_clockwise(self, text, rows, cols):
-        """Saat yönünde spiral yazma"""
-        matrix = [['' for _ in range(cols)] for _ in range(rows)]
-        top, bottom, left, right = 0, rows - 1, 0, cols - 1
-        idx = 0
-        
-        while top <= bottom and left <= right and idx < len(text):
-            for i in range(left, right + 1):
-                if idx < len(text):
-                    matrix[top][i] = text[idx]
-                    idx += 1
-            top += 1
-            
-            for i in range(top, bottom + 1):
-                if idx < len(text):
-                    matrix[i][right] = text[idx]
-                    idx += 1
-            right -= 1
-            
-            if top <= bottom:
-                for i in range(right, left - 1, -1):
-                    if idx < len(text):
-                        matrix[bottom][i] = text[idx]
-                        idx += 1
-                bottom -= 1
-            
-            if left <= right:
-                for i in range(bottom, top - 1, -1):
-                    if idx < len(text):
-                        matrix[i][left] = text[idx]
-                        idx += 1
-                left += 1
-        
-        return matrix
-    
-    def _read_spiral_counterclockwise(self, matrix, rows, cols):
-        """Saat yönünün tersine spiral okuma"""
-        result = ""
-        top, bottom, left, right = 0, rows - 1, 0, cols - 1
-        
-        while top <= bottom and left <= right:
-            # Aşağı git
-            for i in range(top, bottom + 1):
-                result += matrix[i][left]
-            left += 1
-            
-            # Sağa git
-            if left <= right:
-                for i in range(left, right + 1):
-                    result += matrix[bottom][i]
-                bottom -= 1
-            
-            # Yukarı git
-            if top <= bottom:
-                for i in range(bottom, top - 1, -1):
-                    result += matrix[i][right]
-                right -= 1
-            
-            # Sola git
-            if left <= right:
-                for i in range(right, left - 1, -1):
-                    result += matrix[top][i]
-                top += 1
-        
-        return result
-    
-    def _write_spiral_counterclockwise(self, text, rows, cols):
-        """Saat yönünün tersine spiral yazma"""
-        matrix = [['' for _ in range(cols)] for _ in range(rows)]
-        top, bottom, left, right = 0, rows - 1, 0, cols - 1
-        idx = 0
-        
-        while top <= bottom and left <= right and idx < len(text):
-            for i in range(top, bottom + 1):
-                if idx < len(text):
-                    matrix[i][left] = text[idx]
-                    idx += 1
-            left += 1
-            
-            if left <= right:
-                for i in range(left, right + 1):
-                    if idx < len(text):
-                        matrix[bottom][i] = text[idx]
-                        idx += 1
-                bottom -= 1
-            
-            if top <= bottom:
-                for i in range(bottom, top - 1, -1):
-                    if idx < len(text):
-                        matrix[i][right] = text[idx]
-                        idx += 1
-                right -= 1
-            
-            if left <= right:
-                for i in range(right, left - 1, -1):
-                    if idx < len(text):
-                        matrix[top][i] = text[idx]
-                        idx += 1
-                top += 1
-        
-        return matrix
-    
-    def _read_zigzag(self, matrix, rows, cols):
-        """Zigzag (yılan) okuma"""
-        result = ""
-        for i in range(rows):
-            if i % 2 == 0:
-                # Soldan sağa
-                for j in range(cols):
-                    result += matrix[i][j]
-            else:
-                # Sağdan sola
-                for j in range(cols - 1, -1, -1):
-                    result += matrix[i][j]
-        return result
-    
-    def _write_zigzag(self, text, rows, cols):
-        """Zigzag yazma"""
-        matrix = [['' for _ in range(cols)] for _ in range(rows)]
-        idx = 0
-        
-        for i in range(rows):
-            if i % 2 == 0:
-                for j in range(cols):
-                    if idx < len(text):
-                        matrix[i][j] = text[idx]
-                        idx += 1
-            else:
-                for j in range(cols - 1, -1, -1):
-                    if idx < len(text):
-                        matrix[i][j] = text[idx]
-                        idx += 1
-        
-        return matrix
-    
-    def _read_diagonal(self, matrix, rows, cols):
-        """Çapraz okuma"""
-        result = ""
-        # Sol üstten sağ alta doğru çaprazlar
-        for k in range(rows + cols - 1):
-            if k < cols:
-                i, j = 0, k
-            else:
-                i, j = k - cols + 1, cols - 1
-            
-            while i < rows and j >= 0:
-                result += matrix[i][j]
-                i += 1
-                j -= 1
-        
-        return result
-    
-    def _write_diagonal(self, text, rows, cols):
-        """Çapraz yazma"""
-        matrix = [['' for _ in range(cols)] for _ in range(rows)]
-        idx = 0
-        
-        for k in range(rows + cols - 1):
-            if k < cols:
-                i, j = 0, k
-            else:
-                i, j = k - cols + 1, cols - 1
-            
-            while i < rows and j >= 0 and idx < len(text):
-                matrix[i][j] = text[idx]
-                idx += 1
-                i += 1
-                j -= 1
-        
-        return matrix
-    
-    def _read_column_by_column(self, matrix, rows, cols):
-        """Sütun sütun okuma"""
-        result = ""
-        for j in range(cols):
-            for i in range(rows):
-                result += matrix[i][j]
-        return result
-    
-    def _write_column_by_column(self, text, rows, cols):
-        """Sütun sütun yazma"""
-        matrix = [['' for _ in range(cols)] for _ in range(rows)]
-        idx = 0
-        
-        for j in range(cols):
-            for i in range(rows):
-                if idx < len(text):
-                    matrix[i][j] = text[idx]
-                    idx += 1
-        
-        return matrix
-
@@ -1,21 +1,74 @@
 from Crypto.PublicKey import RSA
 from Crypto.Cipher import PKCS1_OAEP
+from functools import lru_cache
 import base64
+import hashlib
 
-def generate_keypair():
-    key = RSA.generate(2048)
+KEY_CACHE_SIZE = 64
+KEY_SIZES = (2048, 3072, 4096)
+
+def generate_keypair(bits: int = 2048):
+    if bits not in KEY_SIZES:
+        raise ValueError(f"RSA anahtar boyutu {', '.join(map(str, KEY_SIZES))} olmalı")
+    key = RSA.generate(bits)
     private_key = key.export_key()
     public_key = key.publickey().export_key()
     return private_key, public_key
 
-def encrypt_key(sym_key: bytes, public_key_bytes: bytes) -> str:
-    public_key = RSA.import_key(public_key_bytes)
-    cipher = PKCS1_OAEP.new(public_key)
-    encrypted = cipher.encrypt(sym_key)
-    return base64.b64encode(encrypted).decode()
-
-def decrypt_key(enc_key_b64: str, private_key_bytes: bytes) -> bytes:
-    private_key = RSA.import_key(private_key_bytes)
-    cipher = PKCS1_OAEP.new(private_key)
-    encrypted = base64.b64decode(enc_key_b64)
-    return cipher.decrypt(encrypted)
+def fingerprint(pem) -> str:
+    """PEM anahtarın SHA-256 parmak izi (hex)"""
+    return hashlib.sha256(_normalize(pem)).hexdigest()
+
+def _normalize(pem) -> bytes:
+    if isinstance(pem, str):
+        pem = pem.encode()
+    return bytes(pem).strip()
+
+class RSAKeyHandle:
+    """
+    Bir kez içe aktarılmış RSA anahtarı ve hazır PKCS1_OAEP nesnesi.
+    PEM ayrıştırma maliyeti anahtar başına yalnızca bir kez ödenir.
+    """
+    __slots__ = ("fingerprint", "key", "cipher")
+
+    def __init__(self, pem: bytes):
+        self.fingerprint = hashlib.sha256(pem).hexdigest()
+        self.key = RSA.import_key(pem)
+        self.cipher = PKCS1_OAEP.new(self.key)
+
+    @property
+    def has_private(self) -> bool:
+        return self.key.has_private()
+
+    def encrypt_key(self, sym_key: bytes) -> str:
+        return base64.b64encode(self.cipher.encrypt(sym_key)).decode()
+
+    def decrypt_key(self, enc_key_b64: str) -> bytes:
+        if not self.has_private:
+            raise ValueError("Çözme için private key gerekli")
+        return self.cipher.decrypt(base64.b64decode(enc_key_b64))
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _load(pem: bytes) -> RSAKeyHandle:
+    return RSAKeyHandle(pem)
+
+def load_key(pem) -> RSAKeyHandle:
+    """PEM'i (str veya bytes) önbellekten veya ayrıştırarak yükle; handle olduğu gibi döner"""
+    if isinstance(pem, RSAKeyHandle):
+        return pem
+    return _load(_normalize(pem))
+
+def load_public_key(pem) -> RSAKeyHandle:
+    return load_key(pem)
+
+def load_private_key(pem) -> RSAKeyHandle:
+    handle = load_key(pem)
+    if not handle.has_private:
+        raise ValueError("Verilen anahtar private key değil")
+    return handle
+
+def encrypt_key(sym_key: bytes, public_key_bytes) -> str:
+    return load_key(public_key_bytes).encrypt_key(sym_key)
+
+def decrypt_key(enc_key_b64: str, private_key_bytes) -> bytes:
+    return load_key(private_key_bytes).decrypt_key(enc_key_b64)
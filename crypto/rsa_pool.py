@@ -0,0 +1,159 @@
+"""
+Önceden üretilmiş RSA anahtar çifti havuzu
+RSA anahtar üretimi saniyeler sürebilir ve GIL'i tutar. Havuz, arka planda
+ayrı süreçlerde (process) anahtar üretip her boyut için hedef derinlikte hazır
+anahtar tutar; istek geldiğinde hazır bir anahtar anında verilir. Havuz boşsa
+anahtar senkron olarak üretilir.
+"""
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from . import rsa
+
+POOL_DEPTH = 4
+POOL_WORKERS = 1
+LATENCY_SAMPLES = 256
+RESTART_DELAY = 1.0
+
+
+class KeyPairPool:
+    """
+    Boyut başına (2048/3072/4096) hazır anahtar çifti kuyruğu
+
+    Args:
+        sizes: Havuzda tutulacak anahtar boyutları
+        depth: Boyut başına hedef hazır anahtar sayısı
+        workers: Arka planda anahtar üreten süreç sayısı
+    """
+
+    def __init__(self, sizes=rsa.KEY_SIZES, depth: int = POOL_DEPTH, workers: int = POOL_WORKERS):
+        for bits in sizes:
+            if bits not in rsa.KEY_SIZES:
+                raise ValueError(f"RSA anahtar boyutu {', '.join(map(str, rsa.KEY_SIZES))} olmalı")
+        if depth < 0 or workers < 1:
+            raise ValueError("Havuz derinliği negatif, işçi sayısı sıfır olamaz")
+        self.sizes = tuple(sizes)
+        self.depth = depth
+        self.workers = workers
+        self._keys = {bits: deque() for bits in self.sizes}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+        self._refill_latency = {bits: deque(maxlen=LATENCY_SAMPLES) for bits in self.sizes}
+
+    def start(self):
+        """Arka plan doldurma iş parçacığını başlat (zaten çalışıyorsa bir şey yapmaz)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="rsa-key-pool", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def pop(self, bits: int = 2048):
+        """
+        Hazır bir anahtar çifti al: (private_pem, public_pem)
+        Havuz boşsa anahtar bu iş parçacığında üretilir.
+        """
+        if bits not in self._keys:
+            raise ValueError(f"Havuzda {bits} bit anahtar yok ({', '.join(map(str, self.sizes))})")
+        self.start()
+        with self._lock:
+            queue = self._keys[bits]
+            if queue:
+                self._hits += 1
+                keypair = queue.popleft()
+            else:
+                self._misses += 1
+                keypair = None
+        self._wakeup.set()
+        return keypair or rsa.generate_keypair(bits)
+
+    def metrics(self) -> dict:
+        """Boyut başına havuz derinliği, doldurma gecikmesi (ms) ve isabet sayıları"""
+        with self._lock:
+            sizes = {}
+            for bits in self.sizes:
+                samples = sorted(self._refill_latency[bits])
+                sizes[bits] = {
+                    "depth": len(self._keys[bits]),
+                    "target_depth": self.depth,
+                    "refill_latency_ms": {
+                        "last": round(self._refill_latency[bits][-1] * 1000, 1) if samples else None,
+                        "avg": round(sum(samples) / len(samples) * 1000, 1) if samples else None,
+                        "p99": round(samples[int(len(samples) * 0.99)] * 1000, 1) if samples else None,
+                    },
+                }
+            return {
+                "sizes": sizes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "errors": self._errors,
+                "running": self._thread is not None and self._thread.is_alive(),
+            }
+
+    def _deficits(self, pending: dict) -> list:
+        """Eksik anahtar sayısı kadar boyut listesi (bekleyen üretimler düşülür)"""
+        in_flight = [bits for bits, _ in pending.values()]
+        with self._lock:
+            return [bits for bits in self.sizes
+                    for _ in range(self.depth - len(self._keys[bits]) - in_flight.count(bits))]
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # fork yerine spawn: çok iş parçacıklı sunucu sürecinin kopyalanmasını önler
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def _run(self):
+        executor = self._executor()
+        pending = {}
+        try:
+            while not self._stop.is_set():
+                try:
+                    self._refill(executor, pending)
+                except BrokenProcessPool:
+                    # Bir işçi süreci öldü: havuz yeniden kurulur, bekleyen üretimler düşer
+                    with self._lock:
+                        self._errors += 1
+                    pending.clear()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    self._stop.wait(RESTART_DELAY)
+                    executor = self._executor()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _refill(self, executor: ProcessPoolExecutor, pending: dict):
+        # İşçi sayısından fazla iş kuyruğa alınmaz; pop() sonrası öncelik yeniden hesaplanır
+        for bits in self._deficits(pending)[:max(0, self.workers - len(pending))]:
+            pending[executor.submit(rsa.generate_keypair, bits)] = (bits, time.perf_counter())
+        if not pending:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            return
+        done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+        for future in done:
+            bits, started = pending.pop(future)
+            try:
+                keypair = future.result()
+            except BrokenProcessPool:
+                raise
+            except Exception:
+                with self._lock:
+                    self._errors += 1
+                continue
+            with self._lock:
+                self._keys[bits].append(keypair)
+                self._refill_latency[bits].append(time.perf_counter() - started)
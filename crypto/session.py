@@ -0,0 +1,88 @@
+"""
+Oturum (session) anahtarları
+İstemci ile sunucu bir kez ortak bir oturum sırrı (secret) üzerinde anlaşır
+(RSA ile taşınır); sonraki mesajlar yalnızca oturum kimliğini gönderir ve
+AES/DES anahtarları bu sırdan HKDF ile türetilir. Sunucu oturumları TTL ve
+LRU ile sınırlı bir önbellekte tutar; oturum kimliği bağlantılar arasında
+yeniden kullanılabilir (resumption).
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from Crypto.Hash import SHA256
+from Crypto.Protocol.KDF import HKDF
+from Crypto.Random import get_random_bytes
+
+SESSION_TTL = 3600  # saniye
+MAX_SESSIONS = 1024
+SECRET_SIZE = 32
+KEY_SIZES = {"aes": 16, "des": 8}
+
+
+def new_secret() -> bytes:
+    return get_random_bytes(SECRET_SIZE)
+
+
+def derive_key(secret: bytes, algorithm: str) -> bytes:
+    """Oturum sırrından algoritmaya özel anahtar türet (HKDF-SHA256)"""
+    if algorithm not in KEY_SIZES:
+        raise ValueError(f"Oturum anahtarı yalnızca {', '.join(KEY_SIZES)} için türetilir")
+    return HKDF(secret, KEY_SIZES[algorithm], b"", SHA256, context=algorithm.encode())
+
+
+class Session:
+    __slots__ = ("session_id", "secret", "expires", "_keys")
+
+    def __init__(self, session_id: str, secret: bytes, expires: float):
+        self.session_id = session_id
+        self.secret = secret
+        self.expires = expires
+        self._keys = {}
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires
+
+    def key(self, algorithm: str) -> bytes:
+        """Algoritma anahtarı (oturum başına bir kez türetilir)"""
+        key = self._keys.get(algorithm)
+        if key is None:
+            key = self._keys[algorithm] = derive_key(self.secret, algorithm)
+        return key
+
+
+class SessionCache:
+    """
+    Sunucu tarafı oturum önbelleği: ttl saniye sonra süresi dolar, en fazla
+    max_sessions oturum tutulur (en uzun süredir kullanılmayan atılır)
+    """
+
+    def __init__(self, ttl: float = SESSION_TTL, max_sessions: int = MAX_SESSIONS):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, secret: bytes) -> Session:
+        session = Session(get_random_bytes(16).hex(), secret, time.monotonic() + self.ttl)
+        with self._lock:
+            self._sessions[session.session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """Geçerli oturumu döndür; bilinmiyorsa veya süresi dolduysa None"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if session.expired:
+                del self._sessions[session_id]
+                return None
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def __len__(self) -> int:
+        return len(self._sessions)
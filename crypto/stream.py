@@ -0,0 +1,91 @@
+"""
+Blok şifreleri için akış (stream) tabanlı dosya şifreleme yardımcıları
+Girdi sabit boyutlu parçalar halinde okunur, şifreli çıktı doğrudan hedef
+akışa yazılır; bellek kullanımı dosya boyutundan bağımsızdır.
+"""
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _read_exact(infile, size: int) -> bytes:
+    """Akıştan tam olarak size byte oku (kısa okumaları birleştirir)"""
+    data = b""
+    while len(data) < size:
+        chunk = infile.read(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def _chunks(infile, chunk_size: int):
+    while True:
+        chunk = infile.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def encrypt_stream(cipher, block_size: int, infile, outfile, chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    CBC şifresiyle akışı şifrele; çıktı iv + şifreli veri
+
+    Args:
+        cipher: iv'si belirlenmiş CBC şifre nesnesi
+        block_size: Blok boyutu (AES 16, DES 8)
+        infile: read() destekleyen girdi (dosya, mmap, BytesIO...)
+        outfile: write() destekleyen çıktı
+
+    Returns:
+        Yazılan toplam byte sayısı
+    """
+    written = outfile.write(cipher.iv) or 0
+    pending = b""
+    for chunk in _chunks(infile, chunk_size):
+        data = pending + chunk if pending else chunk
+        cut = len(data) - len(data) % block_size
+        if cut:
+            written += outfile.write(cipher.encrypt(memoryview(data)[:cut])) or 0
+        pending = data[cut:]
+    # Dolgu yalnızca son (eksik) bloğa eklenir
+    padding_len = block_size - len(pending)
+    written += outfile.write(cipher.encrypt(pending + bytes([padding_len] * padding_len))) or 0
+    return written
+
+
+def decrypt_stream(new_cipher, block_size: int, infile, outfile, chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    encrypt_stream çıktısını çöz
+
+    Args:
+        new_cipher: iv alıp CBC şifre nesnesi döndüren fonksiyon
+        block_size: Blok boyutu
+        infile: Şifreli girdi akışı (iv + şifreli veri)
+        outfile: Düz metin çıktı akışı
+
+    Returns:
+        Yazılan toplam byte sayısı
+    """
+    iv = _read_exact(infile, block_size)
+    if len(iv) != block_size:
+        raise ValueError("Şifreli akış çok kısa")
+    cipher = new_cipher(iv)
+    written = 0
+    pending = b""
+    for chunk in _chunks(infile, chunk_size):
+        data = pending + chunk if pending else chunk
+        # Son tam blok dolgu içerebileceği için akış bitene kadar bekletilir
+        cut = len(data) - len(data) % block_size - block_size
+        if cut > 0:
+            written += outfile.write(cipher.decrypt(memoryview(data)[:cut])) or 0
+            pending = data[cut:]
+        else:
+            pending = data
+    if len(pending) != block_size:
+        raise ValueError("Şifreli akış uzunluğu blok boyutunun katı değil")
+    last = cipher.decrypt(pending)
+    padding_len = last[-1]
+    if not 1 <= padding_len <= block_size or last[-padding_len:] != bytes([padding_len] * padding_len):
+        raise ValueError("Geçersiz dolgu")
+    written += outfile.write(last[:-padding_len]) or 0
+    return written
@@ -1,4 +1,5 @@
 from .base import Cipher
+from .translation import mapping_table
 import string
 
 class Substitution(Cipher):
@@ -16,23 +17,9 @@ class Substitution(Cipher):
     def encrypt(self, text: str, **kw) -> str:
         mapping = kw.get("mapping")
         self._validate(mapping)
-        table_lower = {a:b for a,b in zip(string.ascii_lowercase, mapping.lower())}
-        table_upper = {a.upper():b.upper() for a,b in table_lower.items()}
-        out=[]
-        for ch in text:
-            if ch in table_lower: out.append(table_lower[ch])
-            elif ch in table_upper: out.append(table_upper[ch])
-            else: out.append(ch)
-        return "".join(out)
+        return mapping_table(mapping.lower()).apply(text)
 
     def decrypt(self, text: str, **kw) -> str:
         mapping = kw.get("mapping")
         self._validate(mapping)
-        inv_lower = {b:a for a,b in zip(string.ascii_lowercase, mapping.lower())}
-        inv_upper = {a.upper():b.upper() for a,b in inv_lower.items()}
-        out=[]
-        for ch in text:
-            if ch in inv_lower: out.append(inv_lower[ch])
-            elif ch in inv_upper: out.append(inv_upper[ch])
-            else: out.append(ch)
-        return "".join(out)
+        return mapping_table(mapping.lower(), inverse=True).apply(text)
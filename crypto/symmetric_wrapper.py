@@ -3,24 +3,73 @@ import crypto.aes as aes_lib
 import crypto.aes_manual as aes_manual
 import crypto.des as des_lib
 
+def _manual_mode(mode: str) -> str:
+    # Manuel AES kimlik doğrulaması yapmaz; GCM/EAX isteği sessizce CBC'ye düşürülmez
+    if mode in aes_lib.AEAD_MODES:
+        raise ValueError(f"{mode.upper()} modu yalnızca kütüphaneli AES ile kullanılabilir (use_library=True)")
+    return mode
+
+def _no_output(output):
+    # Manuel AES yeni bytes döndürür; verilen tampon sessizce yazılmadan bırakılmaz
+    if output is not None:
+        raise TypeError("output tamponu yalnızca kütüphaneli AES ile desteklenir (use_library=True)")
+
 class AESCipher:
-    def encrypt(self, text, key, use_library=True):
+    def encrypt(self, text, key, use_library=True, mode="cbc"):
         if use_library:
-            return aes_lib.encrypt(text, key)
+            if mode in aes_lib.AEAD_MODES:
+                return base64.b64encode(aes_lib.encrypt_aead(text.encode(), key, mode)).decode()
+            return aes_lib.get_context(key).encrypt(text)
         else:
-            encrypted = aes_manual.encrypt(text, key)
+            encrypted = aes_manual.encrypt(text, key, _manual_mode(mode))
             return base64.b64encode(encrypted).decode()
 
-    def decrypt(self, text, key, use_library=True):
+    def decrypt(self, text, key, use_library=True, mode="cbc"):
         if use_library:
-            return aes_lib.decrypt(text, key)
+            if mode in aes_lib.AEAD_MODES:
+                return aes_lib.decrypt_aead(base64.b64decode(text), key, mode).decode()
+            return aes_lib.get_context(key).decrypt(text)
         else:
             raw = base64.b64decode(text)
-            return aes_manual.decrypt(raw, key)
+            return aes_manual.decrypt(raw, key, _manual_mode(mode))
+
+    def encrypt_bytes(self, data, key, use_library=True, output=None):
+        if use_library:
+            return aes_lib.encrypt_bytes(data, key, output)
+        _no_output(output)
+        return aes_manual.encrypt_bytes(bytes(data), key)
+
+    def decrypt_bytes(self, raw, key, use_library=True, output=None):
+        if use_library:
+            return aes_lib.decrypt_bytes(raw, key, output)
+        _no_output(output)
+        return aes_manual.decrypt_bytes(bytes(raw), key)
+
+    def encrypt_many(self, texts, key, use_library=True):
+        if use_library:
+            return aes_lib.encrypt_many(texts, key)
+        return [self.encrypt(text, key, use_library=False) for text in texts]
+
+    def decrypt_many(self, texts, key, use_library=True):
+        if use_library:
+            return aes_lib.decrypt_many(texts, key)
+        return [self.decrypt(text, key, use_library=False) for text in texts]
 
 class DESCipher:
     def encrypt(self, text, key, **kwargs):
-        return des_lib.encrypt(text, key)
+        return des_lib.get_context(key).encrypt(text)
 
     def decrypt(self, text, key, **kwargs):
-        return des_lib.decrypt(text, key)
+        return des_lib.get_context(key).decrypt(text)
+
+    def encrypt_bytes(self, data, key, output=None, **kwargs):
+        return des_lib.encrypt_bytes(data, key, output)
+
+    def decrypt_bytes(self, raw, key, output=None, **kwargs):
+        return des_lib.decrypt_bytes(raw, key, output)
+
+    def encrypt_many(self, texts, key, **kwargs):
+        return des_lib.encrypt_many(texts, key)
+
+    def decrypt_many(self, texts, key, **kwargs):
+        return des_lib.decrypt_many(texts, key)
@@ -0,0 +1,46 @@
+"""
+Çeviri tablosu motoru (Caesar, Affine ve Substitution için ortak)
+Her (şifre, anahtar) çifti bir kez str.translate tablosuna derlenir ve
+LRU önbellekte tutulur; metin tek bir translate çağrısıyla işlenir.
+"""
+import string
+from functools import lru_cache
+
+LOWER = string.ascii_lowercase
+UPPER = string.ascii_uppercase
+TABLE_CACHE_SIZE = 256
+
+
+class TranslationTable:
+    """26 harflik hedef alfabeden derlenmiş çeviri tablosu"""
+
+    __slots__ = ("bytes_table", "str_table")
+
+    def __init__(self, target_lower: str):
+        source = LOWER + UPPER
+        target = target_lower + target_lower.upper()
+        # ASCII hızlı yol: bytes.translate 256 elemanlı tablo ile çalışır
+        self.bytes_table = bytes.maketrans(source.encode("ascii"), target.encode("ascii"))
+        # Genel yol: yalnızca ASCII harfler eşlenir, ç/ş gibi harfler olduğu gibi kalır
+        self.str_table = str.maketrans(source, target)
+
+    def apply(self, text: str) -> str:
+        """Tabloyu metne uygula"""
+        if text.isascii():
+            return text.encode("ascii").translate(self.bytes_table).decode("ascii")
+        return text.translate(self.str_table)
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def affine_table(a: int, b: int) -> TranslationTable:
+    """x -> (a*x + b) mod 26 eşlemesi için tablo (Caesar: a=1)"""
+    return TranslationTable("".join(LOWER[(a * x + b) % 26] for x in range(26)))
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def mapping_table(mapping: str, inverse: bool = False) -> TranslationTable:
+    """26 harflik permütasyon için tablo (inverse=True ise ters eşleme)"""
+    mapping = mapping.lower()
+    if inverse:
+        mapping = "".join(LOWER[mapping.index(ch)] for ch in LOWER)
+    return TranslationTable(mapping)
@@ -1,26 +1,64 @@
 from .base import Cipher
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Bu uzunluğun altındaki metinlerde NumPy kurulum maliyeti kazançtan büyük
+VECTORIZE_THRESHOLD = 1024
+VECTOR_CHUNK = 1 << 16
+
 class Vigenere(Cipher):
     name = "vigenere"
 
-    def _process(self, text: str, key: str, enc=True):
+    def _key_shifts(self, key: str, enc: bool) -> list:
         key = "".join([c.lower() for c in key if c.isalpha()])
         if not key:
             raise ValueError("Vigenere için alfabetik bir anahtar gerekli.")
-        out, j = [], 0
+        shifts = [(ord(c) - ord('a')) % 26 for c in key]
+        if not enc:
+            shifts = [(26 - k) % 26 for k in shifts]
+        return shifts
+
+    def _process_python(self, text: str, shifts: list) -> str:
+        out, j, n = [], 0, len(shifts)
         for ch in text:
             if ch.isalpha():
                 base = ord('A') if ch.isupper() else ord('a')
-                k = ord(key[j % len(key)]) - ord('a')
-                if not enc:
-                    k = -k
-                idx = (ord(ch) - base + k) % 26
+                idx = (ord(ch) - base + shifts[j % n]) % 26
                 out.append(chr(base + idx))
                 j += 1
             else:
                 out.append(ch)
         return "".join(out)
 
+    def _process_vectorized(self, text: str, shifts: list) -> str:
+        """ASCII metni uint8 dizisi olarak parça parça işle"""
+        out = np.frombuffer(text.encode("ascii"), dtype=np.uint8).copy()
+        n = len(shifts)
+        # Her parçada anahtarın herhangi bir fazdan başlayabilmesi için fazladan tekrar
+        key = np.tile(np.array(shifts, dtype=np.uint8), VECTOR_CHUNK // n + 2)
+        j = 0
+        # Parçalar önbellekte kalacak kadar küçük tutulur
+        for start in range(0, out.size, VECTOR_CHUNK):
+            chunk = out[start:start + VECTOR_CHUNK]
+            folded = chunk | 0x20
+            positions = np.flatnonzero((folded >= ord('a')) & (folded <= ord('z')))
+            letters = chunk[positions]
+            phase = j % n
+            # 'A'/'a' tabanı üst bitlerde, harf sırası alt 5 bitte
+            chunk[positions] = (letters & 0xE0) + 1 + ((letters & 0x1F) - 1 + key[phase:phase + positions.size]) % 26
+            j += positions.size
+        return out.tobytes().decode("ascii")
+
+    def _process(self, text: str, key: str, enc=True):
+        shifts = self._key_shifts(key, enc)
+        if NUMPY_AVAILABLE and len(text) >= VECTORIZE_THRESHOLD and text.isascii():
+            return self._process_vectorized(text, shifts)
+        return self._process_python(text, shifts)
+
     def encrypt(self, text: str, **kw) -> str:
         return self._process(text, kw.get("key", "key"), enc=True)
 
@@ -5,22 +5,40 @@ AES, DES ve RSA algoritmalarını destekler
 import socket
 import json
 import os
+import time
 import base64
 from crypto.key_manager import KeyManager
 from crypto.symmetric_wrapper import AESCipher, DESCipher
 import crypto.rsa as rsa_lib
+import crypto.session as session_lib
+import crypto.ecdh as ecdh
 
 
 HOST = "127.0.0.1"
 PORT = 12346
+# Tek bir çerçevenin (JSON veya ikili veri) en büyük boyutu
+MAX_FRAME_SIZE = 64 * 1024 * 1024
 
 class CryptoClient:
-    def __init__(self):
+    def __init__(self, kex: str = "rsa"):
+        """
+        Args:
+            kex: Tercih edilen anahtar değişim yöntemi ("rsa" veya "x25519");
+                sunucu desteklemiyorsa sunucunun sunduğu ilk yöntem kullanılır
+        """
+        self.kex = kex
         self.aes = AESCipher()
         self.des = DESCipher()
         self.rsa = rsa_lib
-        self.key_manager = KeyManager("client_keys.json")
+        self.key_manager = KeyManager("client_keys.db", legacy_file="client_keys.json")
         self.server_rsa_public_key = None
+        self.server_rsa_fingerprint = None
+        self.server_fingerprint = None
+        self.server_x25519_public = None
+        self.server_kex = None
+        # Parmak izi -> anahtar handle'ı ve açık oturum; yeniden bağlanınca tekrar kullanılır
+        self._server_keys = {}
+        self._sessions = {}
         self.socket = None
     
     def connect(self):
@@ -28,35 +46,102 @@ class CryptoClient:
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.socket.connect((HOST, PORT))
         
-        # RSA public key'i al
+        # Sunucu yöntemleri ve RSA anahtarının yalnızca parmak izini gönderir
         message = self._receive_message()
         if message and message.get("type") == "rsa_public_key":
-            self.server_rsa_public_key = message.get("public_key")
-            print("✓ Sunucudan RSA public key alındı")
+            offered = message.get("kex") or ["rsa"]
+            self.server_kex = self.kex if self.kex in offered else offered[0]
+            self.server_x25519_public = None
+            self.server_rsa_fingerprint = self.server_fingerprint = message.get("fingerprint")
+            # PEM yalnızca gerektiğinde ve parmak izi önbellekte yoksa istenir (_server_rsa_key)
+            self.server_rsa_public_key = self._server_keys.get(self.server_rsa_fingerprint)
+            if self.server_rsa_public_key is not None:
+                print("✓ Sunucu RSA anahtarı tanındı (önbellekten)")
+            if self.server_kex == "x25519":
+                self._accept_x25519_key(message)
         else:
             raise Exception("RSA public key alınamadı")
+
+    def _server_rsa_key(self):
+        """
+        Sunucunun RSA anahtar handle'ı; parmak izi önbellekte yoksa PEM
+        sunucudan bir kez istenir (get_public_key)
+        """
+        if self.server_rsa_public_key is not None:
+            return self.server_rsa_public_key
+        if not self.server_rsa_fingerprint:
+            # Yalnızca X25519 sunan sunucuya anahtar ancak oturumla taşınabilir
+            raise ValueError("Sunucu RSA anahtarı sunmadı; oturum (use_session=True) gerekli")
+        self._send_message({"type": "get_public_key"})
+        message = self._receive_message()
+        if not message or message.get("type") != "rsa_public_key" or not message.get("public_key"):
+            raise Exception("RSA public key alınamadı")
+        self._accept_rsa_key(message)
+        return self.server_rsa_public_key
+
+    def _accept_rsa_key(self, message: dict):
+        handle = rsa_lib.load_public_key(message.get("public_key"))
+        if handle.fingerprint != self.server_rsa_fingerprint:
+            raise Exception("Sunucu RSA anahtarının parmak izi uyuşmuyor")
+        self._server_keys[handle.fingerprint] = handle
+        print("✓ Sunucudan RSA public key alındı")
+        self.server_rsa_public_key = handle
+
+    def _accept_x25519_key(self, message: dict):
+        public = ecdh.decode_public(message.get("x25519_public_key"))
+        fingerprint = ecdh.fingerprint(public)
+        if message.get("x25519_fingerprint") not in (None, fingerprint):
+            raise Exception("Sunucu X25519 anahtarının parmak izi uyuşmuyor")
+        print("✓ Sunucudan X25519 açık anahtarı alındı (ECDH)")
+        self.server_x25519_public = public
+        self.server_fingerprint = fingerprint
     
+    def _recv_exact(self, size: int):
+        """Tam olarak size byte'ı önceden ayrılmış tampona oku (bağlantı kapanırsa None)"""
+        # Uzunluk karşı taraftan gelir; tampon ayırmadan önce sınırlanır
+        if size > MAX_FRAME_SIZE:
+            raise ValueError(f"Çerçeve çok büyük: {size} byte (en fazla {MAX_FRAME_SIZE})")
+        buf = bytearray(size)
+        view = memoryview(buf)
+        received = 0
+        while received < size:
+            n = self.socket.recv_into(view[received:], min(65536, size - received))
+            if not n:
+                return None
+            received += n
+        return buf
+
     def _receive_message(self) -> dict:
-        """Mesajı al ve parse et"""
-        length_data = self.socket.recv(4)
+        """Mesajı al ve parse et (encoding "binary" ise ham veri message["data"] olur)"""
+        length_data = self._recv_exact(4)
         if not length_data:
             return None
         length = int.from_bytes(length_data, 'big')
         
-        data = b''
-        while len(data) < length:
-            chunk = self.socket.recv(min(4096, length - len(data)))
-            if not chunk:
+        data = self._recv_exact(length)
+        if data is None:
+            return None
+        message = json.loads(data.decode('utf-8'))
+
+        if message.get("encoding") == "binary":
+            length_data = self._recv_exact(4)
+            if not length_data:
                 return None
-            data += chunk
-        
-        return json.loads(data.decode('utf-8'))
+            message["data"] = self._recv_exact(int.from_bytes(length_data, 'big'))
+            if message["data"] is None:
+                return None
+        return message
     
-    def _send_message(self, message: dict):
-        """Mesajı gönder"""
+    def _send_message(self, message: dict, payload=None):
+        """Mesajı gönder; payload verilirse JSON'dan sonra ham byte çerçevesi olarak gider"""
+        if payload is not None:
+            message = dict(message, encoding="binary")
         data = json.dumps(message).encode('utf-8')
         length = len(data).to_bytes(4, 'big')
         self.socket.sendall(length + data)
+        if payload is not None:
+            self.socket.sendall(len(payload).to_bytes(4, 'big'))
+            self.socket.sendall(payload)
     
     def _encrypt_message(self, algorithm: str, plaintext: str, use_library: bool = True, key=None) -> str:
         if algorithm == "aes":
@@ -68,7 +153,16 @@ class CryptoClient:
         else:
           raise ValueError(f"Bilinmeyen algoritma: {algorithm}")
     
-    def _decrypt_response(self, algorithm: str, encrypted_data: str, use_library: bool = True, key=None) -> str:
+    def _binary_cipher(self, algorithm: str):
+        if algorithm == "aes":
+            return self.aes
+        elif algorithm == "des":
+            return self.des
+        raise ValueError(f"{algorithm} ikili (binary) veri desteklemiyor")
+
+    def _decrypt_response(self, algorithm: str, encrypted_data, use_library: bool = True, key=None) -> str:
+        if isinstance(encrypted_data, (bytes, bytearray)):
+            return self._binary_cipher(algorithm).decrypt_bytes(encrypted_data, key, use_library=use_library).decode("utf-8")
         if algorithm == "aes":
            return self.aes.decrypt(encrypted_data, key, use_library)
         elif algorithm == "des":
@@ -79,8 +173,42 @@ class CryptoClient:
            raise ValueError(f"Bilinmeyen algoritma: {algorithm}")
 
     
-    def send_encrypted_message(self, message: str, algorithm: str = "aes", use_library: bool = True, key=None):
-        """Şifreli mesaj gönder"""
+    def _session_header(self, algorithm: str):
+        """
+        Anahtar verilmemiş AES/DES mesajı için oturum alanlarını ve anahtarı hazırla
+
+        Returns:
+            (başlık alanları, şifreleme anahtarı, yeni oturum sırrı veya None)
+        """
+        session = self._sessions.get(self.server_fingerprint)
+        if session is not None and not session.expired:
+            print("✓ Açık oturum kullanılıyor (anahtar değişimi yok)")
+            return {"session_id": session.session_id}, session.key(algorithm), None
+        if self.server_kex == "x25519":
+            # Geçici anahtar + sunucunun X25519 anahtarı -> ortak sır (RSA yok)
+            ephemeral = ecdh.generate_key()
+            client_public = ecdh.public_bytes(ephemeral)
+            secret = ecdh.derive_secret(ephemeral, self.server_x25519_public, client_public, self.server_x25519_public)
+            print("Yeni oturum sırrı X25519 (ECDH) ile üretildi.")
+            header = {"kex": "x25519", "client_public": ecdh.encode_public(ephemeral)}
+        else:
+            # Oturum sırrı bağlantı/oturum başına bir kez RSA ile sarılır
+            secret = session_lib.new_secret()
+            print("Yeni oturum sırrı üretildi ve RSA ile korundu.")
+            header = {"session_key": self._server_rsa_key().encrypt_key(secret)}
+        return header, session_lib.derive_key(secret, algorithm), secret
+
+    def send_encrypted_message(self, message: str, algorithm: str = "aes", use_library: bool = True, key=None,
+                               binary: bool = False, use_session: bool = True):
+        """
+        Şifreli mesaj gönder
+
+        binary=True ise (AES/DES) şifreli veri base64'e çevrilmeden ayrı bir
+        ham byte çerçevesinde gönderilir; sunucu ACK'yi de aynı şekilde döner.
+        use_session=True ise (anahtar verilmemiş AES/DES) RSA anahtar değişimi
+        oturum başına bir kez yapılır; False ise her mesaj için yeni anahtar RSA ile
+        sarılır (sunucu RSA anahtarı sunmadıysa ValueError).
+        """
         if not self.socket:
             raise Exception("Önce sunucuya bağlanın")
         
@@ -89,12 +217,16 @@ class CryptoClient:
 
         encrypted_key = None
         key_for_cipher = key
+        session_fields = {}
+        new_secret = None
         if algorithm in ["aes", "des"]:
             key_len = 16 if algorithm == "aes" else 8
-            if not key:
+            if not key and use_session:
+                session_fields, key_for_cipher, new_secret = self._session_header(algorithm)
+            elif not key:
                 # Rastgele simetrik anahtar üret ve RSA ile şifreleyip gönder
                 key_bytes = os.urandom(key_len)
-                encrypted_key = rsa_lib.encrypt_key(key_bytes, self.server_rsa_public_key)
+                encrypted_key = self._server_rsa_key().encrypt_key(key_bytes)
                 key_for_cipher = key_bytes
                 printable_key = base64.b64encode(key_bytes).decode("ascii")
                 print(f"Rastgele {key_len}-byte anahtar üretildi ve RSA ile korundu.")
@@ -104,30 +236,48 @@ class CryptoClient:
         
         try:
             # Mesajı şifrele
-            encrypted = self._encrypt_message(algorithm, message, use_library, key_for_cipher)
-            
-            print(f"Şifreli mesaj (base64): {encrypted[:100]}...")
-            print(f"Şifreli mesaj boyutu: {len(encrypted)} byte")
-            
-            # Sunucuya gönder
-            self._send_message({
+            header = {
                 "type": "encrypted_message",
                 "algorithm": algorithm,
-                "data": encrypted,
                 "use_library": use_library,
                 "key": key if key else None,
-                "encrypted_key": encrypted_key
-            })
+                "encrypted_key": encrypted_key,
+                **session_fields
+            }
+            if binary:
+                payload = self._binary_cipher(algorithm).encrypt_bytes(message.encode("utf-8"), key_for_cipher,
+                                                                      use_library=use_library)
+                print(f"Şifreli mesaj (hex): {bytes(payload[:50]).hex()}...")
+                print(f"Şifreli mesaj boyutu: {len(payload)} byte")
+                self._send_message(header, payload)
+            else:
+                encrypted = self._encrypt_message(algorithm, message, use_library, key_for_cipher)
+            
+                print(f"Şifreli mesaj (base64): {encrypted[:100]}...")
+                print(f"Şifreli mesaj boyutu: {len(encrypted)} byte")
+            
+                # Sunucuya gönder
+                self._send_message(dict(header, data=encrypted))
             
             # ACK al
             response = self._receive_message()
             if response and response.get("type") == "ack":
+                if new_secret is not None and response.get("session_id"):
+                    ttl = response.get("session_ttl", session_lib.SESSION_TTL)
+                    self._sessions[self.server_fingerprint] = session_lib.Session(
+                        response["session_id"], new_secret, time.monotonic() + ttl
+                    )
                 encrypted_ack = response.get("data")
                 ack_algorithm = response.get("algorithm")
                 
                 # ACK'yi çöz
                 decrypted_ack = self._decrypt_response(ack_algorithm, encrypted_ack, use_library, key_for_cipher)
                 print(f"\n✓ Sunucudan ACK: {decrypted_ack}")
+            elif response and response.get("code") == "session_expired":
+                # Sunucu oturumu unuttu: yeni anahtar değişimiyle bir kez daha dene
+                self._sessions.pop(self.server_fingerprint, None)
+                print("Oturum süresi doldu, yeni anahtar değişimi yapılıyor...")
+                return self.send_encrypted_message(message, algorithm, use_library, key, binary, use_session)
             elif response and response.get("type") == "error":
                 print(f"\n✗ Hata: {response.get('message')}")
             else:
@@ -7,6 +7,8 @@ import json
 import base64
 from crypto.symmetric_wrapper import AESCipher, DESCipher
 import crypto.rsa as rsa_lib
+import crypto.session as session_lib
+import crypto.ecdh as ecdh
 from crypto.key_manager import KeyManager
 from crypto.route import RouteCipher
 from crypto.columnar import ColumnarCipher
@@ -15,67 +17,148 @@ from crypto.polybius import PolybiusCipher
 
 HOST = "127.0.0.1"
 PORT = 12346
+# Tek bir çerçevenin (JSON veya ikili veri) en büyük boyutu
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+# Desteklenen anahtar değişim yöntemleri (ilk mesajda istemciye bildirilir)
+KEX_METHODS = ("rsa", "x25519")
 
 class CryptoServer:
-    def __init__(self):
+    def __init__(self, kex=KEX_METHODS):
+        unknown = set(kex) - set(KEX_METHODS)
+        if unknown or not kex:
+            raise ValueError(f"Anahtar değişim yöntemi {', '.join(KEX_METHODS)} olmalı")
+        self.kex = tuple(kex)
         self.aes = AESCipher()
         self.des = DESCipher()
         self.route = RouteCipher()
         self.columnar = ColumnarCipher()
         self.pigpen = PigpenCipher()
         self.polybius = PolybiusCipher()
-        self.key_manager = KeyManager("server_keys.json")
+        self.key_manager = KeyManager("server_keys.db", legacy_file="server_keys.json")
+        # Anahtar değişimi oturum başına bir kez yapılır; sonraki mesajlar oturum kimliğiyle gelir
+        self.sessions = session_lib.SessionCache()
         
-        # RSA anahtar çifti oluştur (anahtar dağıtımı için)
-        try:
-             self.rsa_public = self.key_manager.get_rsa_public_key()
-             self.rsa_private = self.key_manager.get_rsa_private_key()
-             if not self.rsa_public or not self.rsa_private:
-              raise Exception
-        except:
-            self.rsa_public, self.rsa_private = self.key_manager.generate_rsa_keypair()
+        self.rsa_public = self.rsa_private = None
+        self.rsa_private_key = self.rsa_fingerprint = None
+        if "rsa" in self.kex:
+            # RSA anahtar çifti oluştur (anahtar dağıtımı için)
+            try:
+                 self.rsa_public = self.key_manager.get_rsa_public_key()
+                 self.rsa_private = self.key_manager.get_rsa_private_key()
+                 if not self.rsa_public or not self.rsa_private:
+                  raise Exception
+            except:
+                self.rsa_public, self.rsa_private = self.key_manager.generate_rsa_keypair()
 
-        
-        print(f"RSA Public Key hazır (anahtar dağıtımı için)")
+            # Private key bir kez ayrıştırılır; her mesajda yeniden içe aktarılmaz
+            self.rsa_private_key = rsa_lib.load_private_key(self.rsa_private)
+            self.rsa_fingerprint = rsa_lib.fingerprint(self.rsa_public)
+            print(f"RSA Public Key hazır (anahtar dağıtımı için)")
+
+        self.x25519_key = self.x25519_public = None
+        if "x25519" in self.kex:
+            # X25519 anahtarı üretimi milisaniyeler sürer; RSA üretimi gibi açılışı bekletmez
+            pem = self.key_manager.get_x25519_private_key() or self.key_manager.generate_x25519_key()
+            self.x25519_key = ecdh.import_private_key(pem)
+            self.x25519_public = ecdh.public_bytes(self.x25519_key)
+            print("X25519 anahtarı hazır (ECDH anahtar anlaşması için)")
     
+    def _greeting(self) -> dict:
+        """
+        İlk mesaj: desteklenen anahtar değişim yöntemleri, RSA anahtarının
+        yalnızca parmak izi ve X25519 açık anahtarı (32 byte). RSA PEM'i her
+        bağlantıda gönderilmez; istemci parmak izini tanımıyorsa get_public_key ile ister.
+        """
+        greeting = {"type": "rsa_public_key", "kex": list(self.kex)}
+        if self.rsa_public:
+            greeting["fingerprint"] = self.rsa_fingerprint
+        if self.x25519_public:
+            greeting["x25519_public_key"] = ecdh.encode_public(self.x25519_key)
+            greeting["x25519_fingerprint"] = ecdh.fingerprint(self.x25519_public)
+        return greeting
+
+    def _public_key_message(self) -> dict:
+        """get_public_key yanıtı: RSA public key (PEM) ve parmak izi"""
+        if not self.rsa_public:
+            return {"type": "error", "message": "Sunucu RSA anahtar değişimini desteklemiyor"}
+        return {"type": "rsa_public_key", "public_key": self.rsa_public, "fingerprint": self.rsa_fingerprint}
+
+    def _recv_exact(self, conn: socket.socket, size: int):
+        """Tam olarak size byte'ı önceden ayrılmış tampona oku (bağlantı kapanırsa None)"""
+        # Uzunluk karşı taraftan gelir; tampon ayırmadan önce sınırlanır
+        if size > MAX_FRAME_SIZE:
+            raise ValueError(f"Çerçeve çok büyük: {size} byte (en fazla {MAX_FRAME_SIZE})")
+        buf = bytearray(size)
+        view = memoryview(buf)
+        received = 0
+        while received < size:
+            n = conn.recv_into(view[received:], min(65536, size - received))
+            if not n:
+                return None
+            received += n
+        return buf
+
     def _receive_message(self, conn: socket.socket) -> dict:
-        """Mesajı al ve parse et"""
+        """
+        Mesajı al ve parse et
+
+        encoding "binary" olan mesajlarda şifreli veri JSON'dan sonra gelen
+        ayrı bir uzunluk önekli çerçevede ham byte olarak gelir (base64 yok)
+        ve message["data"] olarak bytearray şeklinde döner.
+        """
         # Önce mesaj uzunluğunu al
-        length_data = conn.recv(4)
+        length_data = self._recv_exact(conn, 4)
         if not length_data:
             return None
         length = int.from_bytes(length_data, 'big')
         
         # Mesajı al
-        data = b''
-        while len(data) < length:
-            chunk = conn.recv(min(4096, length - len(data)))
-            if not chunk:
+        data = self._recv_exact(conn, length)
+        if data is None:
+            return None
+        message = json.loads(data.decode('utf-8'))
+
+        if message.get("encoding") == "binary":
+            length_data = self._recv_exact(conn, 4)
+            if not length_data:
                 return None
-            data += chunk
-        
-        return json.loads(data.decode('utf-8'))
+            message["data"] = self._recv_exact(conn, int.from_bytes(length_data, 'big'))
+            if message["data"] is None:
+                return None
+        return message
     
-    def _send_message(self, conn: socket.socket, message: dict):
-        """Mesajı gönder"""
+    def _send_message(self, conn: socket.socket, message: dict, payload=None):
+        """Mesajı gönder; payload verilirse JSON'dan sonra ham byte çerçevesi olarak gider"""
+        if payload is not None:
+            message = dict(message, encoding="binary")
         data = json.dumps(message).encode('utf-8')
         length = len(data).to_bytes(4, 'big')
         conn.sendall(length + data)
+        if payload is not None:
+            conn.sendall(len(payload).to_bytes(4, 'big'))
+            conn.sendall(payload)
 
-    def _resolve_key(self, algorithm: str, key: str = None, encrypted_key: str = None):
+    def _resolve_key(self, algorithm: str, key: str = None, encrypted_key: str = None, session=None):
         """
         Simetrik algoritmalar için gönderilen anahtarı çözümler.
+        - Oturum varsa anahtar oturum sırrından türetilir (RSA işlemi yok).
         - Eğer encrypted_key varsa RSA ile çözer.
         - Yoksa düz key değerini kullanır.
         """
         if algorithm in ["aes", "des"]:
+            if session is not None:
+                return session.key(algorithm)
             if encrypted_key:
-                return rsa_lib.decrypt_key(encrypted_key, self.rsa_private)
+                return self._rsa_key().decrypt_key(encrypted_key)
             return key
         return None
     
-    def _decrypt_message(self, algorithm: str, encrypted_data: str, **kwargs) -> str:
-        """Mesajı çöz"""
+    def _decrypt_message(self, algorithm: str, encrypted_data, **kwargs) -> str:
+        """Mesajı çöz (AES/DES için encrypted_data ham byte da olabilir)"""
+        if isinstance(encrypted_data, (bytes, bytearray)):
+            cipher = self._binary_cipher(algorithm)
+            return cipher.decrypt_bytes(encrypted_data, kwargs.get("key"),
+                                        use_library=kwargs.get("use_library", True)).decode('utf-8')
         if algorithm == "aes":
             use_library = kwargs.get("use_library", True)
             key = kwargs.get("key")
@@ -97,6 +180,14 @@ class CryptoServer:
         else:
             raise ValueError(f"Bilinmeyen algoritma: {algorithm}")
     
+    def _binary_cipher(self, algorithm: str):
+        """Ham byte (encoding "binary") destekleyen şifre nesnesi"""
+        if algorithm == "aes":
+            return self.aes
+        elif algorithm == "des":
+            return self.des
+        raise ValueError(f"{algorithm} ikili (binary) veri desteklemiyor")
+
     def _encrypt_response(self, algorithm: str, plaintext: str, **kwargs) -> str:
         """Yanıtı şifrele"""
         if algorithm == "aes":
@@ -120,16 +211,106 @@ class CryptoServer:
         else:
             raise ValueError(f"Bilinmeyen algoritma: {algorithm}")
     
+    def _rsa_key(self):
+        if self.rsa_private_key is None:
+            raise ValueError("Sunucuda RSA anahtar değişimi kapalı")
+        return self.rsa_private_key
+
+    def _open_session(self, message: dict):
+        """
+        Mesajdaki oturum bilgisini çözümle
+        - session_key: RSA ile sarılmış yeni oturum sırrı (oturum başına tek RSA işlemi)
+        - client_public: İstemcinin geçici X25519 anahtarı (oturum başına tek ECDH işlemi)
+        - session_id: Önceden açılmış oturum (bu veya önceki bir bağlantıda)
+
+        Returns:
+            (oturum veya None, oturum geçerli mi)
+        """
+        if message.get("client_public"):
+            if self.x25519_key is None:
+                raise ValueError("Sunucuda X25519 anahtar anlaşması kapalı")
+            client_public = ecdh.decode_public(message["client_public"])
+            secret = ecdh.derive_secret(self.x25519_key, client_public, client_public, self.x25519_public)
+            return self.sessions.create(secret), True
+        if message.get("session_key"):
+            secret = self._rsa_key().decrypt_key(message["session_key"])
+            return self.sessions.create(secret), True
+        if message.get("session_id"):
+            session = self.sessions.get(message["session_id"])
+            return session, session is not None
+        return None, True
+
+    def _handle_message(self, message: dict, log=print):
+        """
+        encrypted_message işle (çerçeveleme yok; engelleyen ve asyncio sunucu ortak kullanır)
+
+        Returns:
+            (yanıt mesajı, ham byte payload veya None)
+        """
+        algorithm = message.get("algorithm")
+        encrypted_data = message.get("data")
+        use_library = message.get("use_library", True)
+        key = message.get("key")
+        encrypted_key = message.get("encrypted_key")
+        binary = message.get("encoding") == "binary"
+        
+        log(f"Algoritma: {str(algorithm).upper()}, Kütüphane: {'Evet' if use_library else 'Hayır (Manuel)'}")
+        
+        try:
+            session, valid = self._open_session(message)
+            if not valid:
+                # İstemci yeni bir RSA anahtar değişimiyle oturumu yeniler
+                return {
+                    "type": "error",
+                    "code": "session_expired",
+                    "message": "Oturum bulunamadı veya süresi doldu"
+                }, None
+            resolved_key = self._resolve_key(algorithm, key, encrypted_key, session)
+
+            # Mesajı çöz
+            decrypted = self._decrypt_message(
+                algorithm, 
+                encrypted_data,
+                use_library=use_library,
+                key=resolved_key
+            )
+            
+            log(f"Çözülmüş mesaj: {decrypted}")
+            
+            # ACK gönder (şifreli)
+            ack_message = f"ACK: Mesaj alındı - '{decrypted[:50]}...'"
+            ack = {"type": "ack", "algorithm": algorithm}
+            if session is not None:
+                ack["session_id"] = session.session_id
+                ack["session_ttl"] = self.sessions.ttl
+            if binary:
+                # İstemci ham byte gönderdiyse ACK da base64'süz döner
+                payload = self._binary_cipher(algorithm).encrypt_bytes(
+                    ack_message.encode('utf-8'), resolved_key, use_library=use_library
+                )
+                return ack, payload
+            ack["data"] = self._encrypt_response(
+                algorithm,
+                ack_message,
+                use_library=use_library,
+                key=resolved_key
+            )
+            return ack, None
+            
+        except Exception as e:
+            log(f"Hata: {e}")
+            return {
+                "type": "error",
+                "message": str(e)
+            }, None
+
     def handle_client(self, conn: socket.socket, addr: tuple):
         """İstemciyi işle"""
         print(f"\n[{addr[0]}:{addr[1]}] Bağlandı")
         
         try:
-            # RSA public key'i gönder (anahtar dağıtımı için)
-            self._send_message(conn, {
-                "type": "rsa_public_key",
-                "public_key": self.rsa_public
-            })
+            # Desteklenen yöntemleri ve anahtar parmak izini gönder (anahtar dağıtımı için)
+            self._send_message(conn, self._greeting())
             
             while True:
                 # Mesaj al
@@ -140,48 +321,13 @@ class CryptoServer:
                 msg_type = message.get("type")
                 
                 if msg_type == "encrypted_message":
-                    algorithm = message.get("algorithm")
-                    encrypted_data = message.get("data")
-                    use_library = message.get("use_library", True)
-                    key = message.get("key")
-                    encrypted_key = message.get("encrypted_key")
-
-                    resolved_key = self._resolve_key(algorithm, key, encrypted_key)
-                    
-                    print(f"[{addr[0]}:{addr[1]}] Algoritma: {algorithm.upper()}, Kütüphane: {'Evet' if use_library else 'Hayır (Manuel)'}")
-                    
-                    try:
-                        # Mesajı çöz
-                        decrypted = self._decrypt_message(
-                            algorithm, 
-                            encrypted_data,
-                            use_library=use_library,
-                            key=resolved_key
-                        )
-                        
-                        print(f"[{addr[0]}:{addr[1]}] Çözülmüş mesaj: {decrypted}")
-                        
-                        # ACK gönder (şifreli)
-                        ack_message = f"ACK: Mesaj alındı - '{decrypted[:50]}...'"
-                        encrypted_ack = self._encrypt_response(
-                            algorithm,
-                            ack_message,
-                            use_library=use_library,
-                            key=resolved_key
-                        )
-                        
-                        self._send_message(conn, {
-                            "type": "ack",
-                            "data": encrypted_ack,
-                            "algorithm": algorithm
-                        })
-                        
-                    except Exception as e:
-                        print(f"[{addr[0]}:{addr[1]}] Hata: {e}")
-                        self._send_message(conn, {
-                            "type": "error",
-                            "message": str(e)
-                        })
+                    reply, payload = self._handle_message(
+                        message, lambda text: print(f"[{addr[0]}:{addr[1]}] {text}")
+                    )
+                    self._send_message(conn, reply, payload)
+                
+                elif msg_type == "get_public_key":
+                    self._send_message(conn, self._public_key_message())
                 
                 elif msg_type == "disconnect":
                     break
@@ -212,6 +358,8 @@ class CryptoServer:
             server_socket.close()
 
 if __name__ == "__main__":
-    server = CryptoServer()
+    import sys
+    # python crypto_server.py x25519  -> yalnızca ECDH (RSA anahtarı üretilmez)
+    server = CryptoServer(tuple(sys.argv[1:]) or KEX_METHODS)
     server.start()
 
@@ -0,0 +1,131 @@
+"""
+AES-GCM/EAX (kimlik doğrulamalı şifreleme) için davranış testleri (pytest)
+"""
+import io
+
+import pytest
+
+import crypto.aead as aead
+import crypto.aes as aes
+
+KEY = b"0123456789abcdef"
+MODES = sorted(aead.MODES)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_one_shot_round_trip_with_associated_data(mode):
+    raw = aes.encrypt_aead(b"gizli veri", KEY, mode, associated_data=b"baslik")
+    assert len(raw) == aead.NONCE_SIZE + len(b"gizli veri") + aead.TAG_SIZE
+    assert aes.decrypt_aead(raw, KEY, mode, associated_data=b"baslik") == b"gizli veri"
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_one_shot_rejects_tamper_wrong_key_and_associated_data(mode):
+    raw = bytearray(aes.encrypt_aead(b"gizli veri", KEY, mode, associated_data=b"ad"))
+    with pytest.raises(ValueError):
+        aes.decrypt_aead(bytes(raw), b"x" * 16, mode, associated_data=b"ad")
+    with pytest.raises(ValueError):
+        aes.decrypt_aead(bytes(raw), KEY, mode, associated_data=b"baska")
+    with pytest.raises(ValueError):
+        aes.decrypt_aead(bytes(raw[:aead.NONCE_SIZE + 3]), KEY, mode)
+    raw[aead.NONCE_SIZE] ^= 1
+    with pytest.raises(ValueError):
+        aes.decrypt_aead(bytes(raw), KEY, mode, associated_data=b"ad")
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        aes.encrypt_aead(b"veri", KEY, "ocb")
+
+
+def _seal(data: bytes, mode="gcm", segment_size=100, associated_data=None, pieces=7) -> bytes:
+    encryptor = aes.aead_encryptor(KEY, mode, segment_size, associated_data)
+    out = b"".join(encryptor.update(data[i:i + pieces]) for i in range(0, len(data), pieces))
+    return out + encryptor.finalize()
+
+
+def _open(raw: bytes, mode="gcm", associated_data=None, pieces=13) -> bytes:
+    decryptor = aes.aead_decryptor(KEY, mode, associated_data)
+    out = b"".join(decryptor.update(raw[i:i + pieces]) for i in range(0, len(raw), pieces))
+    return out + decryptor.finalize()
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("size", [0, 1, 99, 100, 101, 1000])
+def test_segmented_round_trip_with_arbitrary_update_sizes(mode, size):
+    data = bytes(i % 251 for i in range(size))
+    assert _open(_seal(data, mode, associated_data=b"ad"), mode, associated_data=b"ad") == data
+
+
+def test_segmented_rejects_truncation_at_segment_boundary():
+    raw = _seal(b"x" * 1000, segment_size=100)
+    frame = 100 + aead.TAG_SIZE
+    # Son segment atılırsa kalan segmentlerin hepsi geçerlidir; yine de reddedilmeli
+    with pytest.raises(ValueError):
+        _open(raw[:aead.HEADER_SIZE + 5 * frame])
+    with pytest.raises(ValueError):
+        _open(raw[:-1])
+
+
+def test_segmented_rejects_reordered_and_tampered_segments():
+    raw = _seal(b"".join(bytes([i]) * 100 for i in range(5)), segment_size=100)
+    frame = 100 + aead.TAG_SIZE
+    head, body = raw[:aead.HEADER_SIZE], raw[aead.HEADER_SIZE:]
+    frames = [body[i:i + frame] for i in range(0, len(body), frame)]
+    with pytest.raises(ValueError):
+        _open(head + frames[1] + frames[0] + b"".join(frames[2:]))
+    tampered = bytearray(raw)
+    tampered[aead.HEADER_SIZE + 3] ^= 1
+    with pytest.raises(ValueError):
+        _open(bytes(tampered))
+    # Başlık (segment boyutu) da doğrulanır
+    tampered = bytearray(raw)
+    tampered[3] ^= 1
+    with pytest.raises(ValueError):
+        _open(bytes(tampered))
+
+
+def test_update_after_finalize():
+    encryptor = aes.aead_encryptor(KEY)
+    encryptor.finalize()
+    with pytest.raises(ValueError):
+        encryptor.update(b"x")
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_file_streams_round_trip(mode):
+    data = bytes(i % 256 for i in range(300_000))
+    encrypted = io.BytesIO()
+    aes.encrypt_stream_aead(io.BytesIO(data), encrypted, KEY, mode, chunk_size=65536)
+    encrypted.seek(0)
+    decrypted = io.BytesIO()
+    aes.decrypt_stream_aead(encrypted, decrypted, KEY, mode, chunk_size=10_000)
+    assert decrypted.getvalue() == data
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_symmetric_wrapper_aead_modes(mode):
+    from crypto.symmetric_wrapper import AESCipher
+    cipher = AESCipher()
+    encrypted = cipher.encrypt("Merhaba Dünya!", KEY, mode=mode)
+    assert cipher.decrypt(encrypted, KEY, mode=mode) == "Merhaba Dünya!"
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_symmetric_wrapper_rejects_aead_without_library(mode):
+    from crypto.symmetric_wrapper import AESCipher
+    cipher = AESCipher()
+    # Manuel AES kimlik doğrulaması yapmaz; istek CBC'ye düşürülmemeli
+    with pytest.raises(ValueError, match="use_library"):
+        cipher.encrypt("veri", KEY, use_library=False, mode=mode)
+    encrypted = cipher.encrypt("veri", KEY, mode=mode)
+    with pytest.raises(ValueError, match="use_library"):
+        cipher.decrypt(encrypted, KEY, use_library=False, mode=mode)
+
+
+def test_symmetric_wrapper_manual_modes_round_trip():
+    from crypto.symmetric_wrapper import AESCipher
+    cipher = AESCipher()
+    for mode in ("cbc", "ctr"):
+        encrypted = cipher.encrypt("Merhaba Dünya!", KEY, use_library=False, mode=mode)
+        assert cipher.decrypt(encrypted, KEY, use_library=False, mode=mode) == "Merhaba Dünya!"
@@ -0,0 +1,65 @@
+"""
+Kütüphanesiz (saf Python) AES için davranış testleri (pytest)
+"""
+import pytest
+
+import crypto.aes_manual as aes_manual
+
+KEY = bytes(range(16))
+
+
+def test_round_trip_text_and_binary():
+    assert aes_manual.decrypt(aes_manual.encrypt("Merhaba Dünya!", KEY), KEY) == "Merhaba Dünya!"
+    data = bytes(range(256)) * 3
+    assert aes_manual.decrypt_bytes(aes_manual.encrypt_bytes(data, KEY), KEY) == data
+
+
+@pytest.mark.parametrize("key", [b"", b"x" * 15, b"x" * 33])
+def test_rejects_invalid_key_sizes(key):
+    with pytest.raises(ValueError):
+        aes_manual.encrypt("abc", key)
+
+
+# FIPS-197 Ek C.1-C.3
+FIPS_PLAINTEXT = bytes.fromhex("00112233445566778899aabbccddeeff")
+FIPS_VECTORS = [
+    ("000102030405060708090a0b0c0d0e0f", "69c4e0d86a7b0430d8cdb78070b4c55a"),
+    ("000102030405060708090a0b0c0d0e0f1011121314151617", "dda97ca4864cdfe06eaf70a0ec0d7191"),
+    ("000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f", "8ea2b7ca516745bfeafc49904b496089"),
+]
+
+
+@pytest.mark.parametrize("key_hex, ciphertext_hex", FIPS_VECTORS)
+def test_fips197_block_vectors(key_hex, ciphertext_hex):
+    key = bytes.fromhex(key_hex)
+    assert aes_manual.encrypt_block(FIPS_PLAINTEXT, key).hex() == ciphertext_hex
+    assert aes_manual.decrypt_block(bytes.fromhex(ciphertext_hex), key) == FIPS_PLAINTEXT
+
+
+@pytest.mark.parametrize("key_size", [16, 24, 32])
+def test_cbc_and_ctr_interoperate_with_pycryptodome(key_size):
+    from Crypto.Cipher import AES
+    key = bytes(range(key_size))
+    data = b"pycryptodome ile uyumlu " * 9
+    raw = aes_manual.encrypt_bytes(data, key, mode="cbc")
+    cipher = AES.new(key, AES.MODE_CBC, iv=raw[:16])
+    assert aes_manual.unpad(cipher.decrypt(raw[16:])) == data
+    raw = aes_manual.encrypt_bytes(data, key, mode="ctr")
+    assert AES.new(key, AES.MODE_CTR, nonce=raw[:8]).decrypt(raw[8:]) == data
+    library = AES.new(key, AES.MODE_CTR, nonce=b"n" * 8)
+    assert aes_manual.decrypt_bytes(b"n" * 8 + library.encrypt(data), key, mode="ctr") == data
+
+
+def test_cbc_rejects_bad_length_and_padding():
+    raw = aes_manual.encrypt_bytes(b"veri", KEY)
+    with pytest.raises(ValueError):
+        aes_manual.decrypt_bytes(raw[:-1], KEY)
+    with pytest.raises(ValueError):
+        aes_manual.decrypt_bytes(raw[:16], KEY)
+    with pytest.raises(ValueError):
+        aes_manual.unpad(b"\x00" * 16)
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        aes_manual.encrypt_bytes(b"veri", KEY, mode="ecb")
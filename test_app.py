@@ -0,0 +1,119 @@
+"""
+Flask uç noktaları için davranış testleri (pytest)
+"""
+import pytest
+
+from app import app
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+@pytest.mark.parametrize("method", ["aes_lib", "aes_manual", "des"])
+def test_binary_endpoints_round_trip_with_header_key(client, method):
+    data = bytes(range(256)) * 4
+    headers = {"X-Key": "parola"}
+    encrypted = client.post(f"/api/encrypt-bytes?method={method}", data=data, headers=headers)
+    assert encrypted.status_code == 200
+    assert encrypted.mimetype == "application/octet-stream"
+    decrypted = client.post(f"/api/decrypt-bytes?method={method}", data=encrypted.data, headers=headers)
+    assert decrypted.data == data
+
+
+def test_binary_endpoint_rejects_key_in_query_string(client):
+    response = client.post("/api/encrypt-bytes?method=aes_lib&key=parola", data=b"veri")
+    assert response.status_code == 400
+    assert "X-Key" in response.get_json()["error"]
+
+
+def test_binary_endpoint_requires_key(client):
+    response = client.post("/api/encrypt-bytes?method=aes_lib", data=b"veri")
+    assert response.status_code == 400
+
+
+def test_binary_endpoint_unknown_method(client):
+    response = client.post("/api/encrypt-bytes?method=caesar", data=b"veri", headers={"X-Key": "k"})
+    assert response.status_code == 400
+
+
+def test_rsa_pool_endpoints(client):
+    metrics = client.get("/api/rsa-pool").get_json()
+    assert set(metrics["sizes"]) == {"2048", "3072", "4096"}
+    response = client.post("/api/generate-rsa-key", json={"bits": 1024})
+    assert response.status_code == 400
+
+
+def _post(client, path, method, text, **options):
+    return client.post(path, json={"method": method, "text": text, "options": options})
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"kdf": "pbkdf2", "iterations": 1000, "salt": "00ff"},
+    {"kdf": "scrypt", "cost": 1024, "key_size": 32},
+    {"kdf": "none"},
+])
+@pytest.mark.parametrize("method", ["aes_lib", "des"])
+def test_password_kdf_options_round_trip(client, method, options):
+    options = dict(options, key="parola")
+    if method == "des":
+        options.pop("key_size", None)
+    encrypted = _post(client, "/api/encrypt", method, "Merhaba Dünya!", **options).get_json()["result"]
+    decrypted = _post(client, "/api/decrypt", method, encrypted, **options).get_json()
+    assert decrypted["result"] == "Merhaba Dünya!"
+
+
+def test_different_salt_derives_a_different_key(client):
+    encrypted = _post(client, "/api/encrypt", "aes_lib", "veri", key="parola", salt="01", mode="gcm")
+    response = _post(client, "/api/decrypt", "aes_lib", encrypted.get_json()["result"],
+                     key="parola", salt="02", mode="gcm")
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("options", [
+    {"iterations": 10_000_000},
+    {"kdf": "scrypt", "cost": 2 ** 20},
+    {"salt": "hex değil"},
+    {"key_size": 20},
+])
+def test_kdf_rejects_expensive_or_invalid_options(client, options):
+    response = _post(client, "/api/encrypt", "aes_lib", "veri", key="parola", **options)
+    assert response.status_code == 400
+
+
+def test_kdf_cache_metrics(client):
+    before = client.get("/api/kdf-cache").get_json()
+    for _ in range(3):
+        _post(client, "/api/encrypt", "aes_lib", "veri", key="önbellek", iterations=1000)
+    after = client.get("/api/kdf-cache").get_json()
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 2
+
+
+def test_fitted_keys_are_not_cached():
+    import app as app_module
+    # Eski doldur/kes yolu parolayı bellekte önbellekte tutmaz
+    assert not hasattr(app_module._fit_key, "cache_info")
+    assert app_module._fit_key("kisa", (16, 24, 32)) == b"kisa" + b"0" * 12
+    assert app_module._fit_key("x" * 40, (16, 24, 32)) == b"x" * 16
+
+
+# Kimlik doğrulamasız istekler için üst sınırlar: 600 bin PBKDF2 yinelemesi, scrypt N = 2**15 (32 MiB)
+@pytest.mark.parametrize("options, accepted", [
+    ({"iterations": 600_000}, True),
+    ({"iterations": 600_001}, False),
+    ({"kdf": "scrypt", "cost": 2 ** 15}, True),
+    ({"kdf": "scrypt", "cost": 2 ** 16}, False),
+])
+def test_kdf_request_ceilings(client, options, accepted):
+    import app as app_module
+    password = f"tavan-{sorted(options.items())}"
+    response = _post(client, "/api/encrypt", "aes_lib", "veri", key=password, **options)
+    assert (response.status_code == 200) is accepted
+    if accepted:
+        assert len(app_module._derive_key(password, (16,), options)) == 16
+    else:
+        with pytest.raises(ValueError):
+            app_module._derive_key(password, (16,), options)
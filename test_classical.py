@@ -0,0 +1,186 @@
+"""
+Klasik şifreler için davranış testleri (pytest)
+"""
+import pytest
+
+from crypto.caesar import Caesar
+from crypto.affine import Affine
+from crypto.substitution import Substitution
+from crypto.vigenere import Vigenere, VECTORIZE_THRESHOLD
+import crypto.vigenere as vigenere_mod
+from crypto.playfair import Playfair
+import crypto.hill as hill
+import crypto.railfence as railfence
+import crypto.permutation as permutation
+from crypto.route import RouteCipher, ROUTES
+from crypto.columnar import ColumnarCipher
+import crypto.polybius as polybius
+from crypto.polybius import PolybiusCipher
+from crypto.pigpen import PigpenCipher
+
+TEXT = "Merhaba Dünya! Hello, World 123"
+
+
+def test_caesar_known_vector_and_round_trip():
+    caesar = Caesar()
+    assert caesar.encrypt("abc XYZ", k=3) == "def ABC"
+    assert caesar.decrypt(caesar.encrypt(TEXT, k=7), k=7) == TEXT
+
+
+def test_caesar_keeps_non_ascii_letters():
+    # ü ve ç gibi harfler tabloda yok, olduğu gibi kalır
+    assert Caesar().encrypt("çüa", k=1) == "çüb"
+
+
+def test_affine_known_vector_and_round_trip():
+    affine = Affine()
+    assert affine.encrypt("affine", a=5, b=8) == "ihhwvc"
+    assert affine.decrypt(affine.encrypt(TEXT, a=7, b=3), a=7, b=3) == TEXT
+
+
+def test_affine_rejects_non_invertible_a():
+    with pytest.raises(ValueError):
+        Affine().encrypt("abc", a=13, b=1)
+
+
+def test_substitution_round_trip():
+    mapping = "qwertyuiopasdfghjklzxcvbnm"
+    sub = Substitution()
+    assert sub.encrypt("abc", mapping=mapping) == "qwe"
+    assert sub.decrypt(sub.encrypt(TEXT, mapping=mapping), mapping=mapping) == TEXT
+
+
+def test_substitution_rejects_invalid_mapping():
+    with pytest.raises(ValueError):
+        Substitution().encrypt("abc", mapping="abc")
+
+
+def test_vigenere_known_vector():
+    assert Vigenere().encrypt("attackatdawn", key="lemon") == "lxfopvefrnhr"
+
+
+def test_vigenere_vectorized_matches_python_path(monkeypatch):
+    text = ("Attack at dawn, 42 times! " * 200)[:VECTORIZE_THRESHOLD * 5]
+    vector = Vigenere().encrypt(text, key="Lemon")
+    monkeypatch.setattr(vigenere_mod, "NUMPY_AVAILABLE", False)
+    assert Vigenere().encrypt(text, key="Lemon") == vector
+    assert Vigenere().decrypt(vector, key="Lemon") == text
+
+
+def test_playfair_known_vector_and_round_trip():
+    playfair = Playfair()
+    encrypted = playfair.encrypt("hide the gold in the tree stump", key="playfair example")
+    assert encrypted == "BMODZBXDNABEKUDMUIXMMOUVIF"
+    assert playfair.decrypt(encrypted, key="playfair example") == "HIDETHEGOLDINTHETREXESTUMP"
+
+
+def test_playfair_rejects_non_alphabetic_key():
+    with pytest.raises(ValueError):
+        Playfair().encrypt("abc", key="123")
+
+
+def test_hill_3x3_known_vector_and_round_trip():
+    assert hill.encrypt("ACT", "GYBNQKURP") == "POH"
+    assert hill.decrypt("POH", "GYBNQKURP") == "ACT"
+
+
+@pytest.mark.parametrize("key, n", [("DDCF", 2), ("GYBNQKURP", 3), ("SPQMSBPHXZMNVFLR", 4)])
+def test_hill_nxn_round_trip_pads_with_x(key, n):
+    decrypted = hill.decrypt(hill.encrypt("Hello World", key), key)
+    assert decrypted == "HELLOWORLD" + "X" * ((-10) % n)
+
+
+def test_hill_rejects_bad_keys():
+    with pytest.raises(ValueError):
+        hill.encrypt("ABCD", "ABC")
+    with pytest.raises(ValueError):
+        hill.decrypt("ABCD", "AAAA")
+
+
+def test_railfence_known_vector_and_round_trip():
+    assert railfence.encrypt("WE ARE DISCOVERED, FLEE AT ONCE", 3) == "WECRLTEERDSOEEFEAOCAIVDEN"
+    assert railfence.decrypt("WECRLTEERDSOEEFEAOCAIVDEN", 3) == "WEAREDISCOVEREDFLEEATONCE"
+
+
+def test_railfence_python_path_matches_numpy(monkeypatch):
+    text = "Merhaba Dunya " * 500
+    expected = railfence.encrypt(text, 5)
+    monkeypatch.setattr(railfence, "NUMPY_AVAILABLE", False)
+    monkeypatch.setattr(permutation, "NUMPY_AVAILABLE", False)
+    railfence._zigzag_permutation.cache_clear()
+    assert railfence.encrypt(text, 5) == expected
+    assert railfence.decrypt(expected, 5) == text.replace(" ", "").upper()
+    railfence._zigzag_permutation.cache_clear()
+
+
+def test_railfence_does_not_cache_large_permutations():
+    railfence._zigzag_permutation.cache_clear()
+    text = "A" * (permutation.CACHE_MAX_LENGTH + 1)
+    assert railfence.decrypt(railfence.encrypt(text, 4), 4) == text
+    assert railfence._zigzag_permutation.cache_info().currsize == 0
+    railfence.encrypt("AAAA", 4)
+    assert railfence._zigzag_permutation.cache_info().currsize == 1
+
+
+def test_route_column_known_vector():
+    assert RouteCipher().encrypt("ABCDEFG", rows=3, route="column") == "ADGBEXCFX"
+
+
+@pytest.mark.parametrize("route", sorted(ROUTES))
+def test_route_round_trip(route):
+    route_cipher = RouteCipher()
+    encrypted = route_cipher.encrypt("WE ARE DISCOVERED FLEE AT ONCE", rows=5, route=route)
+    assert route_cipher.decrypt(encrypted, rows=5, route=route) == "WEAREDISCOVEREDFLEEATONCE"
+
+
+def test_route_rejects_zero_rows():
+    with pytest.raises(ValueError):
+        RouteCipher().encrypt("ABC", rows=0)
+
+
+def test_columnar_known_vector_and_round_trip():
+    columnar = ColumnarCipher()
+    encrypted = columnar.encrypt("WE ARE DISCOVERED FLEE AT ONCE", key="ZEBRAS")
+    assert encrypted == "EVLNXACDTXESEAXROFOXDEECXWIREE"
+    assert columnar.decrypt(encrypted, key="ZEBRAS") == "WEAREDISCOVEREDFLEEATONCE"
+
+
+def test_columnar_multi_pass_round_trip():
+    columnar = ColumnarCipher()
+    double = columnar.encrypt("WEAREDISCOVEREDFLEEATONCE", keys="ZEBRAS,STRIPE")
+    assert columnar.decrypt(double, keys=["ZEBRAS", "STRIPE"]) == "WEAREDISCOVEREDFLEEATONCE"
+    assert double != columnar.encrypt("WEAREDISCOVEREDFLEEATONCE", key="ZEBRAS")
+
+
+def test_columnar_rejects_empty_key():
+    with pytest.raises(ValueError):
+        ColumnarCipher().encrypt("ABC", key="")
+
+
+def test_polybius_numbers_and_letters_round_trip():
+    square = PolybiusCipher()
+    assert square.encrypt("Hello World") == "23 15 32 32 35 53 35 43 32 14"
+    assert square.decrypt("23 15 32 32 35 53 35 43 32 14") == "HELLOWORLD"
+    assert square.decrypt(square.encrypt("Hello", use_numbers=False), use_numbers=False) == "HELLO"
+
+
+@pytest.mark.parametrize("period", [0, 1, 5, 7])
+def test_bifid_round_trip(period):
+    square = PolybiusCipher()
+    encrypted = square.encrypt_with_bifid("FLEE AT ONCE", period=period)
+    assert square.decrypt_with_bifid(encrypted, period=period) == "FLEEATONCE"
+
+
+def test_bifid_python_path_matches_numpy(monkeypatch):
+    square = PolybiusCipher()
+    text = "DEFENDTHEEASTWALLOFTHECASTLE" * 100
+    expected = square.encrypt_with_bifid(text, period=5)
+    monkeypatch.setattr(polybius, "NUMPY_AVAILABLE", False)
+    assert square.encrypt_with_bifid(text, period=5) == expected
+    assert square.decrypt_with_bifid(expected, period=5) == text
+
+
+def test_pigpen_round_trip():
+    pigpen = PigpenCipher()
+    assert pigpen.decrypt(pigpen.encrypt("Hello World")) == "HELLOWORLD"
+    assert pigpen.decrypt(pigpen.encrypt("Hi", use_numeric=False), use_numeric=False) == "HI"
@@ -0,0 +1,91 @@
+"""
+Parola tabanlı anahtar türetme (PBKDF2, scrypt) ve KDFCache için davranış testleri (pytest)
+"""
+import hashlib
+import time
+
+import pytest
+
+import crypto.kdf as kdf
+
+
+def test_params_defaults_and_bounds():
+    assert kdf.params() == (kdf.PBKDF2_ITERATIONS,)
+    assert kdf.params("scrypt") == (kdf.SCRYPT_COST, kdf.SCRYPT_BLOCK_SIZE, kdf.SCRYPT_PARALLELISM)
+    assert kdf.params("pbkdf2", "5000") == (5000,)
+    assert kdf.params("pbkdf2", kdf.PBKDF2_MAX_ITERATIONS) == (kdf.PBKDF2_MAX_ITERATIONS,)
+    assert kdf.params("scrypt", cost=kdf.SCRYPT_MAX_COST)[0] == kdf.SCRYPT_MAX_COST
+
+
+@pytest.mark.parametrize("kdf_name, iterations, cost", [
+    ("pbkdf2", 999, None),
+    ("pbkdf2", kdf.PBKDF2_MAX_ITERATIONS + 1, None),
+    ("pbkdf2", "çok", None),
+    ("scrypt", None, 512),
+    ("scrypt", None, 3000),
+    ("scrypt", None, kdf.SCRYPT_MAX_COST * 2),
+    ("argon2", None, None),
+])
+def test_params_rejects_out_of_range(kdf_name, iterations, cost):
+    with pytest.raises(ValueError):
+        kdf.params(kdf_name, iterations, cost)
+
+
+def test_parse_salt():
+    assert kdf.parse_salt(None) == kdf.DEFAULT_SALT
+    assert kdf.parse_salt("") == kdf.DEFAULT_SALT
+    assert kdf.parse_salt("00ff") == b"\x00\xff"
+    with pytest.raises(ValueError):
+        kdf.parse_salt("tuz")
+
+
+@pytest.mark.parametrize("kdf_name, kdf_params", [("pbkdf2", (1000,)), ("scrypt", (1024, 8, 1))])
+def test_derive_key_is_deterministic_per_password_and_salt(kdf_name, kdf_params):
+    key = kdf.derive_key("parola", b"tuz", 16, kdf_name, kdf_params)
+    assert len(key) == 16
+    assert kdf.derive_key(b"parola", b"tuz", 16, kdf_name, kdf_params) == key
+    assert kdf.derive_key("parola", b"baska", 16, kdf_name, kdf_params) != key
+    assert kdf.derive_key("parola2", b"tuz", 16, kdf_name, kdf_params) != key
+
+
+def test_cache_hits_and_misses():
+    cache = kdf.KDFCache()
+    key = cache.derive("parola", b"tuz", 16, iterations=1000)
+    assert cache.derive(b"parola", b"tuz", 16, iterations=1000) == key
+    assert key == kdf.derive_key("parola", b"tuz", 16, "pbkdf2", (1000,))
+    # Tuz, uzunluk veya parametre farklıysa ayrı girdi
+    cache.derive("parola", b"tuz", 32, iterations=1000)
+    cache.derive("parola", b"tuz", 16, iterations=2000)
+    metrics = cache.metrics()
+    assert (metrics["hits"], metrics["misses"], metrics["entries"]) == (1, 3, 3)
+    assert metrics["hit_ratio"] == 0.25
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_cache_does_not_store_the_password():
+    cache = kdf.KDFCache()
+    cache.derive("gizli-parola", b"tuz", 16, iterations=1000)
+    entry = next(iter(cache._keys))
+    assert entry[0] == hashlib.sha256(b"gizli-parola").digest()
+    assert b"gizli-parola" not in entry
+
+
+def test_cache_entries_expire():
+    cache = kdf.KDFCache(ttl=0.05)
+    cache.derive("parola", b"tuz", 16, iterations=1000)
+    time.sleep(0.1)
+    cache.derive("parola", b"tuz", 16, iterations=1000)
+    assert cache.metrics()["misses"] == 2
+
+
+def test_cache_is_bounded_lru():
+    cache = kdf.KDFCache(max_entries=2)
+    for password in ("a", "b"):
+        cache.derive(password, b"tuz", 16, iterations=1000)
+    cache.derive("a", b"tuz", 16, iterations=1000)
+    cache.derive("c", b"tuz", 16, iterations=1000)
+    assert len(cache) == 2
+    cache.derive("a", b"tuz", 16, iterations=1000)
+    cache.derive("b", b"tuz", 16, iterations=1000)
+    assert cache.metrics()["hits"] == 2 and cache.metrics()["misses"] == 4
@@ -0,0 +1,163 @@
+"""
+KeyManager (çözülmüş anahtar önbelleği, toplu işlemler) için davranış testleri (pytest)
+"""
+import pytest
+
+import crypto.rsa as rsa_lib
+from crypto.key_manager import KeyManager
+
+
+@pytest.fixture(scope="module")
+def pems():
+    private_pem, public_pem = rsa_lib.generate_keypair(2048)
+    return public_pem.decode(), private_pem.decode()
+
+
+@pytest.fixture(params=["keys.json", "keys.log", "keys.db"])
+def manager(request, tmp_path):
+    manager = KeyManager(tmp_path / request.param)
+    yield manager
+    manager.store.close()
+
+
+@pytest.mark.parametrize("handle_first", [True, False])
+def test_pem_and_handle_getters_do_not_share_cache_entries(manager, pems, handle_first):
+    public_pem, private_pem = pems
+    manager.set_rsa_keypair("default", public_pem, private_pem)
+    if handle_first:
+        handle = manager.get_rsa_key(private=True)
+        assert manager.get_rsa_private_key() == private_pem
+    else:
+        assert manager.get_rsa_private_key() == private_pem
+        handle = manager.get_rsa_key(private=True)
+    assert isinstance(handle, rsa_lib.RSAKeyHandle) and handle.has_private
+    assert manager.get_rsa_key(private=True) is handle
+    assert manager.get_rsa_public_key() == public_pem
+    assert manager.get_rsa_key().fingerprint == rsa_lib.fingerprint(public_pem)
+
+
+def test_set_invalidates_pem_and_handle(manager, pems):
+    public_pem, private_pem = pems
+    manager.set_rsa_keypair("default", public_pem, private_pem)
+    old = manager.get_rsa_key()
+    other_private, other_public = rsa_lib.generate_keypair(2048)
+    manager.set_rsa_keypair("default", other_public.decode(), other_private.decode())
+    assert manager.get_rsa_public_key() == other_public.decode()
+    assert manager.get_rsa_key() is not old
+    assert manager.get_rsa_key().fingerprint == rsa_lib.fingerprint(other_public)
+
+
+def test_generate_many_and_get_many(manager):
+    keys = manager.generate_many("aes", [f"k{i}" for i in range(50)])
+    assert len(keys) == 50 and all(len(key) == 16 for key in keys.values())
+    assert len(set(keys.values())) == 50
+    assert manager.get_many(list(keys) + ["yok"]) == dict(keys, yok=None)
+    assert manager.get_aes_key("k7") == keys["k7"]
+    des = manager.generate_many("des", ["a"])
+    assert manager.get_many(["a"], kind="des") == des
+    with pytest.raises(ValueError):
+        manager.generate_many("rsa", ["x"])
+    with pytest.raises(ValueError):
+        manager.get_many(["x"], kind="rsa")
+
+
+def test_set_replaces_cached_symmetric_key(manager):
+    manager.set_aes_key("default", b"a" * 16)
+    assert manager.get_aes_key() == b"a" * 16
+    manager.set_aes_key("default", b"b" * 16)
+    assert manager.get_aes_key() == b"b" * 16
+
+
+def test_cache_is_bounded(tmp_path):
+    manager = KeyManager(tmp_path / "keys.json", cache_size=4)
+    keys = manager.generate_many("des", [str(i) for i in range(10)])
+    assert manager.get_many(keys, kind="des") == keys
+    assert len(manager._cache) == 4
+    uncached = KeyManager(tmp_path / "keys.json", cache_size=0)
+    assert uncached.get_des_key("3") == keys["3"] and not uncached._cache
+
+
+def test_import_and_export_json(manager, tmp_path):
+    manager.generate_many("aes", ["a", "b"])
+    manager.export_json(tmp_path / "yedek.json")
+    target = KeyManager(tmp_path / "hedef.db")
+    assert target.import_json(tmp_path / "yedek.json") == 2
+    assert target.get_many(["a", "b"]) == manager.get_many(["a", "b"])
+    target.store.close()
+
+
+def test_managers_on_the_same_file_see_each_others_writes(manager):
+    other = KeyManager(manager.key_file)
+    manager.set_aes_key("ortak", b"a" * 16)
+    assert other.get_aes_key("ortak") == b"a" * 16
+    # Önbellekteki eski değer, diğer örnek yazınca geçersiz olur
+    other.set_aes_key("ortak", b"b" * 16)
+    assert manager.get_aes_key("ortak") == b"b" * 16
+    other.store.close()
+
+
+def test_corrupt_json_file_raises(tmp_path):
+    path = tmp_path / "keys.json"
+    path.write_text('{"aes_default": "00')
+    with pytest.raises(ValueError, match="bozuk"):
+        KeyManager(path).get_aes_key()
+    path.write_text("[]")
+    with pytest.raises(ValueError):
+        KeyManager(path).get_aes_key()
+
+
+def _write_keys(path, worker: int, count: int):
+    manager = KeyManager(path)
+    for i in range(count):
+        manager.set_des_key(f"{worker}_{i}", bytes([worker, i]) * 4)
+    manager.store.close()
+
+
+@pytest.mark.parametrize("name", ["keys.json", "keys.log", "keys.db"])
+def test_concurrent_writer_processes_do_not_lose_keys(tmp_path, name):
+    from concurrent.futures import ProcessPoolExecutor
+    path = tmp_path / name
+    with ProcessPoolExecutor(4) as pool:
+        list(pool.map(_write_keys, [path] * 4, range(4), [25] * 4))
+    keys = KeyManager(path).keys
+    assert len(keys) == 100
+    assert keys["des_3_24"] == (bytes([3, 24]) * 4).hex()
+
+
+def test_default_store_is_sqlite(tmp_path, monkeypatch):
+    from crypto.key_store import SQLiteStore
+    monkeypatch.chdir(tmp_path)
+    manager = KeyManager()
+    assert isinstance(manager.store, SQLiteStore)
+    manager.store.close()
+
+
+def test_legacy_json_is_migrated_once(tmp_path):
+    legacy = tmp_path / "server_keys.json"
+    old = KeyManager(legacy)
+    old.set_aes_key("default", b"a" * 16)
+    manager = KeyManager(tmp_path / "server_keys.db", legacy_file=legacy)
+    assert manager.get_aes_key() == b"a" * 16
+    manager.set_aes_key("default", b"b" * 16)
+    manager.store.close()
+    # Eski dosya korunur ama yeni depo varken tekrar içe aktarılmaz
+    old.set_aes_key("default", b"c" * 16)
+    reopened = KeyManager(tmp_path / "server_keys.db", legacy_file=legacy)
+    assert reopened.get_aes_key() == b"b" * 16
+    reopened.store.close()
+    missing = KeyManager(tmp_path / "yeni.db", legacy_file=tmp_path / "yok.json")
+    assert len(missing.store) == 0
+    missing.store.close()
+
+
+def test_server_and_client_use_sqlite_key_files(tmp_path, monkeypatch):
+    import crypto_client
+    import crypto_server
+    monkeypatch.chdir(tmp_path)
+    legacy = KeyManager("server_keys.json")
+    legacy.generate_x25519_key()
+    server = crypto_server.CryptoServer(kex=("x25519",))
+    assert server.key_manager.key_file.suffix == ".db"
+    # Eski JSON'daki anahtar taşınır; yeni anahtar üretilmez
+    assert server.key_manager.get_x25519_private_key() == legacy.get_x25519_private_key()
+    assert crypto_client.CryptoClient().key_manager.key_file.suffix == ".db"
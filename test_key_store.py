@@ -0,0 +1,105 @@
+"""
+Anahtar depolama arka uçları (JSON, günlük, SQLite) için davranış testleri (pytest)
+"""
+import json
+
+import pytest
+
+import crypto.key_store as key_store
+from crypto.key_store import LogStore, open_store
+
+SUFFIXES = {"json": "keys.json", "log": "keys.log", "sqlite": "keys.db"}
+
+
+@pytest.fixture(params=sorted(key_store.BACKENDS))
+def store(request, tmp_path):
+    store = open_store(tmp_path / SUFFIXES[request.param])
+    assert isinstance(store, key_store.BACKENDS[request.param])
+    yield store
+    store.close()
+
+
+def test_backends_behave_alike(store):
+    assert store.get("yok") is None and len(store) == 0
+    store.set_many([("aes_a", "00" * 16), ("aes_b", "11" * 16)])
+    store.set("aes_a", "22" * 16)
+    assert store.get("aes_a") == "22" * 16
+    assert "aes_b" in store and "yok" not in store
+    store.delete("aes_b")
+    store.delete("yok")
+    assert dict(store.items()) == {"aes_a": "22" * 16}
+    assert len(store) == 1
+
+
+def test_backends_persist_across_instances(store):
+    store.set_many([("rsa_default_public", "-----PEM-----\nsatır\n"), ("des_x", "ab" * 8)])
+    store.close()
+    reopened = open_store(store.path)
+    assert dict(reopened.items()) == {"rsa_default_public": "-----PEM-----\nsatır\n", "des_x": "ab" * 8}
+    reopened.close()
+
+
+def test_open_store_rejects_unknown_backend(tmp_path):
+    with pytest.raises(ValueError):
+        open_store(tmp_path / "keys.json", "redis")
+
+
+def _log(path, *lines: bytes):
+    path.write_bytes(b"".join(lines))
+
+
+def _record(key_id, value) -> bytes:
+    return json.dumps({"k": key_id, "v": value}, separators=(",", ":")).encode() + b"\n"
+
+
+def test_log_skips_corrupt_middle_line_and_keeps_later_records(tmp_path):
+    path = tmp_path / "keys.log"
+    _log(path, _record("a", "1"), b"{bozuk satir\n", b"[1, 2]\n", _record("b", "2"))
+    store = LogStore(path)
+    with pytest.warns(UserWarning, match="bozuk satır"):
+        assert store.get("b") == "2"
+    assert dict(store.items()) == {"a": "1", "b": "2"}
+    # Yazma bozuk satırın yerine değil, dosya sonuna yapılır
+    store.set("c", "3")
+    store.close()
+    with pytest.warns(UserWarning):
+        assert dict(LogStore(path).items()) == {"a": "1", "b": "2", "c": "3"}
+
+
+def test_log_truncates_only_incomplete_tail(tmp_path):
+    path = tmp_path / "keys.log"
+    _log(path, _record("a", "1"), b'{"k":"b","v"')
+    store = LogStore(path)
+    assert dict(store.items()) == {"a": "1"}
+    store.set("c", "3")
+    assert path.read_bytes() == _record("a", "1") + _record("c", "3")
+    assert dict(LogStore(path).items()) == {"a": "1", "c": "3"}
+
+
+def test_log_compacts_dead_records(tmp_path, monkeypatch):
+    monkeypatch.setattr(key_store, "COMPACT_MIN_RECORDS", 8)
+    path = tmp_path / "keys.log"
+    store = LogStore(path)
+    for i in range(20):
+        store.set("a", str(i))
+    store.set("b", "x")
+    # Kayıt sayısı canlı anahtarların COMPACT_RATIO katını geçmez
+    assert len(path.read_bytes().splitlines()) <= max(8, key_store.COMPACT_RATIO * 2)
+    assert dict(store.items()) == {"a": "19", "b": "x"}
+    store.close()
+    assert dict(LogStore(path).items()) == {"a": "19", "b": "x"}
+
+
+def test_log_sees_appends_from_another_instance(tmp_path):
+    path = tmp_path / "keys.log"
+    reader, writer = LogStore(path), LogStore(path)
+    reader.set("a", "1")
+    assert writer.get("a") == "1"
+    writer.set("b", "2")
+    writer.delete("a")
+    assert reader.refresh() == {"a", "b"}
+    assert dict(reader.items()) == {"b": "2"}
+    writer.compact()
+    # Sıkıştırma dosyayı değiştirir; değişenler bilinmez ve indeks yeniden kurulur
+    assert reader.refresh() is None
+    assert reader.get("b") == "2"
@@ -0,0 +1,344 @@
+"""
+İstemci-sunucu protokolü (çerçeveleme, oturumlar) için davranış testleri (pytest)
+"""
+import asyncio
+import json
+import socket
+import threading
+
+import pytest
+
+import crypto.ecdh as ecdh
+import crypto.session as session_lib
+import crypto_client
+import crypto_server
+from async_crypto_server import INLINE_LIMIT, AsyncCryptoServer
+from crypto_client import CryptoClient
+from crypto_server import CryptoServer
+
+
+def _frame(message: dict) -> bytes:
+    data = json.dumps(message).encode()
+    return len(data).to_bytes(4, "big") + data
+
+
+@pytest.fixture(autouse=True)
+def _tmp_cwd(tmp_path, monkeypatch):
+    # İstemci ve sunucu anahtar dosyalarını çalışma dizinine yazar
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def pair():
+    left, right = socket.socketpair()
+    yield left, right
+    left.close()
+    right.close()
+
+
+def test_server_reads_json_and_binary_frames(pair):
+    left, right = pair
+    payload = bytes(range(256)) * 10
+    left.sendall(_frame({"type": "encrypted_message", "encoding": "binary"})
+                 + len(payload).to_bytes(4, "big") + payload)
+    # _receive_message sunucu durumuna dokunmaz; anahtar üretmemek için örnek kurulmaz
+    message = CryptoServer._receive_message(object.__new__(CryptoServer), right)
+    assert message["type"] == "encrypted_message"
+    assert bytes(message["data"]) == payload
+
+
+def test_server_rejects_oversized_frame_before_allocating(pair):
+    left, right = pair
+    left.sendall((crypto_server.MAX_FRAME_SIZE + 1).to_bytes(4, "big"))
+    with pytest.raises(ValueError):
+        CryptoServer._receive_message(object.__new__(CryptoServer), right)
+
+
+def test_server_rejects_oversized_binary_frame(pair):
+    left, right = pair
+    left.sendall(_frame({"type": "encrypted_message", "encoding": "binary"}) + b"\xff\xff\xff\xff")
+    with pytest.raises(ValueError):
+        CryptoServer._receive_message(object.__new__(CryptoServer), right)
+
+
+def test_client_rejects_oversized_frame(pair):
+    left, right = pair
+    client = CryptoClient()
+    client.socket = right
+    left.sendall((crypto_client.MAX_FRAME_SIZE + 1).to_bytes(4, "big"))
+    with pytest.raises(ValueError):
+        client._receive_message()
+
+
+def test_client_and_server_framing_interoperate(pair):
+    left, right = pair
+    client = CryptoClient()
+    client.socket = left
+    client._send_message({"type": "encrypted_message"}, payload=b"\x00\x01ham")
+    message = CryptoServer._receive_message(object.__new__(CryptoServer), right)
+    assert message["encoding"] == "binary" and bytes(message["data"]) == b"\x00\x01ham"
+
+
+def test_derive_key_sizes_and_separation():
+    secret = session_lib.new_secret()
+    assert len(session_lib.derive_key(secret, "aes")) == 16
+    assert len(session_lib.derive_key(secret, "des")) == 8
+    assert session_lib.derive_key(secret, "aes") == session_lib.derive_key(secret, "aes")
+    assert session_lib.derive_key(secret, "aes")[:8] != session_lib.derive_key(secret, "des")
+    with pytest.raises(ValueError):
+        session_lib.derive_key(secret, "rsa")
+
+
+def test_session_derives_each_key_once():
+    session = session_lib.SessionCache().create(session_lib.new_secret())
+    assert session.key("aes") is session.key("aes")
+    assert session.key("aes") == session_lib.derive_key(session.secret, "aes")
+
+
+def test_session_cache_ttl_and_lru():
+    cache = session_lib.SessionCache(ttl=0)
+    assert cache.get(cache.create(b"s" * 32).session_id) is None
+    assert len(cache) == 0
+    cache = session_lib.SessionCache(max_sessions=2)
+    first, second = cache.create(b"1" * 32), cache.create(b"2" * 32)
+    # Kullanılan oturum sona taşınır; en uzun süredir kullanılmayan atılır
+    assert cache.get(first.session_id) is first
+    cache.create(b"3" * 32)
+    assert cache.get(second.session_id) is None
+    assert cache.get(first.session_id) is first
+    assert cache.get("bilinmeyen") is None
+
+
+@pytest.fixture
+def serve(tmp_path, monkeypatch):
+    """Sunucuyu geçici dizinde, rastgele bir portta ve arka plan iş parçacığında çalıştır"""
+    monkeypatch.chdir(tmp_path)
+    listener = socket.create_server((crypto_client.HOST, 0))
+    monkeypatch.setattr(crypto_client, "PORT", listener.getsockname()[1])
+
+    def start(server, connections=1):
+        def run():
+            for _ in range(connections):
+                conn, addr = listener.accept()
+                server.handle_client(conn, addr)
+        threading.Thread(target=run, daemon=True).start()
+        return server
+
+    yield start
+    listener.close()
+
+
+def _acked(capsys) -> bool:
+    return "✓ Sunucudan ACK" in capsys.readouterr().out
+
+
+def test_session_is_resumed_across_messages_and_connections(serve, capsys):
+    server = serve(CryptoServer(kex=("rsa",)), connections=2)
+    client = CryptoClient()
+    client.connect()
+    client.send_encrypted_message("ilk", "aes")
+    assert _acked(capsys) and len(server.sessions) == 1
+    client.send_encrypted_message("ikinci", "des", binary=True)
+    out = capsys.readouterr().out
+    assert "Açık oturum kullanılıyor" in out and "✓ Sunucudan ACK" in out
+    client.disconnect()
+    client.connect()
+    assert "önbellekten" in capsys.readouterr().out
+    client.send_encrypted_message("yeniden", "aes")
+    out = capsys.readouterr().out
+    assert "Açık oturum kullanılıyor" in out and "✓ Sunucudan ACK" in out
+    assert len(server.sessions) == 1
+    client.disconnect()
+
+
+def test_expired_session_is_renewed_once(serve, capsys):
+    server = serve(CryptoServer(kex=("rsa",)))
+    client = CryptoClient()
+    client.connect()
+    client.send_encrypted_message("ilk", "aes")
+    old = client._sessions[client.server_fingerprint].session_id
+    # Sunucu oturumu unutur (yeniden başlatma veya TTL)
+    server.sessions = session_lib.SessionCache()
+    client.send_encrypted_message("ikinci", "aes")
+    out = capsys.readouterr().out
+    assert "Oturum süresi doldu" in out and out.count("✓ Sunucudan ACK") == 2
+    assert client._sessions[client.server_fingerprint].session_id != old
+    client.disconnect()
+
+
+def test_per_message_rsa_key_without_session(serve, capsys):
+    server = serve(CryptoServer(kex=("rsa",)))
+    client = CryptoClient()
+    client.connect()
+    client.send_encrypted_message("oturumsuz", "aes", use_session=False)
+    assert _acked(capsys)
+    assert not client._sessions and len(server.sessions) == 0
+    client.disconnect()
+
+
+def test_ecdh_both_sides_derive_the_same_secret():
+    server, client = ecdh.generate_key(), ecdh.generate_key()
+    server_public, client_public = ecdh.public_bytes(server), ecdh.public_bytes(client)
+    secret = ecdh.derive_secret(client, server_public, client_public, server_public)
+    assert len(secret) == session_lib.SECRET_SIZE
+    assert ecdh.derive_secret(server, client_public, client_public, server_public) == secret
+    # Sır el sıkışmadaki açık anahtarlara bağlıdır
+    assert ecdh.derive_secret(server, client_public, server_public, client_public) != secret
+
+
+def test_ecdh_key_encoding_and_validation():
+    key = ecdh.generate_key()
+    assert ecdh.decode_public(ecdh.encode_public(key)) == ecdh.public_bytes(key)
+    assert ecdh.import_private_key(ecdh.export_private_key(key)).has_private()
+    for bad in ("kısa", "AAAA", None):
+        with pytest.raises(ValueError):
+            ecdh.decode_public(bad)
+    with pytest.raises(ValueError):
+        ecdh.import_private_key(ecdh.generate_key().public_key().export_key(format="PEM"))
+
+
+def test_x25519_only_server_round_trip(serve, capsys):
+    server = serve(CryptoServer(kex=("x25519",)))
+    assert server.rsa_private_key is None
+    client = CryptoClient(kex="x25519")
+    client.connect()
+    assert client.server_kex == "x25519" and client.server_rsa_public_key is None
+    client.send_encrypted_message("ecdh", "aes")
+    client.send_encrypted_message("ecdh", "des", binary=True)
+    out = capsys.readouterr().out
+    assert "X25519 (ECDH)" in out and "Açık oturum kullanılıyor" in out
+    assert out.count("✓ Sunucudan ACK") == 2 and len(server.sessions) == 1
+    # Oturumsuz yol RSA anahtarı ister; açık bir hata verilir
+    with pytest.raises(ValueError, match="oturum"):
+        client.send_encrypted_message("oturumsuz", "aes", use_session=False)
+    client.disconnect()
+
+
+def test_rsa_client_falls_back_to_offered_kex(serve, capsys):
+    serve(CryptoServer(kex=("x25519",)))
+    client = CryptoClient(kex="rsa")
+    client.connect()
+    assert client.server_kex == "x25519"
+    client.send_encrypted_message("geri dönüş", "aes")
+    assert _acked(capsys)
+    client.disconnect()
+
+
+@pytest.mark.parametrize("message, offload", [
+    ({"data": "x" * 100}, False),
+    ({"data": "x" * 100, "use_library": False}, True),
+    ({"data": b"x" * (INLINE_LIMIT + 1)}, True),
+    ({"data": "x", "session_key": "sarılı"}, True),
+    ({"data": "x", "client_public": "AAAA"}, True),
+    ({"data": "x", "session_id": "abc"}, False),
+])
+def test_async_offloads_slow_messages(message, offload):
+    assert AsyncCryptoServer._offload(object.__new__(AsyncCryptoServer), message) is offload
+
+
+def _read_async(data: bytes):
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await AsyncCryptoServer._read_message(object.__new__(AsyncCryptoServer), reader)
+    return asyncio.run(read())
+
+
+def test_async_reads_frames_and_rejects_oversized():
+    message = _read_async(_frame({"type": "encrypted_message", "encoding": "binary"}) + b"\x00\x00\x00\x03abc")
+    assert message["data"] == b"abc"
+    assert _read_async(_frame({"type": "disconnect"})[:-1]) is None
+    with pytest.raises(ValueError):
+        _read_async((crypto_server.MAX_FRAME_SIZE + 1).to_bytes(4, "big"))
+    with pytest.raises(ValueError):
+        _read_async(_frame({"type": "encrypted_message", "encoding": "binary"}) + b"\xff\xff\xff\xff")
+
+
+@pytest.fixture
+def async_server(tmp_path, monkeypatch):
+    """asyncio sunucusunu geçici dizinde, rastgele bir portta ayrı bir olay döngüsünde çalıştır"""
+    monkeypatch.chdir(tmp_path)
+    server = AsyncCryptoServer(kex=("x25519",), verbose=False)
+    started, state = threading.Event(), {}
+
+    async def run():
+        state["loop"], state["stop"] = asyncio.get_running_loop(), asyncio.Event()
+        listener = await asyncio.start_server(server.handle_client, crypto_client.HOST, 0)
+        state["port"] = listener.sockets[0].getsockname()[1]
+        started.set()
+        async with listener:
+            await state["stop"].wait()
+        # asyncio.run kalan bağlantı eşyordamlarını iptal edip bitirir
+
+    thread = threading.Thread(target=asyncio.run, args=(run(),), daemon=True)
+    thread.start()
+    assert started.wait(10)
+    monkeypatch.setattr(crypto_client, "PORT", state["port"])
+    yield server
+    state["loop"].call_soon_threadsafe(state["stop"].set)
+    thread.join(10)
+
+
+def test_async_server_round_trip(async_server, capsys):
+    client = CryptoClient(kex="x25519")
+    client.connect()
+    client.send_encrypted_message("kütüphane", "aes")
+    client.send_encrypted_message("manuel", "aes", use_library=False)
+    client.send_encrypted_message("büyük " * 20000, "des", binary=True)
+    assert capsys.readouterr().out.count("✓ Sunucudan ACK") == 3
+    assert len(async_server.sessions) == 1
+    client.disconnect()
+
+
+def test_async_server_serves_concurrent_connections(async_server, capsys):
+    clients = [CryptoClient(kex="x25519") for _ in range(8)]
+    for client in clients:
+        client.connect()
+    threads = [threading.Thread(target=client.send_encrypted_message, args=(f"istemci {i}", "aes"))
+               for i, client in enumerate(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+    assert async_server.connections == 8
+    assert capsys.readouterr().out.count("✓ Sunucudan ACK") == 8
+    for client in clients:
+        client.disconnect()
+
+
+def test_async_server_drops_connection_on_oversized_frame(async_server):
+    with socket.create_connection((crypto_client.HOST, crypto_client.PORT)) as sock:
+        sock.settimeout(5)
+        sock.recv(65536)  # selamlama
+        sock.sendall((crypto_server.MAX_FRAME_SIZE + 1).to_bytes(4, "big"))
+        assert sock.recv(1) == b""
+
+
+def test_greeting_carries_only_the_rsa_fingerprint(serve, capsys):
+    server = serve(CryptoServer(kex=("rsa", "x25519")), connections=2)
+    greeting = server._greeting()
+    assert "public_key" not in greeting and greeting["fingerprint"] == server.rsa_fingerprint
+    assert len(json.dumps(greeting)) < 300
+    requests = []
+    original = server._public_key_message
+    server._public_key_message = lambda: requests.append(1) or original()
+
+    client = CryptoClient()
+    client.connect()
+    # PEM yalnızca ilk RSA anahtar değişiminde istenir
+    assert not requests and client.server_rsa_public_key is None
+    client.send_encrypted_message("ilk", "aes")
+    client.send_encrypted_message("oturumsuz", "aes", use_session=False)
+    assert len(requests) == 1 and _acked(capsys)
+    client.disconnect()
+    client.connect()
+    client.send_encrypted_message("yeniden", "aes")
+    assert len(requests) == 1
+    client.disconnect()
+
+
+def test_public_key_request_against_x25519_only_server():
+    server = object.__new__(CryptoServer)
+    server.rsa_public = None
+    assert server._public_key_message()["type"] == "error"
@@ -0,0 +1,83 @@
+"""
+RSA anahtar handle'ları ve anahtar havuzu için davranış testleri (pytest)
+"""
+import pytest
+
+import crypto.rsa as rsa_lib
+
+
+@pytest.fixture(scope="module")
+def keypair():
+    return rsa_lib.generate_keypair(2048)
+
+
+def test_handles_are_cached_per_pem(keypair):
+    private_pem, public_pem = keypair
+    handle = rsa_lib.load_public_key(public_pem)
+    # str/bytes ve sondaki boşluklar aynı handle'a çözülür
+    assert rsa_lib.load_key(public_pem.decode() + "\n") is handle
+    assert rsa_lib.load_key(handle) is handle
+    assert handle.fingerprint == rsa_lib.fingerprint(public_pem)
+    assert not handle.has_private
+
+
+def test_wrap_and_unwrap_with_pem_or_handle(keypair):
+    private_pem, public_pem = keypair
+    wrapped = rsa_lib.encrypt_key(b"k" * 16, public_pem)
+    assert rsa_lib.decrypt_key(wrapped, private_pem) == b"k" * 16
+    assert rsa_lib.load_private_key(private_pem).decrypt_key(wrapped) == b"k" * 16
+
+
+def test_private_operations_need_private_key(keypair):
+    private_pem, public_pem = keypair
+    with pytest.raises(ValueError):
+        rsa_lib.load_private_key(public_pem)
+    with pytest.raises(ValueError):
+        rsa_lib.load_public_key(public_pem).decrypt_key("AAAA")
+
+
+def test_generate_keypair_rejects_unknown_size():
+    with pytest.raises(ValueError):
+        rsa_lib.generate_keypair(1024)
+
+
+def test_pool_validates_arguments():
+    from crypto.rsa_pool import KeyPairPool
+    with pytest.raises(ValueError):
+        KeyPairPool(sizes=(1024,))
+    with pytest.raises(ValueError):
+        KeyPairPool(depth=-1)
+    with pytest.raises(ValueError):
+        KeyPairPool(sizes=(2048,)).pop(3072)
+
+
+def test_pool_refills_in_background_and_serves_hits():
+    import time
+    from crypto.rsa_pool import KeyPairPool
+    pool = KeyPairPool(sizes=(2048,), depth=1, workers=1)
+    try:
+        pool.start()
+        deadline = time.monotonic() + 120
+        while pool.metrics()["sizes"][2048]["depth"] < 1:
+            assert time.monotonic() < deadline, "havuz dolmadı"
+            time.sleep(0.1)
+        private_pem, public_pem = pool.pop(2048)
+        metrics = pool.metrics()
+        assert metrics["hits"] == 1 and metrics["misses"] == 0 and metrics["running"]
+        assert metrics["sizes"][2048]["refill_latency_ms"]["last"] > 0
+        wrapped = rsa_lib.encrypt_key(b"k" * 16, public_pem)
+        assert rsa_lib.decrypt_key(wrapped, private_pem) == b"k" * 16
+    finally:
+        pool.stop()
+    assert not pool.metrics()["running"]
+
+
+def test_pool_generates_synchronously_when_empty():
+    from crypto.rsa_pool import KeyPairPool
+    pool = KeyPairPool(sizes=(2048,), depth=0)
+    try:
+        private_pem, public_pem = pool.pop(2048)
+        assert rsa_lib.load_private_key(private_pem).has_private
+        assert pool.metrics()["misses"] == 1
+    finally:
+        pool.stop()
@@ -0,0 +1,191 @@
+"""
+AES/DES (pycryptodome) yardımcıları için davranış testleri (pytest)
+"""
+import base64
+import io
+
+import pytest
+
+import crypto.aes as aes
+import crypto.context as context
+import crypto.des as des
+
+AES_KEY = b"0123456789abcdef"
+DES_KEY = b"8bytekey"
+
+
+@pytest.mark.parametrize("module, key", [(aes, AES_KEY), (des, DES_KEY)])
+@pytest.mark.parametrize("size", [0, 1, 15, 16, 17, 1000, 70000])
+def test_stream_round_trip_across_chunk_boundaries(module, key, size):
+    data = bytes(i % 251 for i in range(size))
+    encrypted = io.BytesIO()
+    module.encrypt_stream(io.BytesIO(data), encrypted, key, chunk_size=1000)
+    encrypted.seek(0)
+    decrypted = io.BytesIO()
+    written = module.decrypt_stream(encrypted, decrypted, key, chunk_size=777)
+    assert decrypted.getvalue() == data
+    assert written == size
+
+
+def test_stream_output_matches_one_shot_format():
+    data = b"akis ve tek seferlik ayni bicim" * 50
+    encrypted = io.BytesIO()
+    aes.encrypt_stream(io.BytesIO(data), encrypted, AES_KEY, chunk_size=64)
+    assert aes.decrypt_bytes(encrypted.getvalue(), AES_KEY) == data
+
+
+def test_stream_rejects_truncated_and_tampered_input():
+    encrypted = io.BytesIO()
+    aes.encrypt_stream(io.BytesIO(b"x" * 100), encrypted, AES_KEY)
+    raw = encrypted.getvalue()
+    with pytest.raises(ValueError):
+        aes.decrypt_stream(io.BytesIO(raw[:-1]), io.BytesIO(), AES_KEY)
+    with pytest.raises(ValueError):
+        aes.decrypt_stream(io.BytesIO(raw[:8]), io.BytesIO(), AES_KEY)
+    # CBC: önceki bloktaki bit değişikliği son bloğun dolgu byte'ını bozar
+    tampered = bytearray(raw)
+    tampered[-17] ^= 0xFF
+    with pytest.raises(ValueError):
+        aes.decrypt_stream(io.BytesIO(bytes(tampered)), io.BytesIO(), AES_KEY)
+
+
+@pytest.mark.parametrize("module, key", [(aes, AES_KEY), (des, DES_KEY)])
+def test_context_is_cached_per_key(module, key):
+    assert module.get_context(key) is module.get_context(bytearray(key))
+    # str anahtarlar UTF-8 ile kodlanıp aynı bağlamı kullanır
+    assert module.get_context(key.decode("latin-1")) is module.get_context(key)
+    assert module.decrypt(module.encrypt("Merhaba Dünya!", key), key) == "Merhaba Dünya!"
+
+
+@pytest.mark.parametrize("size", [0, 5, 16, 63, 64, 65, 1000])
+def test_context_cbc_interoperates_with_pycryptodome(size):
+    from Crypto.Cipher import AES
+    data = bytes(range(256))[:size] * 4
+    raw = aes.encrypt_bytes(data, AES_KEY)
+    assert aes.unpad(AES.new(AES_KEY, AES.MODE_CBC, iv=raw[:16]).decrypt(raw[16:])) == data
+    iv = b"i" * 16
+    library = iv + AES.new(AES_KEY, AES.MODE_CBC, iv=iv).encrypt(aes.pad(data))
+    assert aes.decrypt_bytes(library, AES_KEY) == data
+
+
+@pytest.mark.parametrize("module, key", [(aes, b"short"), (des, b"toolongkey")])
+def test_context_rejects_bad_key_size(module, key):
+    with pytest.raises(ValueError):
+        module.get_context(key)
+
+
+MESSAGES = ["", "a", "x" * 15, "y" * 16, "Merhaba Dünya! " * 7, "z" * 100]
+
+
+@pytest.mark.parametrize("module, key", [(aes, AES_KEY), (des, DES_KEY)])
+def test_many_round_trip_and_interop_with_single_calls(module, key):
+    encrypted = module.encrypt_many(MESSAGES, key)
+    assert module.decrypt_many(encrypted, key) == MESSAGES
+    assert [module.decrypt(c, key) for c in encrypted] == MESSAGES
+    assert module.decrypt_many([module.encrypt(m, key) for m in MESSAGES], key) == MESSAGES
+    # Her mesaj kendi IV'siyle şifrelenir
+    assert len(set(module.encrypt_many(["ayni"] * 8, key))) == 8
+
+
+def test_many_without_numpy_matches(monkeypatch):
+    monkeypatch.setattr(context, "NUMPY_AVAILABLE", False)
+    assert aes.decrypt_many(aes.encrypt_many(MESSAGES, AES_KEY), AES_KEY) == MESSAGES
+
+
+def test_many_empty_and_bad_length():
+    assert aes.encrypt_many([], AES_KEY) == []
+    assert aes.decrypt_many([], AES_KEY) == []
+    with pytest.raises(ValueError):
+        aes.decrypt_many(["AAAA"], AES_KEY)
+
+
+PARALLEL_DATA = bytes(i % 253 for i in range(100_003))
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_parallel_ctr_matches_single_stream(workers):
+    from Crypto.Cipher import AES
+    nonce = b"n" * 8
+    raw = aes.encrypt_ctr_parallel(PARALLEL_DATA, AES_KEY, nonce=nonce, workers=workers, chunk_size=4096)
+    assert bytes(raw[:8]) == nonce
+    assert bytes(raw[8:]) == AES.new(AES_KEY, AES.MODE_CTR, nonce=nonce).encrypt(PARALLEL_DATA)
+    assert aes.decrypt_ctr_parallel(raw, AES_KEY, workers=workers, chunk_size=1024) == PARALLEL_DATA
+
+
+def test_parallel_ctr_in_processes():
+    raw = aes.encrypt_ctr_parallel(PARALLEL_DATA, AES_KEY, workers=2, chunk_size=16384, executor="process")
+    assert aes.decrypt_ctr_parallel(raw, AES_KEY, workers=2, chunk_size=16384) == PARALLEL_DATA
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_parallel_cbc_decrypts_one_shot_output(workers):
+    raw = aes.encrypt_bytes(PARALLEL_DATA, AES_KEY)
+    assert aes.decrypt_cbc_parallel(raw, AES_KEY, workers=workers, chunk_size=4096) == PARALLEL_DATA
+
+
+def test_parallel_cbc_rejects_bad_input():
+    raw = bytearray(aes.encrypt_bytes(b"x" * 100, AES_KEY))
+    with pytest.raises(ValueError):
+        aes.decrypt_cbc_parallel(raw[:-1], AES_KEY)
+    raw[-17] ^= 0xFF
+    with pytest.raises(ValueError):
+        aes.decrypt_cbc_parallel(raw, AES_KEY)
+
+
+@pytest.mark.parametrize("module, key", [(aes, AES_KEY), (des, DES_KEY)])
+@pytest.mark.parametrize("size", [0, 7, 8, 16, 1000])
+def test_bytes_into_caller_buffers(module, key, size):
+    data = bytes(range(256))[:size % 256] * (size // 256 + 1)
+    data = data[:size]
+    buf = bytearray(module.ciphertext_size(len(data)) + 5)
+    view = module.encrypt_bytes(memoryview(data), key, output=buf)
+    assert len(view) == module.ciphertext_size(len(data))
+    assert module.decrypt_bytes(bytes(view), key) == data
+    out = bytearray(len(view))
+    assert bytes(module.decrypt_bytes(view, key, output=out)) == data
+
+
+def test_bytes_output_validation():
+    raw = aes.encrypt_bytes(b"x" * 40, AES_KEY)
+    with pytest.raises(ValueError):
+        aes.encrypt_bytes(b"x" * 40, AES_KEY, output=bytearray(10))
+    with pytest.raises(ValueError):
+        aes.decrypt_bytes(raw, AES_KEY, output=bytearray(10))
+    with pytest.raises(ValueError):
+        aes.decrypt_bytes(raw[:-3], AES_KEY, output=bytearray(len(raw)))
+
+
+@pytest.mark.parametrize("use_output", [False, True])
+@pytest.mark.parametrize("module, key", [(aes, AES_KEY), (des, DES_KEY)])
+def test_decrypt_bytes_rejects_bad_length(module, key, use_output):
+    bs = module.get_context(key).block_size
+    output = bytearray(4 * bs) if use_output else None
+    for raw in (b"", b"i" * bs, b"i" * (3 * bs + 1)):
+        with pytest.raises(ValueError, match="uzunluğu"):
+            module.decrypt_bytes(raw, key, output=output)
+
+
+@pytest.mark.parametrize("use_output", [False, True])
+@pytest.mark.parametrize("last_block", [b"x" * 15 + b"\x00", b"x" * 15 + b"\x11", b"x" * 13 + b"y\x03\x03"])
+def test_decrypt_bytes_checks_pkcs7_padding(last_block, use_output):
+    from Crypto.Cipher import AES
+    iv = b"i" * 16
+    raw = iv + AES.new(AES_KEY, AES.MODE_CBC, iv=iv).encrypt(b"z" * 16 + last_block)
+    with pytest.raises(ValueError, match="dolgu"):
+        aes.decrypt_bytes(raw, AES_KEY, output=bytearray(len(raw)) if use_output else None)
+    with pytest.raises(ValueError, match="dolgu"):
+        aes.decrypt_many([base64.b64encode(raw).decode()], AES_KEY)
+
+
+def test_wrapper_manual_path_rejects_output_buffer():
+    from crypto.symmetric_wrapper import AESCipher
+    cipher = AESCipher()
+    raw = cipher.encrypt_bytes(b"veri", AES_KEY, use_library=False)
+    assert cipher.decrypt_bytes(raw, AES_KEY, use_library=False) == b"veri"
+    with pytest.raises(TypeError):
+        cipher.encrypt_bytes(b"veri", AES_KEY, use_library=False, output=bytearray(64))
+    with pytest.raises(TypeError):
+        cipher.decrypt_bytes(raw, AES_KEY, use_library=False, output=bytearray(64))
+    buf = bytearray(64)
+    view = cipher.encrypt_bytes(b"veri", AES_KEY, output=buf)
+    assert bytes(cipher.decrypt_bytes(view, AES_KEY, output=bytearray(64))) == b"veri"